@@ -1,1076 +1,676 @@
-# %%
-from sys import prefix
-import numpy as np
-import pandas as pd
-from tabulate import tabulate
-from typing import Tuple
-import re
-import jsonschema
-from typing import Union
-import xml.etree.ElementTree as ET
-import tkinter as tk
-from FileBrowserApp import FileBrowserApp
-import subprocess
-import sys
-import os
-import json
-import Truth_Table_1_9
-import iec61131_3_v1_00
-
-# Extract the signal addresses from the Excel file from the correct columns
-def get_signal_addresses(excel_file: str, signal_addresses_sheet: str) -> pd.DataFrame:
-    """
-    Extracts signal addresses from an Excel sheet.
-
-    Parameters:
-        excel_file (str): Path to the Excel file.
-        signal_addresses_sheet (str): Name of the sheet containing the signal addresses.
-
-    Returns:
-        pd.DataFrame: A DataFrame containing the extracted signal addresses.
-    """
-    signal_addresses_tab = pd.read_excel(
-        excel_file, sheet_name=signal_addresses_sheet, header=None)
-    print(signal_addresses_tab.head())  # Display the first few rows of the sheet
-    return signal_addresses_tab
-
-# By knowing the DUT has a user defined LN it is possible to determine it
-def determine_DUT(signal_addresses: pd.DataFrame) -> tuple:
-    """
-    Determines the DUT based on the presence of the word 'ASSESS' in column 2
-    and slices the adjacent cell value in column 1 to extract the DUT.
-
-    Parameters:
-        signal_addresses (pd.DataFrame): DataFrame containing signal addresses.
-
-    Returns:
-        tuple: The DUT address and the adjacent cell value, or an appropriate message.
-    """
-    # Iterate through rows to find 'ASSESS' in column 2
-    for index, row in signal_addresses.iterrows():
-        column_2_value = str(row[2]).strip() if not pd.isna(row[2]) else ""  # Column "C"
-        if column_2_value == "ASSESS":
-            adjacent_cell_value = str(row[1]).strip() if not pd.isna(row[1]) else ""  # Column "B"
-            # Extract DUT by slicing up to the first '/' in the adjacent cell value
-            if '/' in adjacent_cell_value:
-                dut = adjacent_cell_value.split('/')[0]  # Extract DUT before the '/'
-                print(f"Row {index + 1}: Found DUT '{dut}' from adjacent cell '{adjacent_cell_value}'")
-                return dut, adjacent_cell_value
-
-    # After iterating through all rows, return "not found" result if no match
-    print("No DUT found in signal addresses.")
-    return "No DUT found in signal addresses.", ""
-
-def get_root(SCD: str) -> str:
-    """
-    Parses an XML file (SCD) and retrieves the root element.
-
-    Parameters:
-        SCD (str): Path to the XML file.
-
-    Returns:
-        ET.Element: The root element of the XML document.
-    """
-    try:
-        print(f"Attempting to parse the file: {SCD}")
-        tree = ET.parse(SCD)
-        print("XML file parsed successfully.")
-
-        root = tree.getroot()
-        print(f"Root tag: {root.tag}")
-
-        # Optionally print a snippet of the root element's structure
-        print("Root element's attributes:", root.attrib)
-        print("First-level child tags:", [child.tag for child in root])
-
-        return root
-    except FileNotFoundError:
-        print(f"Error: File not found: {SCD}")
-        raise
-    except ET.ParseError as e:
-        print(f"Error parsing the XML file: {SCD}. {e}")
-        raise
-
-def get_namespaces(file_path):
-    """
-    Extracts namespaces from an XML file.
-
-    Parameters:
-        file_path (str): Path to the XML file.
-
-    Returns:
-        dict: A dictionary mapping namespace prefixes to URIs, with the default namespace assigned 'scl' as a prefix.
-    """
-    namespaces = {}
-
-    print(f"Reading namespaces from file: {file_path}")
-    try:
-        for _, elem in ET.iterparse(file_path, events=('start-ns',)):
-            ns, uri = elem  # Unpack the tuple of prefix and URI
-            print(f"Namespace found - Prefix: '{ns}' URI: '{uri}'")
-            namespaces[ns] = uri
-
-        if not namespaces:
-            print("No namespaces found in the file.")
-            return {}
-
-        # Find the first prefix (default namespace or the first declared one)
-        first_prefix = next(iter(namespaces))
-        print(f"First prefix identified: '{first_prefix}'")
-
-        # Assign the default namespace (or first prefix) a known prefix 'scl'
-        new_namespaces = {'scl': namespaces.pop(first_prefix)}
-        print(f"Assigned 'scl' prefix to the namespace URI: {new_namespaces['scl']}")
-
-        # Add remaining namespaces
-        new_namespaces.update(namespaces)
-        print("Final namespaces dictionary:", new_namespaces)
-
-        return new_namespaces
-
-    except FileNotFoundError:
-        print(f"Error: File not found: {file_path}")
-        raise
-    except ET.ParseError as e:
-        print(f"Error parsing the XML file: {file_path}. {e}")
-        raise
-
-def get_parent(root, namespaces, DUT) -> Union[str, list]:
-    """
-    Extracts parent IED names and LNode signal addresses from the XML tree.
-
-    Parameters:
-        root (ET.Element): The root element of the XML tree.
-        namespaces (dict): Namespace dictionary for querying namespaced elements.
-        DUT (str): Device Under Test (used for identifying the parent).
-
-    Returns:
-        tuple: A parent IED name, a list of IED names, and a list of LNode signal addresses.
-    """
-    ieds = []
-    scd_addresses = []
-
-    print("Processing IED elements...")
-
-    # Process all IED elements
-    for ied in root.findall('.//scl:IED', namespaces):
-        ied_name = ied.get('name')
-        if ied_name:
-            ieds.append(ied_name)
-            print(f"Found IED - Name: {ied_name}")
-        else:
-            print("Warning: An IED element is missing the 'name' attribute.")
-
-    print(f"Total IEDs found: {len(ieds)}")
-
-    print("Processing LNode elements...")
-
-    # Process all LNode elements
-    for lnode in root.findall('.//scl:LNode', namespaces):
-        ied_name = lnode.get('iedName', '')
-        ld_inst = lnode.get('ldInst', '')
-        pre_fix = lnode.get('prefix', '')
-        ln_class = lnode.get('lnClass', '')
-        ln_inst = lnode.get('lnInst', '')
-
-        if ied_name and ld_inst and ln_class:
-            address = fr"{ied_name}{ld_inst}/{pre_fix}{ln_class}{ln_inst}"
-            scd_addresses.append(address)
-            print(f"Constructed address: {address}")
-        else:
-            print(f"Warning: Incomplete LNode attributes. iedName: {ied_name}, ldInst: {ld_inst}, prefix: {pre_fix}, lnClass: {ln_class}, ln_inst: {ln_inst}")
-
-    print(f"Total LNode addresses constructed: {len(scd_addresses)}")
-
-    print(f"Identifying parent for DUT: {DUT}")
-    parent = next((ied for ied in ieds if ied in DUT), None)
-
-    if parent:
-        print(f"Parent IED identified: {parent}")
-    else:
-        print("Warning: No parent IED matches the provided DUT.")
-
-    return parent, ieds, scd_addresses
-
-def sort_signal_adresses(signal_addresses: pd.DataFrame, dut: str, adjacent_cell: str) -> list:
-    """
-    Sorts signal addresses such that:
-    1. Addresses containing the DUT appear last.
-    2. Address containing the 'adjacent_cell' is positioned second-to-last.
-
-    Parameters:
-        signal_addresses (pd.DataFrame): DataFrame containing signal addresses.
-        dut (str): Device Under Test identifier.
-        adjacent_cell (str): The value of the adjacent cell to prioritize.
-
-    Returns:
-        list: Sorted list of signal addresses.
-    """
-    # Extract signal addresses from column B starting at B2
-    signal_list = signal_addresses.iloc[1:, 1].dropna().astype(str).tolist()  # Skip header row
-    print("Extracted signal addresses from column B:", signal_list)
-
-    # Print the original list
-    print("Original signal addresses:", signal_list)
-    print(f"Device Under Test (DUT): {dut}")
-
-    # Sort elements in list based on whether DUT is in the address
-    dut_last = sorted(signal_list, key=lambda address: dut in address)
-    print("Signal addresses sorted by DUT presence:", dut_last)
-
-    # Find the index of the first 'adjacent_cell' occurrence
-    try:
-        index = [idx for idx, s in enumerate(dut_last) if adjacent_cell in s][0]
-        print(f"Index of '{adjacent_cell}' in sorted addresses: {index}")
-    except IndexError:
-        print(f"Error: No '{adjacent_cell}' found in signal addresses.")
-        raise ValueError(f"No '{adjacent_cell}' found in signal addresses.")
-
-    # Remove the adjacent cell address from list and reinsert at second-to-last position
-    adjacent_cell_address = dut_last.pop(index)
-    dut_last.insert(-1, adjacent_cell_address)
-    print(f"Moved '{adjacent_cell}' address to second-to-last position: {adjacent_cell_address}")
-    print("Final sorted signal addresses:", dut_last)
-    return dut_last
-
-def create_group_types(signal_addresses: pd.DataFrame) -> dict:
-    """
-    Dynamically creates group types (CONTROL, ASSESS, COMMAND) by scanning a DataFrame.
-
-    Parameters:
-        signal_addresses (pd.DataFrame): DataFrame containing signal addresses.
-            - Column B (index 1): Adjacent values for grouping.
-            - Column C (index 2): Group type indicators (CONTROL, ASSESS, COMMAND).
-
-    Returns:
-        dict: A dictionary with keys "CONTROL," "ASSESS," "COMMAND," and their corresponding lists of addresses.
-    """
-    # Initialize the groups
-    group_types = {
-        "CONTROL": [],
-        "ASSESS": [],
-        "COMMAND": []
-    }
-
-    print("Scanning DataFrame for group types...")
-
-    # Iterate through rows to find group types in Column C (index 2)
-    for index, row in signal_addresses.iterrows():
-        column_c_value = str(row[2]).strip() if not pd.isna(row[2]) else ""  # Column C
-        adjacent_value = str(row[1]).strip() if not pd.isna(row[1]) else ""  # Column B
-
-        # Check for each group type and append the adjacent value
-        if column_c_value == "CONTROL":
-            group_types["CONTROL"].append(adjacent_value)
-        elif column_c_value == "ASSESS":
-            group_types["ASSESS"].append(adjacent_value)
-        elif column_c_value == "COMMAND":
-            group_types["COMMAND"].append(adjacent_value)
-
-        # Print validation
-        print(f"Row {index + 1}: Found '{column_c_value}' -> Adding '{adjacent_value}'")
-
-    # Print the final groups for validation
-    print("\nGenerated Group Types:")
-    for group, addresses in group_types.items():
-        print(f"{group}: {addresses}")
-
-    return group_types
-
-def get_test_steps(excel_file: str, test_steps_sheet: str) -> pd.DataFrame:
-    """Read out the test steps from the Excel file."""
-    print(f"Reading test steps from file: {excel_file}, sheet: {test_steps_sheet}")
-    test_steps = pd.read_excel(
-        excel_file, sheet_name=test_steps_sheet, header=None)
-    print("Test Steps DataFrame Head:")
-    print(test_steps.head())  # Display the first few rows of the DataFrame for validation
-    return test_steps
-
-def get_control_values(test_steps) -> Tuple[pd.DataFrame, int]:
-    """
-    Skip the first two rows of the test steps (Excel sequence) to remove numbering and assessments,
-    and skip the last row to remove commands. Only select data from column 2 onward for switch positions.
-    """
-    print("Starting get_control_values...")
-    print(f"Input test_steps:\n{test_steps.head()}")
-
-    switch_positions = test_steps.iloc[2:-1, 2:]  # Extract relevant rows and columns
-    num_test_steps = len(switch_positions.columns) + 1  # Plus one for the initial step
-
-    print(f"Switch positions (after slicing):\n{switch_positions}")
-    print(f"Number of test steps (including initial step): {num_test_steps}")
-
-    return switch_positions, num_test_steps
-
-def load_test_type(file_path="test_type.json") -> int:
-    """
-    Load the test_type value from the specified JSON file.
-
-    Parameters:
-        file_path (str): Path to the JSON file containing the test_type.
-
-    Returns:
-        int: The test_type value (1 or 2).
-
-    Raises:
-        FileNotFoundError: If the file is not found.
-        KeyError: If the test_type key is missing.
-        ValueError: If the test_type is invalid.
-    """
-    try:
-        with open(file_path, "r") as f:
-            test_type_data = json.load(f)
-            test_type = test_type_data["test_type"]
-        print(f"Imported test_type: {test_type}")
-        if test_type not in [1, 2]:
-            raise ValueError("Invalid test_type value. Must be 1 or 2.")
-        return test_type
-    except FileNotFoundError:
-        print(f"Error: {file_path} not found. Exiting.")
-        raise FileNotFoundError(f"The {file_path} file is missing. Run Truth_Table_x_x.py first to generate it.")
-    except KeyError:
-        print(f"Error: {file_path} is malformed or missing 'test_type' key.")
-        raise KeyError("Invalid test_type.json format. Ensure 'test_type' is set correctly.")
-    except ValueError as e:
-        print(str(e))
-        raise
-
-# Add initial step to assessment_row
-def add_initial_assessment_step(assessment_row: np.ndarray, test_type: int) -> np.ndarray:
-    """
-    Adds the initial step to the assessment_row array based on the test_type.
-
-    Parameters:
-        assessment_row (np.ndarray): The original assessment_row array.
-        test_type (int): The test type (1 for SPC, 2 for DPC).
-
-    Returns:
-        np.ndarray: Updated assessment_row with the initial assessment step added.
-    """
-    if test_type == 1:
-        initial_step = False
-        print("Test Type 1 (SPC): Adding initial step 'False'.")
-    elif test_type == 2:
-        initial_step = True
-        print("Test Type 2 (DPC): Adding initial step 'True'.")
-    else:
-        raise ValueError("Invalid test type. Must be 1 (SPC) or 2 (DPC).")
-
-    updated_assessment_row = np.insert(assessment_row, 0, initial_step)
-    # print(f"Updated assessment_row with initial step: {updated_assessment_row}")
-    return updated_assessment_row
-
-def modify_switch_positions(switch_positions, test_type):
-    """
-    Modify switch_positions based on the test_type.
-
-    Parameters:
-        switch_positions (pd.DataFrame): DataFrame containing switch positions.
-        test_type (int): The test_type value (1 or 2).
-    """
-    if test_type == 1:
-        print("User selected SPC (True/False). Setting initial switch position to 'false'.")
-        switch_positions.insert(0, 0, "false")
-    elif test_type == 2:
-        print("User selected DPC (OPEN/CLOSED). Setting initial switch position to 'POS_OFF'.")
-        switch_positions.insert(0, 0, "POS_OFF")
-    print("\nWith Initial Step Added:")
-    print(switch_positions.head())
-
-def process_circuit_breakers(switch_positions, test_type):
-    """
-    Process circuit breakers based on the test_type.
-
-    Parameters:
-        switch_positions (pd.DataFrame or np.ndarray): DataFrame or array containing switch positions.
-        test_type (int): The test_type value (1 or 2).
-
-    Returns:
-        tuple: circuit_breakers (list), cb_states (dict)
-    """
-    # Ensure switch_positions is a DataFrame
-    if isinstance(switch_positions, np.ndarray):
-        switch_positions = pd.DataFrame(switch_positions)
-
-    circuit_breakers = []
-    cb_states = {}
-
-    if test_type == 2:
-        print("Test Type 2 (DPC - OPEN/CLOSED) selected. Processing circuit breakers...")
-
-        # Identify circuit breakers
-        circuit_breakers = [x for x in switch_positions.index if re.search(r"QA\d", str(x)) or ("XCBR" in str(x))]
-        print(f"Circuit Breakers Identified: {circuit_breakers}")
-
-        # Populate cb_states dictionary
-        for cb in circuit_breakers:
-            states = switch_positions.loc[cb].values.flatten()
-            print(f"Processing {cb}: States = {states}")
-            cb_states[cb] = states
-
-        print(f"Final Circuit Breaker States: {cb_states}")
-    elif test_type == 1:
-        print("Test Type 1 (SPC - True/False) selected. Skipping circuit breaker processing.")
-
-    return circuit_breakers, cb_states
-
-def apply_commands_based_on_assessment(assessment_row: np.ndarray, num_test_steps: int) -> list:
-    """
-    Apply specific commands based on the first True and False values in the assessment_row.
-
-    Parameters:
-        assessment_row (np.ndarray): Array containing True/False assessments.
-        num_test_steps (int): Total number of test steps.
-
-    Returns:
-        list: Updated command_row with specific commands applied.
-    """
-    print("Applying commands based on assessment_row...")
-
-    # Find the indices of the first True and first False in the assessment_row
-    try:
-        assessment_idxs = [
-            np.where(assessment_row == True)[0][0],  # First True index
-            np.where(assessment_row == False)[0][0]  # First False index
-        ]
-        print(f"Assessment Indices: {assessment_idxs}")
-    except IndexError:
-        print("Error: Assessment_row must contain at least one True and one False value.")
-        raise ValueError("Assessment_row does not meet the required conditions.")
-
-    # Initialize the command_row with default values ("CAR_NO_OPERATION")
-    command_row = ["CAR_NO_OPERATION"] * num_test_steps
-    print(f"Initialized command_row: {command_row}")
-
-    # Define the commands for True and False assessments
-    changes_command = ["CAR_POSITION_CHANGED", "CAR_BLOCKED_BY_INTERLOCKING"]
-
-    # Apply the commands at the respective indices
-    for idx, command in zip(assessment_idxs, changes_command):
-        command_row[idx] = command
-        print(f"Set command '{command}' at index {idx}")
-
-    print(f"Final command_row: {command_row}")
-    return command_row
-
-def sort_switch_order(LNs_signal_dict: dict, cb_direction: str) -> dict:
-    """
-    Sort the dictionary keys based on the circuit breaker (CB) direction (opening/closing).
-    Keys with 'XSWI' are sorted last when opening and first when closing.
-    """
-    print("Starting sort_switch_order...")
-    print(f"Input LNs_signal_dict: {LNs_signal_dict}")
-    print(f"CB Direction: {cb_direction}")
-
-    key = list(LNs_signal_dict.keys())  # Get dictionary keys
-    print(f"Original keys: {key}")
-
-    if cb_direction.lower() == 'opening':
-        sorted_keys = sorted(key[:-2], key=lambda x: ('XSWI' in x, x))  # Sort for opening
-    elif cb_direction.lower() == 'closing':
-        sorted_keys = sorted(key[:-2], key=lambda x: ('XSWI' not in x, x))  # Sort for closing
-    else:
-        print("Invalid cb_direction! Must be 'opening' or 'closing'.")
-        return {}
-
-    sorted_keys += key[-2:]  # Add the last two keys
-    print(f"Sorted keys: {sorted_keys}")
-
-    new_dict = {key: LNs_signal_dict[key] for key in sorted_keys}
-    print(f"New sorted dictionary: {new_dict}")
-    return new_dict
-
-def get_expected_vals(LNs_signal_dict: dict) -> dict:
-    """
-    Retrieve the expected values for each Logical Node (LN) in each step from the dictionary.
-    """
-    print("Starting get_expected_vals...")
-    print(f"Input LNs_signal_dict: {LNs_signal_dict}")
-
-    # Ensure `num_test_steps` is defined before using this function
-    try:
-        expected_vals = {
-            i: [LNs_signal_dict[k][i] for k in LNs_signal_dict.keys()]
-            for i in range(num_test_steps)
-        }
-        print(f"Expected values: {expected_vals}")
-        return expected_vals
-    except NameError as e:
-        print("Error: num_test_steps is not defined. Ensure get_control_values is called first.")
-        raise e
-
-def create_FAT_json(
-        version: float,
-        test_name: str,
-        dut_name: str,
-        group_types: dict,
-        num_test_steps: int,
-        test_type: int,
-        switch_positions: np.ndarray,
-        assessment_row: list,
-        LNs_signal: dict,
-        circuit_breakers=None,
-        cb_states=None
-) -> dict:
-    print("Starting create_FAT_json...")
-
-    # Initialize the JSON structure
-    ilo_FAT = {
-        "version": str(version),
-        "testCases": [
-            {
-                "name": test_name,
-                "parent": dut_name,
-                "autoSetControlValues": True,
-                "autoAssess": True,
-                "assessmentLockoutTime": 1.5,
-                "autoAssessTimeout": 1.5,
-                "switchOperationTime": 1.5,
-                "signalGroups": [],
-                "testSteps": []
-            }
-        ]
-    }
-
-    # Add Signal Groups
-    for group_type, signals in group_types.items():
-        ilo_FAT["testCases"][0]["signalGroups"].append({
-            "groupType": group_type,
-            "signalRefs": signals
-        })
-        print(f"Added signal group: {group_type}, Signal References: {signals}")
-
-    # Consolidate all signals from all groups
-    all_signals = []
-    for signals in group_types.values():
-        all_signals.extend(signals)
-
-    # Handle Test Steps for test_type == 1
-    if test_type == 1:
-        print("Processing Test Steps for Test Type 1 (SPC - True/False)...")
-        for step in range(num_test_steps):
-            print(f"Processing step {step + 1}/{num_test_steps}...")
-
-            # Extract CONTROL values from the first rows of val_assess_cmd
-            expected_control = [
-                {
-                    "signalRef": signal,
-                    "value": val_assess_cmd[control_idx, step]
-                    if control_idx < val_assess_cmd.shape[0] and step < val_assess_cmd.shape[1]
-                    else "Undefined"
-                }
-                for control_idx, signal in enumerate(group_types.get("CONTROL", []))
-            ]
-
-            # Extract ASSESS values from the last row of val_assess_cmd (assessment_row)
-            expected_assess = [
-                {
-                    "signalRef": signal,
-                    "value": val_assess_cmd[-1, step]  # Last row contains ASSESS values
-                    if step < val_assess_cmd.shape[1]
-                    else "Undefined"
-                }
-                for signal in group_types.get("ASSESS", [])
-            ]
-
-            # Combine CONTROL and ASSESS values into a single test step
-            test_step = {
-                "description": "",
-                "ordered": True,
-                "expected": expected_control + expected_assess
-            }
-
-            # Append the step to the testSteps array
-            ilo_FAT["testCases"][0]["testSteps"].append(test_step)
-
-
-    # Handle Test Steps for test_type == 2
-    elif test_type == 2:
-        print("Processing Test Steps for Test Type 2 (DPC - OPEN/CLOSED)...")
-        for step in range(num_test_steps):
-            print(f"Processing step {step + 1}/{num_test_steps}...")
-
-            # Extract CONTROL values from the first rows of val_assess_cmd
-            expected_control = [
-                {
-                    "signalRef": signal,
-                    "value": val_assess_cmd[control_idx, step]
-                    if control_idx < len(group_types.get("CONTROL", [])) and step < val_assess_cmd.shape[1]
-                    else "Undefined"
-                }
-                for control_idx, signal in enumerate(group_types.get("CONTROL", []))
-            ]
-
-            # Extract ASSESS values from the row corresponding to ASSESS signals in val_assess_cmd
-            expected_assess = [
-                {
-                    "signalRef": signal,
-                    "value": val_assess_cmd[len(group_types.get("CONTROL", [])), step]
-                    if step < val_assess_cmd.shape[1]
-                    else "Undefined"
-                }
-                for signal in group_types.get("ASSESS", [])
-            ]
-
-            # Extract COMMAND values from the row corresponding to COMMAND signals in val_assess_cmd
-            expected_command = [
-                {
-                    "signalRef": signal,
-                    "commandResult": val_assess_cmd[len(group_types.get("CONTROL", [])) + 1, step]
-                    if step < val_assess_cmd.shape[1]
-                    else "Undefined"
-                }
-                for signal in group_types.get("COMMAND", [])
-            ]
-
-            # Combine CONTROL, ASSESS, and COMMAND values into a single test step
-            expected_values = expected_control + expected_assess + expected_command
-
-            # Handle step description and ordering
-            if step == 0:
-                test_step = {
-                    "description": "",
-                    "ordered": False,
-                    "expected": expected_values
-                }
-                ilo_FAT["testCases"][0]["testSteps"].append(test_step)
-                print(f"Added initial step with all signal values for step {step + 1}.")
-            elif any(cb_states.get(cb, [])[step] == "POS_ON" and cb_states.get(cb, [])[step - 1] == "POS_OFF"
-                     for cb in circuit_breakers):
-                print(f"Step {step + 1}: CLOSING CB detected.")
-                test_step = {
-                    "description": "",
-                    "ordered": True,
-                    "expected": expected_values
-                }
-                ilo_FAT["testCases"][0]["testSteps"].append(test_step)
-            elif any(cb_states.get(cb, [])[step] == "POS_OFF" and cb_states.get(cb, [])[step - 1] == "POS_ON"
-                     for cb in circuit_breakers):
-                print(f"Step {step + 1}: OPENING CB detected.")
-                test_step = {
-                    "description": "",
-                    "ordered": True,
-                    "expected": expected_values
-                }
-                ilo_FAT["testCases"][0]["testSteps"].append(test_step)
-            else:
-                print(f"Step {step + 1}: Default step added.")
-                test_step = {
-                    "description": "",
-                    "ordered": True,
-                    "expected": expected_values
-                }
-                ilo_FAT["testCases"][0]["testSteps"].append(test_step)
-
-    print("JSON creation complete.")
-    return ilo_FAT
-
-def validate_json(json_file, schema):
-    """JSON validation against scehma. Takes the file and the schema as inputs."""
-    # Load the generated JSON
-    with open(json_file, "r") as test_file:
-        generated_json = json.load(test_file)
-        # Validate the generated JSON against the schema
-    try:
-        jsonschema.validate(generated_json, schema)
-        print("JSON is valid.")
-    except jsonschema.ValidationError as e:
-        print("JSON is invalid.")
-        print(e)
-
-# def check_and_run_61131():
-#
-#     """Ask the user if they have a 61131-3 file and optionally run the analysis script."""
-#     root = tk.Tk()
-#     root.withdraw()  # Hide main window
-#
-#     answer = messagebox.askyesno("File Analysis", "Do you have a 61131-3 file to analyse?")
-#
-#     if answer:  # Yes selected
-#         subprocess.run([sys.executable, "iec61131_3_v1_00.py"], env=os.environ.copy())
-#     else:
-#         print("Continuing without analyzing a 61131-3 file...")
-#
-# # --- Call at the start of your script ---
-# check_and_run_61131()
-
-
-
-# %%
-
-def check_and_run_61131():
-    """Ask the user if they have a 61131-3 file and optionally run the analysis script."""
-    run_analysis = {"yes": False}
-
-    def on_yes():
-        run_analysis["yes"] = True
-        dialog.destroy()
-        root.quit()
-
-    def on_no():
-        run_analysis["yes"] = False
-        dialog.destroy()
-        root.quit()
-
-    root = tk.Tk()
-    root.withdraw()
-
-    dialog = tk.Toplevel(root)
-    dialog.title("File Analysis")
-    dialog.geometry("300x120")
-
-    tk.Label(dialog, text="Do you have a 61131-3 file to analyse?", wraplength=280).pack(pady=10)
-    tk.Button(dialog, text="Yes", width=10, command=on_yes).pack(side=tk.LEFT, padx=20, pady=20)
-    tk.Button(dialog, text="No", width=10, command=on_no).pack(side=tk.RIGHT, padx=20, pady=20)
-
-    root.mainloop()
-    root.destroy()  # Ensure full cleanup
-
-    if run_analysis["yes"]:
-        print("Running IEC 61131-3 analysis...")
-        iec61131_3_v1_00.main()
-        tk._default_root = None
-    else:
-        print("Skipping IEC 61131-3 analysis...")
-
-# --- Call at the start of your script ---
-check_and_run_61131()
-Truth_Table_1_9.main()
-
-
-root = tk.Tk()
-app = FileBrowserApp(root)
-root.mainloop()
-
-# Access the file paths and input string after the GUI interaction
-test_sequence_file = app.excel_file
-scd_file = app.xml_file
-json_output_file = app.input_str
-
-# Use the files and input string in your code
-print(f"Excel file: {test_sequence_file}")
-print(f"XML file: {scd_file}")
-print(f"Input string: {json_output_file}")
-
-signal_addresses = get_signal_addresses(
-    excel_file=test_sequence_file, signal_addresses_sheet="Signal Addresses"
-)
-
-dut, adjacent_cell_value = determine_DUT(signal_addresses)
-print("Determined DUT:", dut)
-
-root = get_root(scd_file)
-namespaces = get_namespaces(scd_file)
-# Print the inputs to the get_parent function for validation
-print("Calling get_parent function...")
-print(f"Root element tag: {root.tag}")
-print(f"Namespaces: {namespaces}")
-print(f"Device Under Test (DUT): {dut}")
-
-# Call the get_parent function
-parent, ieds, scd_addresses = get_parent(root, namespaces, dut)
-
-# Print the results returned by get_parent for validation
-print("\nResults from get_parent:")
-print(f"Parent IED: {parent}")
-print(f"IEDs: {ieds}")
-print(f"Total IEDs found: {len(ieds)}")
-print(f"Signal Addresses (scd_addresses): {scd_addresses}")
-print(f"Total Signal Addresses: {len(scd_addresses)}")
-
-# compare the list of ieds from the SCD file with the list of ieds
-# from the signal addresses and extract only the ones used.
-# bay_ieds = [ied for ied in ieds if any(
-#     ied in signal for signal in signal_addresses)]
-
-
-# Print the returned values for debugging
-print(f"Determined DUT: {dut}")
-print(f"Adjacent Cell Value: {adjacent_cell_value}")
-
-# Call sort_signal_adresses with the DUT and adjacent cell value
-try:
-    sorted_addresses = sort_signal_adresses(signal_addresses, dut, adjacent_cell=adjacent_cell_value)
-    print("\nResults from sort_signal_adresses:")
-    print("Sorted Signal Addresses:", sorted_addresses)
-    print(f"Total Signal Addresses: {len(sorted_addresses)}")
-except ValueError as e:
-    print("Error during sorting:", e)
-
-# Check if all signal addresses are contained in the list of scd addresses
-# Prepare signal addresses for comparison
-print("\nPreparing signal addresses for SCD comparison...")
-signal_addresses_check = [address.split(".")[0] for address in sorted_addresses]
-print("Signal Addresses for Comparison (before '.'): ", signal_addresses_check)
-
-# Check if all signal addresses are contained in the SCD addresses
-print("\nChecking if all signal addresses are in SCD addresses...")
-if all(address in scd_addresses for address in signal_addresses_check):
-    print("All signal addresses are contained in the SCD")
-else:
-    # Find missing addresses for better error reporting
-    missing_addresses = [address for address in signal_addresses_check if address not in scd_addresses]
-    print("Missing Signal Addresses:", missing_addresses)
-    raise Exception(f"Not all signal addresses are contained in the SCD. Missing addresses: {missing_addresses}")
-
-try:
-    print("Calling create_group_types...")
-    group_types = create_group_types(signal_addresses)
-    print("\nValidation of Group Types:")
-    for group, addresses in group_types.items():
-        print(f"{group}: {addresses}")
-        if not addresses:
-            print(f"Warning: {group} group is empty.")
-except ValueError as e:
-    print(f"Error: {e}")
-except Exception as e:
-    print(f"Unexpected Error: {e}")
-
-# Example call with validation
-try:
-    print("Fetching test steps...")
-    test_steps = get_test_steps(
-        excel_file=test_sequence_file, test_steps_sheet="Test Steps")
-    print("Test Steps DataFrame Loaded Successfully.")
-    print("Test Steps Shape:", test_steps.shape)  # Validate shape of DataFrame
-except FileNotFoundError as e:
-    print(f"File not found: {e}")
-except ValueError as e:
-    print(f"Value error: {e}")
-except Exception as e:
-    print(f"An unexpected error occurred: {e}")
-
-switch_positions, num_test_steps = get_control_values(test_steps)
-
-test_type = load_test_type()  # Load test_type from JSON
-
-# Assuming `test_steps` is a pandas DataFrame
-try:
-    print("Extracting assessment_row from test_steps...")
-
-    # Locate the row where "ASSESS" is in column B (index 1)
-    assess_row_index = test_steps[test_steps.iloc[:, 1].astype(str).str.contains("ASSESS", na=False)].index[0]
-
-    # Extract the values from the found row, from column 2 onwards
-    assessment_row = test_steps.iloc[assess_row_index, 2:].values.flatten()
-
-    print(f"Original assessment_row (without initial step): {assessment_row}")
-
-    # Call the function to add the initial step
-    assessment_row = add_initial_assessment_step(assessment_row, test_type)
-
-    print(f"Updated assessment_row (with initial step): {assessment_row}")
-
-except IndexError as e:
-    print("Error: The specified row or columns do not exist in test_steps.")
-    raise e
-except Exception as e:
-    print("An unexpected error occurred:", e)
-    raise e
-
-print("Switch Positions (Before):")
-print(switch_positions.head())
-
-switch_positions.index = group_types["CONTROL"]
-print("\nUpdated Index:")
-print(switch_positions.index)
-
-switch_positions.replace("CLOSED", "POS_ON", inplace=True, regex=True)
-switch_positions.replace("closed", "POS_ON", inplace=True, regex=True)
-switch_positions.replace("OPEN", "POS_OFF", inplace=True, regex=True)
-switch_positions.replace("open", "POS_OFF", inplace=True, regex=True)
-switch_positions.replace("true", "true", inplace=True, regex=True)
-switch_positions.replace("false", "false", inplace=True, regex=True)
-print("\nStandardized Values:")
-print(switch_positions.head())
-
-# Modify switch_positions
-mod_pos = modify_switch_positions(switch_positions, test_type)
-
-if test_type == 2:
-    print("Test Type 2 (DPC): Applying command logic...")
-    command_row = apply_commands_based_on_assessment(assessment_row, num_test_steps)
-elif test_type == 1:
-    print("Test Type 1 (SPC): Skipping command logic...")
-    # command_row = ["CAR_NO_OPERATION"] * num_test_steps  # Default inactive commands
-    # print(f"Initialized command_row: {command_row}")
-else:
-    print("No valid test type imported. Exiting or handling default behavior.")
-    raise ValueError("Invalid test type imported.")
-
-# Convert to NumPy array for later use in stacking
-print("Resetting index and converting switch_positions to NumPy array...")
-switch_positions.reset_index(drop=True, inplace=True)
-print(f"Reset switch_positions DataFrame:\n{switch_positions.head()}")
-
-switch_positions = switch_positions.to_numpy()
-print(f"Converted switch_positions to NumPy array:\n{switch_positions}")
-
-# Conditional stacking based on test_type
-if test_type == 2:
-    print("Test Type 2 (DPC - OPEN/CLOSED): Including switch_positions, assessment_row, and command_row in stacking...")
-    val_assess_cmd = np.vstack([switch_positions, assessment_row, command_row])
-elif test_type == 1:
-    print("Test Type 1 (SPC - True/False): Including only switch_positions and assessment_row in stacking...")
-    val_assess_cmd = np.vstack([switch_positions, assessment_row])
-else:
-    print("Invalid test_type. Exiting.")
-    raise ValueError("Invalid test_type imported.")
-
-print(f"Combined val_assess_cmd array:\n{val_assess_cmd}")
-
-# Create a dictionary to pair signal addresses with combined data
-print("\nCreating a dictionary to pair signal addresses with combined data...")
-print(f"Signal Addresses:\n{signal_addresses}")
-print(f"val_assess_cmd Rows (to be mapped):\n{val_assess_cmd}")
-
-LNs_signal = dict(zip(signal_addresses, val_assess_cmd))
-
-# Validation: Print a sample of the dictionary
-print("\nValidation: Final LNs_signal dictionary (signal address to data mapping):")
-for key, value in list(LNs_signal.items())[:5]:  # Print the first 5 items for validation
-    print(f"Signal Address: {key}, Data: {value}")
-
-print("\nSuccessfully created LNs_signal dictionary!")
-
-# Call process_circuit_breakers to get circuit_breakers and cb_states
-circuit_breakers, cb_states = process_circuit_breakers(switch_positions, test_type)
-
-# Call create_FAT_json with circuit_breakers and cb_states
-json_structure = create_FAT_json(
-    version=1.2,
-    test_name=json_output_file,
-    dut_name=parent,
-    group_types=group_types,
-    num_test_steps=num_test_steps,
-    test_type=test_type,
-    # signal_addresses=signal_addresses,
-    switch_positions=switch_positions,
-    assessment_row=assessment_row,
-    LNs_signal=LNs_signal,
-    circuit_breakers=circuit_breakers,
-    cb_states=cb_states  # Pass cb_states as an argument
-)
-
-# Json export
-with open(json_output_file+".json", "w") as file:
-    json.dump(json_structure, file, indent=2)
-
-
-test_case_schema = {
-    # Most recent json schema specification
-    "$schema": "http://json-schema.org/draft/2020-12/schema",
-    "type": "object",
-    "properties": {
-        "version": {
-            "type": "string"
-        },
-        "testCases": {
-            "type": "array",
-            "items": {
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string"
-                    },
-                    "autoSetControlValues": {
-                        "type": "boolean"
-                    },
-                    "autoAssess": {
-                        "type": "boolean"
-                    },
-                    "assessmentLockoutTime": {
-                        "type": "number"
-                    },
-                    "autoAssessTimeout": {
-                        "type": "number"
-                    },
-                    "switchOperationTime": {
-                        "type": "number"
-                    },
-                    "parent": {
-                        "type": "string"
-                    },
-                    "signalGroups": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "groupType": {
-                                    "type": "string",
-                                    "enum": ["CONTROL", "ASSESS", "COMMAND"]
-                                },
-                                "signalRefs": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "string"
-                                    }
-                                }
-                            },
-                            "required": ["groupType", "signalRefs"]
-                        }
-                    },
-                    "testSteps": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "description": {
-                                    "type": "string"
-                                },
-                                "ordered": {
-                                    "type": "boolean"
-                                },
-                                "expected": {
-                                    "type": "array",
-                                    "items": {
-                                        "type": "object",
-                                        "properties": {
-                                            "signalRef": {
-                                                "type": "string"
-                                            },
-                                            "value": {
-                                                "type": ["string", "boolean"]
-                                            },
-                                            "commandResult": {
-                                                "type": "string"
-                                            }
-                                        },
-                                        "required": ["signalRef"],
-                                        "oneOf": [
-                                            {
-                                                "required": ["value"]
-                                            },
-                                            {
-                                                "required": ["commandResult"]
-                                            }
-                                        ]
-                                    }
-                                }
-                            },
-                            "required": ["ordered", "expected"]
-                        }
-                    }
-                },
-                "required": [
-                    "name",
-                    "parent",
-                    "autoSetControlValues",
-                    "autoAssess",
-                    "assessmentLockoutTime",
-                    "autoAssessTimeout",
-                    "switchOperationTime",
-                    "signalGroups",
-                    "testSteps"
-                ]
-            }
-        }
-    },
-    "required": ["version", "testCases"]
-}
-
-# Run the validation function
-validate_json(json_output_file+".json", test_case_schema)
-
-# %%
-
+# %%
+from sys import prefix
+import numpy as np
+import pandas as pd
+from typing import Tuple
+import re
+from typing import Union
+import subprocess
+import sys
+import os
+import json
+import gzip
+import logging
+import Truth_Table_1_9
+import stage_timing
+from generator_log import logger
+from address_index import AddressIndex
+from scd_cache import cached_index_scd
+from scd_index import index_scd
+from scd_types import DataTypeResolver, print_resolved
+from signal_list import SignalList
+from state_codes import (ASSESS_CODES, CAR_BLOCKED_BY_INTERLOCKING, CAR_NO_OPERATION, CAR_POSITION_CHANGED,
+                         ASSESS_FALSE, ASSESS_TRUE, CONTROL_CODES, INITIAL_CODES, STATE_VALUES, encode_states)
+from fat_json_schema import test_case_schema, validate_document, validate_test_case_plan
+from fat_json_writer import FAT_header, iter_test_steps, signal_layout, write_FAT_json
+from workbook_reader import SIGNAL_ADDRESSES_SHEET, TEST_STEPS_SHEET, read_workbook
+from step_ordering import (breaker_transitions, order_test_steps, print_ordering_report, switch_entry_orders,
+                           transition_descriptions)
+
+# Ordering of the test steps generated in this run: 'auto', 'gray', 'nearest' or 'none'. Steps read from an
+# existing Test Steps sheet keep their order unless generate_test_case is given a method.
+STEP_ORDERING = "auto"
+# JSON output: compact separators and/or gzip compression (writes <name>.json.gz)
+JSON_COMPACT = False
+JSON_GZIP = False
+# Keep the SCD index in the on-disk cache (see scd_cache), so reruns against the same SCD skip the XML parse.
+SCD_CACHE = True
+
+# Extract the signal addresses from the Excel file from the correct columns
+def get_signal_addresses(excel_file: str, signal_addresses_sheet: str) -> pd.DataFrame:
+    """
+    Extracts signal addresses from an Excel sheet.
+
+    Parameters:
+        excel_file (str): Path to the Excel file.
+        signal_addresses_sheet (str): Name of the sheet containing the signal addresses.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the extracted signal addresses.
+    """
+    signal_addresses_tab = pd.read_excel(
+        excel_file, sheet_name=signal_addresses_sheet, header=None)
+    logger.debug("%s", signal_addresses_tab.head())  # The first few rows of the sheet
+    return signal_addresses_tab
+
+def signal_addresses_from_lists(control_addresses: list, assess_addresses: list,
+                                command_addresses: list = ()) -> pd.DataFrame:
+    """
+    Builds a DataFrame in the layout of the 'Signal Addresses' sheet (address in column B, group type
+    in column C, truth table column in column D), e.g. from the addresses documented in a PLCopen POU.
+    """
+    rows = [["IED name", "Signal Addresse", None, None]]
+    rows += [[None, address, "ASSESS", f"Output{i}"] for i, address in enumerate(assess_addresses, start=1)]
+    rows += [[None, address, "CONTROL", f"Input{i}"] for i, address in enumerate(control_addresses, start=1)]
+    rows += [[None, address, "COMMAND", None] for address in command_addresses]
+    return pd.DataFrame(rows)
+
+def command_address(assess_address: str) -> Union[str, None]:
+    """
+    Returns the CSWI position of the switch whose interlock (CILO) is assessed,
+    e.g. 'AA1D1Q01Q1QB1/CILO1.EnaCls' -> 'AA1D1Q01Q1QB1/CSWI1.Pos', or None if it is not a CILO.
+    """
+    match = re.fullmatch(r"(.+/)CILO(\d*)\.Ena\w*", assess_address.strip())
+    return f"{match.group(1)}CSWI{match.group(2)}.Pos" if match else None
+
+def get_test_steps(excel_file: str, test_steps_sheet: str) -> pd.DataFrame:
+    """Read out the test steps from the Excel file."""
+    logger.info("Reading test steps from file: %s, sheet: %s", excel_file, test_steps_sheet)
+    test_steps = pd.read_excel(
+        excel_file, sheet_name=test_steps_sheet, header=None)
+    logger.debug("Test Steps DataFrame Head:\n%s", test_steps.head())  # The first few rows, for validation
+    return test_steps
+
+def test_steps_layout(test_steps: pd.DataFrame) -> str:
+    """
+    'rows' if the Test Steps sheet holds one row per step under a 'Step', Input1..InputN, 'ASSESS'
+    header (written for more steps than fit in Excel's columns), else 'columns' (one column per step).
+    """
+    if test_steps.shape[0] and test_steps.shape[1] and str(test_steps.iat[0, 0]).strip() == "Step":
+        return "rows"
+    return "columns"
+
+def get_control_values(test_steps) -> Tuple[pd.DataFrame, int]:
+    """
+    Skip the first two rows of the test steps (Excel sequence) to remove numbering and assessments,
+    and skip the last row to remove commands. Only select data from column 2 onward for switch positions.
+    In the row layout the header row, the step number column and the ASSESS column are skipped instead,
+    and the inputs are turned into the same one-column-per-step frame.
+    """
+    logger.debug("Starting get_control_values...")
+    logger.debug("Input test_steps:\n%s", test_steps.head())
+
+    if test_steps_layout(test_steps) == "rows":
+        # One 2D array transpose; same column labels as the column layout (steps start in column C)
+        values = test_steps.iloc[1:, 1:-1].to_numpy(dtype=object).T
+        switch_positions = pd.DataFrame(values, columns=range(2, values.shape[1] + 2), dtype=object)
+    else:
+        switch_positions = test_steps.iloc[2:-1, 2:]  # Extract relevant rows and columns
+    num_test_steps = len(switch_positions.columns) + 1  # Plus one for the initial step
+
+    logger.debug("Switch positions (after slicing):\n%s", switch_positions)
+    logger.info("Number of test steps (including initial step): %d", num_test_steps)
+
+    return switch_positions, num_test_steps
+
+def load_test_type(file_path="test_type.json") -> int:
+    """
+    Load the test_type value from the specified JSON file.
+
+    Parameters:
+        file_path (str): Path to the JSON file containing the test_type.
+
+    Returns:
+        int: The test_type value (1 or 2).
+
+    Raises:
+        FileNotFoundError: If the file is not found.
+        KeyError: If the test_type key is missing.
+        ValueError: If the test_type is invalid.
+    """
+    try:
+        with open(file_path, "r") as f:
+            test_type_data = json.load(f)
+            test_type = test_type_data["test_type"]
+        logger.info("Imported test_type: %s", test_type)
+        if test_type not in [1, 2]:
+            raise ValueError("Invalid test_type value. Must be 1 or 2.")
+        return test_type
+    except FileNotFoundError:
+        logger.error("Error: %s not found. Exiting.", file_path)
+        raise FileNotFoundError(f"The {file_path} file is missing. Run Truth_Table_x_x.py first to generate it.")
+    except KeyError:
+        logger.error("Error: %s is malformed or missing 'test_type' key.", file_path)
+        raise KeyError("Invalid test_type.json format. Ensure 'test_type' is set correctly.")
+    except ValueError as e:
+        logger.error("%s", e)
+        raise
+
+# Add initial step to assessment_row
+def add_initial_assessment_step(assessment_row: np.ndarray, test_type: int) -> np.ndarray:
+    """
+    Adds the initial step to the assessment_row array based on the test_type.
+
+    Parameters:
+        assessment_row (np.ndarray): The original assessment_row array of state codes.
+        test_type (int): The test type (1 for SPC, 2 for DPC).
+
+    Returns:
+        np.ndarray: Updated assessment_row with the initial assessment step added.
+    """
+    if test_type == 1:
+        logger.info("Test Type 1 (SPC): Adding initial step 'False'.")
+    elif test_type == 2:
+        logger.info("Test Type 2 (DPC): Adding initial step 'True'.")
+    else:
+        raise ValueError("Invalid test type. Must be 1 (SPC) or 2 (DPC).")
+
+    updated_assessment_row = np.insert(assessment_row, 0, INITIAL_CODES[test_type][1])
+    return updated_assessment_row
+
+def modify_switch_positions(switch_positions, test_type):
+    """
+    Modify switch_positions based on the test_type.
+
+    Parameters:
+        switch_positions (pd.DataFrame): DataFrame containing switch position state codes.
+        test_type (int): The test_type value (1 or 2).
+    """
+    if test_type == 1:
+        logger.info("User selected SPC (True/False). Setting initial switch position to 'false'.")
+    elif test_type == 2:
+        logger.info("User selected DPC (OPEN/CLOSED). Setting initial switch position to 'POS_OFF'.")
+    if test_type in INITIAL_CODES:
+        switch_positions.insert(0, 0, np.int8(INITIAL_CODES[test_type][0]))
+    logger.debug("\nWith Initial Step Added:\n%s", switch_positions.head())
+
+def process_circuit_breakers(switch_positions: pd.DataFrame, test_type: int) -> tuple:
+    """
+    Finds the circuit breakers among the CONTROL signals and the steps in which they close or open.
+
+    Parameters:
+        switch_positions (pd.DataFrame): State codes of the CONTROL signals (index) by test steps (columns).
+        test_type (int): The test_type value (1 or 2).
+
+    Returns:
+        tuple: circuit_breakers (list) and the step description of every step (np.ndarray of str,
+        e.g. 'QA1 closing'; all empty for SPC tests).
+    """
+    if test_type == 2:
+        logger.info("Test Type 2 (DPC - OPEN/CLOSED) selected. Processing circuit breakers...")
+        circuit_breakers, transitions = breaker_transitions(switch_positions)
+        logger.info("Circuit Breakers Identified: %s", circuit_breakers)
+        descriptions = transition_descriptions(circuit_breakers, transitions)
+        logger.info("Steps moving a circuit breaker: %d of %d", int((descriptions != '').sum()), len(descriptions))
+        return circuit_breakers, descriptions
+
+    logger.info("Test Type 1 (SPC - True/False) selected. Skipping circuit breaker processing.")
+    return [], np.full(switch_positions.shape[1], "", dtype=object)
+
+def apply_commands_based_on_assessment(assessment_row: np.ndarray, num_test_steps: int) -> np.ndarray:
+    """
+    Apply specific commands based on the first True and False values in the assessment_row.
+
+    Parameters:
+        assessment_row (np.ndarray): State codes of the True/False assessments.
+        num_test_steps (int): Total number of test steps.
+
+    Returns:
+        np.ndarray: Command state codes, CAR_NO_OPERATION except for the two commanded steps.
+    """
+    logger.info("Applying commands based on assessment_row...")
+
+    # Find the indices of the first True and first False in the assessment_row
+    try:
+        assessment_idxs = [
+            np.flatnonzero(assessment_row == ASSESS_TRUE)[0],  # First True index
+            np.flatnonzero(assessment_row == ASSESS_FALSE)[0]  # First False index
+        ]
+        logger.debug("Assessment Indices: %s", assessment_idxs)
+    except IndexError:
+        logger.error("Error: Assessment_row must contain at least one True and one False value.")
+        raise ValueError("Assessment_row does not meet the required conditions.")
+
+    # Initialize the command_row with default values ("CAR_NO_OPERATION")
+    command_row = np.full(num_test_steps, CAR_NO_OPERATION, dtype=np.int8)
+
+    # Define the commands for True and False assessments
+    changes_command = [CAR_POSITION_CHANGED, CAR_BLOCKED_BY_INTERLOCKING]
+
+    # Apply the commands at the respective indices
+    for idx, command in zip(assessment_idxs, changes_command):
+        command_row[idx] = command
+        logger.info("Set command '%s' at index %d", STATE_VALUES[command], idx)
+
+    logger.debug("Final command_row: %s", command_row)
+    return command_row
+
+def create_FAT_json(
+        version: float,
+        test_name: str,
+        dut_name: str,
+        group_types: dict,
+        num_test_steps: int,
+        test_type: int,
+        switch_positions: np.ndarray,
+        assessment_row: list,
+        LNs_signal: dict,
+        descriptions: np.ndarray = None,
+        val_assess_cmd: np.ndarray = None,
+        entry_orders: dict = None
+) -> dict:
+    """
+    Builds the whole StationScout JSON document in memory. For large tests use write_FAT_json,
+    which streams the same document to disk step by step.
+    """
+    logger.info("Starting create_FAT_json...")
+
+    ilo_FAT = FAT_header(version, test_name, dut_name, group_types)
+    for group in ilo_FAT["testCases"][0]["signalGroups"]:
+        logger.debug("Added signal group: %s, Signal References: %s", group['groupType'], group['signalRefs'])
+
+    layout = signal_layout(group_types, test_type, val_assess_cmd.shape[0])
+    ilo_FAT["testCases"][0]["testSteps"] = list(
+        iter_test_steps(layout, val_assess_cmd, num_test_steps, test_type, descriptions, entry_orders))
+
+    logger.info("JSON creation complete.")
+    return ilo_FAT
+
+def validate_json(json_file, schema=test_case_schema):
+    """
+    JSON validation against scehma. Takes the file and the schema as inputs. The test case schema is
+    checked with the structural fast path and the compiled validator of fat_json_schema.
+    """
+    # Load the generated JSON
+    opener = gzip.open if json_file.endswith(".gz") else open
+    with opener(json_file, "rt") as test_file:
+        generated_json = json.load(test_file)
+    if schema is test_case_schema:
+        return validate_document(generated_json)
+
+    import jsonschema
+    try:
+        jsonschema.validate(generated_json, schema)
+        logger.info("JSON is valid.")
+        return True
+    except jsonschema.ValidationError as e:
+        logger.error("JSON is invalid.\n%s", e)
+        return False
+
+# def check_and_run_61131():
+#
+#     """Ask the user if they have a 61131-3 file and optionally run the analysis script."""
+#     root = tk.Tk()
+#     root.withdraw()  # Hide main window
+#
+#     answer = messagebox.askyesno("File Analysis", "Do you have a 61131-3 file to analyse?")
+#
+#     if answer:  # Yes selected
+#         subprocess.run([sys.executable, "iec61131_3_v1_00.py"], env=os.environ.copy())
+#     else:
+#         print("Continuing without analyzing a 61131-3 file...")
+#
+# # --- Call at the start of your script ---
+# check_and_run_61131()
+
+
+
+# %%
+
+def check_and_run_61131():
+    """Ask the user if they have a 61131-3 file and optionally run the analysis script."""
+    import tkinter as tk
+    import iec61131_3_v1_00
+
+    run_analysis = {"yes": False}
+
+    def on_yes():
+        run_analysis["yes"] = True
+        dialog.destroy()
+        root.quit()
+
+    def on_no():
+        run_analysis["yes"] = False
+        dialog.destroy()
+        root.quit()
+
+    root = tk.Tk()
+    root.withdraw()
+
+    dialog = tk.Toplevel(root)
+    dialog.title("File Analysis")
+    dialog.geometry("300x120")
+
+    tk.Label(dialog, text="Do you have a 61131-3 file to analyse?", wraplength=280).pack(pady=10)
+    tk.Button(dialog, text="Yes", width=10, command=on_yes).pack(side=tk.LEFT, padx=20, pady=20)
+    tk.Button(dialog, text="No", width=10, command=on_no).pack(side=tk.RIGHT, padx=20, pady=20)
+
+    root.mainloop()
+    root.destroy()  # Ensure full cleanup
+
+    if run_analysis["yes"]:
+        logger.info("Running IEC 61131-3 analysis...")
+        iec61131_3_v1_00.main()
+        tk._default_root = None
+    else:
+        logger.info("Skipping IEC 61131-3 analysis...")
+
+def read_test_steps(test_sequence_file: str, test_steps: pd.DataFrame = None) -> Tuple[pd.DataFrame, np.ndarray, int]:
+    """
+    Reads the switch positions and the assessment row back from the Test Steps sheet.
+    Used when the test steps were prepared in the workbook instead of in this run.
+    If test_steps is given (the sheet already read by read_workbook), the workbook is not opened again.
+
+    Returns:
+        tuple: switch_positions, assessment_row (without the initial step) and the number of test steps.
+    """
+    if test_steps is None:
+        try:
+            logger.info("Fetching test steps...")
+            test_steps = get_test_steps(
+                excel_file=test_sequence_file, test_steps_sheet="Test Steps")
+            logger.info("Test Steps DataFrame Loaded Successfully.")
+        except FileNotFoundError as e:
+            logger.error("File not found: %s", e)
+        except ValueError as e:
+            logger.error("Value error: %s", e)
+        except Exception as e:
+            logger.error("An unexpected error occurred: %s", e)
+    logger.info("Test Steps Shape: %s", test_steps.shape)  # Validate shape of DataFrame
+
+    switch_positions, num_test_steps = get_control_values(test_steps)
+
+    try:
+        logger.info("Extracting assessment_row from test_steps...")
+
+        if test_steps_layout(test_steps) == "rows":
+            # The last column, under the ASSESS header
+            assessment_row = test_steps.iloc[1:, -1].to_numpy(dtype=object)
+        else:
+            # Locate the row where "ASSESS" is in column B (index 1)
+            assess_row_index = test_steps[test_steps.iloc[:, 1].astype(str).str.contains("ASSESS", na=False)].index[0]
+
+            # Extract the values from the found row, from column 2 onwards
+            assessment_row = test_steps.iloc[assess_row_index, 2:].values.flatten()
+
+        logger.debug("Original assessment_row (without initial step): %s", assessment_row)
+    except IndexError as e:
+        logger.error("Error: The specified row or columns do not exist in test_steps.")
+        raise e
+    except Exception as e:
+        logger.error("An unexpected error occurred: %s", e)
+        raise e
+
+    return switch_positions, assessment_row, num_test_steps
+
+def test_steps_from_truth_table(truth_table_df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, int]:
+    """
+    Converts the truth table returned by Truth_Table_1_9.main into the switch positions and
+    assessment row that would otherwise be read back from the Test Steps sheet.
+
+    Parameters:
+        truth_table_df (pd.DataFrame): Input1..InputN columns with the test values and the output column last.
+
+    Returns:
+        tuple: switch_positions, assessment_row (without the initial step) and the number of test steps.
+    """
+    input_columns = [column for column in truth_table_df.columns if str(column).startswith("Input")]
+    switch_positions = truth_table_df[input_columns].T.reset_index(drop=True)
+    # Same column labels as the Test Steps sheet (steps start in column C)
+    switch_positions.columns = range(2, len(truth_table_df) + 2)
+    assessment_row = truth_table_df.iloc[:, -1].to_numpy()
+    num_test_steps = len(truth_table_df) + 1  # Plus one for the initial step
+    logger.info("Number of test steps (including initial step): %d", num_test_steps)
+    return switch_positions, assessment_row, num_test_steps
+
+
+def generate_test_case(test_sequence_file: str, scd_file: str, json_output_file: str,
+                       truth_table_df: pd.DataFrame = None, test_type: int = None,
+                       step_ordering: str = None, compact: bool = JSON_COMPACT,
+                       use_gzip: bool = JSON_GZIP, test_name: str = None,
+                       signal_addresses: pd.DataFrame = None, scd_cache: bool = SCD_CACHE) -> str:
+    """
+    Generates the StationScout test case JSON.
+
+    Parameters:
+        test_sequence_file (str): Excel file with the 'Signal Addresses' (and 'Test Steps') sheets.
+        scd_file (str): SCD file of the substation.
+        json_output_file (str): Name of the JSON output file, without extension.
+        truth_table_df (pd.DataFrame): Truth table from Truth_Table_1_9.main. If None, the test steps are
+            read back from the 'Test Steps' sheet.
+        test_type (int): 1 (SPC) or 2 (DPC). If None, it is read from test_type.json.
+        step_ordering (str): Test step ordering method, see order_test_steps. None takes STEP_ORDERING
+            for a truth table of this run and 'none' for steps read from the Test Steps sheet, so a
+            hand-prepared sequence keeps its order.
+        compact (bool): Write the JSON without indentation.
+        use_gzip (bool): Gzip-compress the JSON.
+        test_name (str): Name of the test case in StationScout. Defaults to the file name of json_output_file.
+        signal_addresses (pd.DataFrame): Signal list in the 'Signal Addresses' sheet layout. If None, it is
+            read from test_sequence_file.
+        scd_cache (bool): Use the on-disk SCD index cache.
+
+    Returns:
+        str: Path of the JSON file written.
+    """
+    # Use the files and input string in your code
+    logger.info("Excel file: %s", test_sequence_file)
+    logger.info("XML file: %s", scd_file)
+    logger.info("Input string: %s", json_output_file)
+
+    test_steps = None
+    if signal_addresses is None:
+        # One load of the workbook for the signal list, the DUT and (if needed) the test steps
+        sheets = (SIGNAL_ADDRESSES_SHEET,) if truth_table_df is not None else (SIGNAL_ADDRESSES_SHEET, TEST_STEPS_SHEET)
+        workbook = read_workbook(test_sequence_file, sheets)
+        signal_list = workbook["signal_list"]
+        test_steps = workbook["sheets"].get(TEST_STEPS_SHEET)
+    else:
+        signal_list = SignalList.from_sheet(signal_addresses)
+    # The signal list is parsed once here; every stage below queries it instead of the sheet
+    dut, adjacent_cell_value = signal_list.dut, signal_list.dut_address
+    logger.info("Determined DUT: %s", dut)
+    stage_timing.lap("signal list")
+
+    # One streaming pass over the SCD for the IEDs, LNode addresses and data type templates
+    logger.info("Indexing SCD file: %s", scd_file)
+    scd = cached_index_scd(scd_file) if scd_cache else index_scd(scd_file)
+    namespaces, ieds, scd_addresses = scd["namespaces"], scd["ieds"], scd["lnode_addresses"]
+    logger.info("Namespaces: %s", namespaces)
+    logger.info("Device Under Test (DUT): %s", dut)
+    address_index = AddressIndex(scd_addresses, ieds)
+    parent = address_index.parent_ied(dut)
+    signal_list.assign_ieds(address_index)
+    if not parent:
+        logger.warning("Warning: No parent IED matches the provided DUT.")
+
+    logger.info("\nResults from the SCD index:")
+    logger.info("Parent IED: %s", parent)
+    logger.debug("IEDs: %s", ieds)
+    logger.info("Total IEDs found: %d", len(ieds))
+    logger.debug("Signal Addresses (scd_addresses): %s", scd_addresses)
+    logger.info("Total Signal Addresses: %d", len(scd_addresses))
+    stage_timing.lap("SCD parse")
+
+    # compare the list of ieds from the SCD file with the list of ieds
+    # from the signal addresses and extract only the ones used.
+    # bay_ieds = [ied for ied in ieds if any(
+    #     ied in signal for signal in signal_addresses)]
+
+
+    # The returned values, for debugging
+    logger.debug("Determined DUT: %s", dut)
+    logger.debug("Adjacent Cell Value: %s", adjacent_cell_value)
+
+    signal_list.print_summary()
+    # DUT signals last, the DUT's ASSESS signal second to last
+    sorted_addresses = signal_list.sorted_addresses(dut, adjacent_cell_value)
+    logger.debug("Sorted Signal Addresses: %s", sorted_addresses)
+
+    # Check if all signal addresses (the part before the first '.') are contained in the SCD addresses
+    logger.info("\nChecking if all signal addresses are in SCD addresses...")
+    missing = address_index.validate(sorted_addresses)
+    if not missing:
+        logger.info("All signal addresses are contained in the SCD")
+    else:
+        missing_addresses = list(missing)
+        logger.error("Missing Signal Addresses: %s", missing_addresses)
+        for address, reason in missing.items():
+            logger.error("  %s: %s", address, reason)
+        raise Exception(f"Not all signal addresses are contained in the SCD. Missing addresses: {missing_addresses}")
+
+    # Check the full DO/DA path of every signal against the DataTypeTemplates and report its CDC
+    logger.info("\nResolving signal paths against the DataTypeTemplates...")
+    resolved = DataTypeResolver(scd["templates"], scd["ln_types"]).validate(sorted_addresses)
+    print_resolved(resolved)
+    invalid_paths = {result["signal"]: result["error"] for result in resolved if result["error"]}
+    if invalid_paths:
+        raise Exception(f"Signal paths not defined by the DataTypeTemplates of the SCD: {invalid_paths}")
+    stage_timing.lap("address check")
+
+    group_types = signal_list.group_types()
+    for group, addresses in group_types.items():
+        if not addresses:
+            logger.warning("Warning: %s group is empty.", group)
+
+    if truth_table_df is not None:
+        logger.info("Using the truth table from this run, the Test Steps sheet is not read back.")
+        switch_positions, assessment_row, num_test_steps = test_steps_from_truth_table(truth_table_df)
+    else:
+        switch_positions, assessment_row, num_test_steps = read_test_steps(test_sequence_file, test_steps)
+    stage_timing.lap("test steps")
+
+    if test_type is None:
+        test_type = load_test_type()  # Load test_type from JSON
+    if test_type not in CONTROL_CODES:
+        raise ValueError("Invalid test type. Must be 1 (SPC) or 2 (DPC).")
+
+    logger.debug("Switch Positions (Before):\n%s", switch_positions.head())
+
+    # One categorical mapping of the sheet values to int8 state codes (see state_codes); the codes are
+    # only turned back into true/false/POS_ON/POS_OFF/CAR_* when the JSON is written
+    switch_positions = pd.DataFrame(
+        encode_states(switch_positions.to_numpy(), CONTROL_CODES[test_type], "switch position"),
+        index=group_types["CONTROL"], columns=switch_positions.columns)
+    assessment_row = encode_states(assessment_row, ASSESS_CODES, "assessment")
+    logger.debug("\nState codes:\n%s", switch_positions.head())
+
+    # Call the function to add the initial step
+    assessment_row = add_initial_assessment_step(assessment_row, test_type)
+    logger.debug("Updated assessment_row (with initial step): %s", assessment_row)
+
+    # Modify switch_positions
+    mod_pos = modify_switch_positions(switch_positions, test_type)
+
+    # Reorder the steps so each one changes as few CONTROL signals (switch operations) as possible
+    if step_ordering is None:
+        step_ordering = STEP_ORDERING if truth_table_df is not None else "none"
+    switch_positions, assessment_row, ordering_report = order_test_steps(
+        switch_positions, assessment_row, method=step_ordering)
+    print_ordering_report(ordering_report)
+    stage_timing.lap("step ordering")
+
+    if test_type == 2:
+        logger.info("Test Type 2 (DPC): Applying command logic...")
+        command_row = apply_commands_based_on_assessment(assessment_row, num_test_steps)
+    elif test_type == 1:
+        logger.info("Test Type 1 (SPC): Skipping command logic...")
+        # command_row = ["CAR_NO_OPERATION"] * num_test_steps  # Default inactive commands
+    else:
+        logger.error("No valid test type imported. Exiting or handling default behavior.")
+        raise ValueError("Invalid test type imported.")
+
+    # Breaker transitions of the final step order give the step descriptions
+    circuit_breakers, descriptions = process_circuit_breakers(switch_positions, test_type)
+    # Steps moving a breaker and a disconnector list them in switching order (XSWI before/after the CB)
+    entry_orders = switch_entry_orders(switch_positions) if test_type == 2 else {}
+    if entry_orders:
+        logger.info("Steps moving a circuit breaker and a disconnector: %d, written in switching order",
+                    len(entry_orders))
+
+    # Convert to NumPy array for later use in stacking
+    logger.debug("Resetting index and converting switch_positions to NumPy array...")
+    switch_positions.reset_index(drop=True, inplace=True)
+    logger.debug("Reset switch_positions DataFrame:\n%s", switch_positions.head())
+
+    switch_positions = switch_positions.to_numpy()
+    logger.debug("Converted switch_positions to NumPy array:\n%s", switch_positions)
+
+    # Conditional stacking based on test_type
+    if test_type == 2:
+        logger.info("Test Type 2 (DPC - OPEN/CLOSED): Including switch_positions, assessment_row, and command_row in stacking...")
+        val_assess_cmd = np.vstack([switch_positions, assessment_row, command_row])
+    elif test_type == 1:
+        logger.info("Test Type 1 (SPC - True/False): Including only switch_positions and assessment_row in stacking...")
+        val_assess_cmd = np.vstack([switch_positions, assessment_row])
+    else:
+        logger.error("Invalid test_type. Exiting.")
+        raise ValueError("Invalid test_type imported.")
+
+    logger.debug("Combined val_assess_cmd array:\n%s", val_assess_cmd)
+
+    # Create a dictionary to pair signal addresses with combined data
+    logger.debug("\nCreating a dictionary to pair signal addresses with combined data...")
+
+    # Rows of val_assess_cmd: the CONTROL signals, then the ASSESS and (DPC) COMMAND rows
+    LNs_signal = dict(zip(group_types["CONTROL"] + group_types["ASSESS"] + group_types["COMMAND"], val_assess_cmd))
+
+    # Validation: Log a sample of the dictionary
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\nValidation: Final LNs_signal dictionary (signal address to data mapping):")
+        for key, value in list(LNs_signal.items())[:5]:  # The first 5 items for validation
+            logger.debug("Signal Address: %s, Data: %s", key, value)
+
+    logger.info("\nSuccessfully created LNs_signal dictionary!")
+
+    stage_timing.lap("expected values")
+
+    header = FAT_header(version=1.2, test_name=test_name or os.path.basename(json_output_file),
+                        dut_name=parent, group_types=group_types)
+    layout = signal_layout(group_types, test_type, val_assess_cmd.shape[0])
+
+    # Validate what is about to be written, without re-reading the JSON file (see fat_json_schema)
+    validate_test_case_plan(header, layout, val_assess_cmd, num_test_steps, descriptions)
+    stage_timing.lap("JSON validation")
+
+    # Json export, streamed to disk one test step at a time
+    logger.info("Writing test case JSON...")
+    json_file = write_FAT_json(
+        json_output_file + ".json",
+        header=header,
+        layout=layout,
+        val_assess_cmd=val_assess_cmd,
+        num_test_steps=num_test_steps,
+        test_type=test_type,
+        descriptions=descriptions,
+        entry_orders=entry_orders,
+        compact=compact,
+        use_gzip=use_gzip
+    )
+    logger.info("Test case JSON written to %s", json_file)
+    stage_timing.lap("JSON write")
+    return json_file
+
+def main():
+    import tkinter as tk
+    from FileBrowserApp import FileBrowserApp
+
+    check_and_run_61131()
+    truth_table_df, test_type = Truth_Table_1_9.main()
+
+    root = tk.Tk()
+    app = FileBrowserApp(root)
+    root.mainloop()
+
+    # Access the file paths and input string after the GUI interaction
+    generate_test_case(
+        test_sequence_file=app.excel_file,
+        scd_file=app.xml_file,
+        json_output_file=app.input_str,
+        truth_table_df=truth_table_df,
+        test_type=test_type
+    )
+
+if __name__ == "__main__":
+    main()
+
+# %%
@@ -1,276 +1,466 @@
-import pandas as pd
-from itertools import product
-import tkinter as tk
-from tkinter import filedialog
-from prettytable import from_csv
-from openpyxl import load_workbook
-from excel_utils_v2 import copy_columns_between_excel_files
-import json
-from PIL import Image, ImageTk
-import os, sys
-
-def get_user_input_with_image():
-    root = tk.Tk()
-    root.overrideredirect(True)
-    root.geometry("0x0+0+0")
-    input_dialog = tk.Toplevel(root)
-    input_dialog.title("Enter Number of Inputs")
-
-    label_instruction = tk.Label(
-        input_dialog,
-        text="Select the number of inputs (1 to 10):",
-        font=("Helvetica", 14, "bold")
-    )
-    label_instruction.pack(pady=10)
-
-    input_var = tk.IntVar(value=1)
-    scale_input = tk.Scale(
-        input_dialog,
-        variable=input_var,
-        from_=1,
-        to=10,
-        orient="horizontal",
-        length=400,
-        tickinterval=1
-    )
-    scale_input.pack(pady=10)
-
-    inputs_image_path = get_resource_path(os.path.join("Images", "Inputs.PNG"))
-
-    try:
-        img = Image.open(inputs_image_path)
-        img = img.resize((550, 700))
-        img_tk = ImageTk.PhotoImage(img)
-        label_image = tk.Label(input_dialog, image=img_tk)
-        label_image.image = img_tk
-        label_image.pack(pady=10)
-    except Exception as e:
-        tk.Label(input_dialog, text=f"Error loading image: {e}").pack(pady=10)
-
-    def on_submit():
-        input_dialog.result = str(input_var.get())
-        input_dialog.destroy()
-
-    tk.Button(input_dialog, text="Submit", command=on_submit).pack(pady=10)
-    input_dialog.geometry("600x900")
-    input_dialog.transient(root)
-    input_dialog.grab_set()
-    root.wait_window(input_dialog)
-    root.destroy()
-    return input_dialog.result
-
-def choose_test_type():
-    root = tk.Tk()
-    root.overrideredirect(True)
-    root.geometry("0x0+0+0")
-    type_dialog = tk.Toplevel(root)
-    type_dialog.title("Choose Test Type")
-
-    tk.Label(
-        type_dialog,
-        text="Select the test type:\nChoose one of these options:",
-        font=("Arial", 12)
-    ).pack(pady=10)
-
-    test_type_var = tk.IntVar(value=1)
-    tk.Radiobutton(
-        type_dialog,
-        text="1 -> SPC (True/False)",
-        variable=test_type_var,
-        value=1,
-        font=("Arial", 10)
-    ).pack(pady=5)
-    tk.Radiobutton(
-        type_dialog,
-        text="2 -> DPC (OPEN/CLOSED). For testing switchgear.\n(Intermediate and Bad are not included)",
-        variable=test_type_var,
-        value=2,
-        font=("Arial", 10)
-    ).pack(pady=5)
-
-    def on_submit():
-        type_dialog.result = test_type_var.get()
-        type_dialog.destroy()
-
-    tk.Button(type_dialog, text="Submit", command=on_submit).pack(pady=20)
-    type_dialog.geometry("400x300")
-    type_dialog.transient(root)
-    type_dialog.grab_set()
-    root.wait_window(type_dialog)
-    root.destroy()
-
-    test_type = type_dialog.result
-    if test_type in [1, 2]:
-        print(f"User selected: {test_type} ({'SPC (True/False)' if test_type == 1 else 'DPC (OPEN/CLOSED)'})")
-        return test_type
-    else:
-        print("No valid selection made. Returning None.")
-        return None
-
-def get_user_logic(num_inputs):
-    root = tk.Tk()
-    root.overrideredirect(True)
-    root.geometry("0x0+0+0")
-    logic_dialog = tk.Toplevel(root)
-    logic_dialog.title("Input Logic Expression")
-
-    default_logic = " or ".join([f"Input{i+1}" for i in range(num_inputs)])
-
-    tk.Label(
-        logic_dialog,
-        text=f"Enter a logic expression using these variables:\n\n"
-             f"You can use logic operators 'and', 'or', 'not'\n"
-             f"Example expressions:\n"
-             f"(Input1 and Input2) or (not Input3)\n\n",
-        justify="left",
-        font=("Helvetica", 14, "bold")
-    ).pack(pady=10)
-
-    input_var = tk.StringVar(value=default_logic)
-    entry_input = tk.Entry(logic_dialog, textvariable=input_var, width=100)
-    entry_input.pack(pady=10)
-
-    logic_image_path = get_resource_path(os.path.join("Images", "Logic.PNG"))
-    try:
-        img = Image.open(logic_image_path)
-        img = img.resize((600, 250))
-        img_tk = ImageTk.PhotoImage(img)
-        label_image = tk.Label(logic_dialog, image=img_tk)
-        label_image.image = img_tk
-        label_image.pack(pady=10)
-    except Exception as e:
-        tk.Label(logic_dialog, text=f"Error loading image: {e}").pack(pady=10)
-
-    def on_submit():
-        logic_dialog.result = input_var.get()
-        logic_dialog.destroy()
-
-    tk.Button(logic_dialog, text="Submit", command=on_submit).pack(pady=10)
-    logic_dialog.geometry("1100x580")
-    logic_dialog.transient(root)
-    logic_dialog.grab_set()
-    root.wait_window(logic_dialog)
-    root.destroy()
-
-    return logic_dialog.result or default_logic
-
-def make_output_function(user_logic):
-    def Output1(*inputs):
-        local_scope = {f"Input{i+1}": inputs[i] for i in range(len(inputs))}
-        return eval(user_logic, {}, local_scope)
-    return Output1
-
-def truth_table(f, num_inputs):
-    variable_names = [f"Input{i+1}" for i in range(num_inputs)]
-    values = [list(x) + [f(*x)] for x in product([False, True], repeat=num_inputs)]
-    return pd.DataFrame(values, columns=variable_names + [f.__name__])
-
-def select_xlsx_file():
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(
-        title="Select an Excel file",
-        filetypes=[("Excel files", "*.xlsx")],
-        defaultextension=".xlsx"
-    )
-    root.destroy()
-    return file_path
-
-def get_resource_path(relative_path):
-    """Get absolute path to resource (works in dev and PyInstaller)"""
-    if getattr(sys, 'frozen', False):  # Running as PyInstaller bundle
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(base_path, relative_path)
-
-def main():
-    print("Truth table logic running")
-
-    user_input = get_user_input_with_image()
-    if not user_input or not user_input.isdigit() or int(user_input) <= 0:
-        print("Invalid input. Please enter a valid number.")
-        exit()
-    num_inputs = int(user_input)
-    print(f"User entered: {num_inputs}")
-
-    test_type = choose_test_type()
-    if test_type not in [1, 2]:
-        print("No valid test type selected.")
-        exit()
-
-    with open("test_type.json", "w") as f:
-        json.dump({"test_type": test_type}, f)
-    print(f"test_type saved to test_type.json: {test_type}")
-
-    user_logic = get_user_logic(num_inputs)
-    Output1 = make_output_function(user_logic)
-
-    truth_table_df = truth_table(Output1, num_inputs)
-    truth_table_df.to_csv('out.csv', index=False)
-
-    if test_type == 1:
-        for i in range(1, num_inputs + 1):
-            col = f"Input{i}"
-            truth_table_df[col] = truth_table_df[col].astype(str).replace(
-                {"False": "false", "FALSE": "false", "True": "true", "TRUE": "true"}
-            )
-    elif test_type == 2:
-        for i in range(1, num_inputs + 1):
-            col = f"Input{i}"
-            truth_table_df[col] = truth_table_df[col].astype(str).replace(
-                {"False": "CLOSED", "FALSE": "CLOSED", "True": "OPEN", "TRUE": "OPEN"}
-            )
-
-    truth_table_df.to_csv("out_updated.csv", index=False)
-    print("Updated CSV saved as out_updated.csv")
-
-    with open("out_updated.csv") as fp:
-        mytable = from_csv(fp)
-    print(mytable)
-
-    df_transposed = truth_table_df.transpose()
-    df_transposed.to_excel("output_file_transposed.xlsx", index=False, header=False)
-    print("Data successfully saved to output_file_transposed.xlsx")
-    print(df_transposed)
-
-    destination_file = select_xlsx_file()
-    if destination_file:
-        source_file = "output_file_transposed.xlsx"
-        column_range = "A:FAN"
-
-        print("Clearing data from row 3 downwards in the destination file...")
-        workbook = load_workbook(destination_file)
-        sheet = workbook["Test Steps"]
-        for row in sheet.iter_rows(min_row=3, max_row=sheet.max_row, min_col=1, max_col=sheet.max_column):
-            for cell in row:
-                cell.value = None
-        workbook.save(destination_file)
-        print("Data cleared from row 3 downwards.")
-
-        copy_columns_between_excel_files(
-            source_file=source_file,
-            destination_file=destination_file,
-            source_sheet_name="Sheet1",
-            destination_sheet_name="Test Steps",
-            column_range=column_range,
-            start_row=1,
-            end_row=len(truth_table_df) + 1,
-            start_cell_in_destination="C3"
-        )
-        print("Completed copying the specified columns starting from C3!")
-
-        from openpyxl.utils import get_column_letter
-        with pd.ExcelWriter(destination_file, engine="openpyxl", mode="a") as writer:
-            workbook = writer.book
-            sheet = workbook["Test Steps"]
-            last_row = max(
-                row[0].row for row in sheet.iter_rows(min_col=3, max_col=3, min_row=1, max_row=sheet.max_row)
-                if row[0].value is not None
-            )
-            print(f"Inserting 'ASSESS' into Column B at row {last_row}")
-            sheet[f"B{last_row}"] = "ASSESS"
-            workbook.save(destination_file)
-
-if __name__ == "__main__":
-    main()
+import numpy as np
+import pandas as pd
+from itertools import chain, product
+from generator_log import logger
+from logic_expr import compile_ir, compile_logic, parse_logic
+from logic_bdd import build_bdd, step_vectors
+from mcdc import mcdc_vectors, print_mcdc_report
+import json
+import logging
+import os, sys
+
+# Largest number of inputs offered in the GUI. The vectorized engine keeps a
+# 2^n x n uint8 matrix, so 24 inputs is ~400 MB of input bits.
+MAX_INPUTS = 24
+# 'full' enumerates every input combination. Above COLUMN_LAYOUT_MAX_STEPS steps (14 inputs) the
+# Test Steps sheet takes one row per step, up to Excel's 1,048,576 rows (20 inputs).
+# 'mcdc' and 'bdd' are reduced step sets for logic with many inputs.
+GENERATION_MODES = {1: "full", 2: "mcdc", 3: "bdd"}
+# Most steps taken from the BDD paths in 'bdd' mode
+BDD_MAX_STEPS = 4096
+# A full table with more inputs than this is logged as a warning: 2^n steps, each a JSON test step
+FULL_TABLE_WARNING_INPUTS = 16
+
+def get_user_input_with_image():
+    import tkinter as tk
+    from PIL import Image, ImageTk
+
+    root = tk.Tk()
+    root.overrideredirect(True)
+    root.geometry("0x0+0+0")
+    input_dialog = tk.Toplevel(root)
+    input_dialog.title("Enter Number of Inputs")
+
+    label_instruction = tk.Label(
+        input_dialog,
+        text=f"Select the number of inputs (1 to {MAX_INPUTS}):",
+        font=("Helvetica", 14, "bold")
+    )
+    label_instruction.pack(pady=10)
+
+    input_var = tk.IntVar(value=1)
+    scale_input = tk.Scale(
+        input_dialog,
+        variable=input_var,
+        from_=1,
+        to=MAX_INPUTS,
+        orient="horizontal",
+        length=550,
+        tickinterval=1
+    )
+    scale_input.pack(pady=10)
+
+    inputs_image_path = get_resource_path(os.path.join("Images", "Inputs.PNG"))
+
+    try:
+        img = Image.open(inputs_image_path)
+        img = img.resize((550, 700))
+        img_tk = ImageTk.PhotoImage(img)
+        label_image = tk.Label(input_dialog, image=img_tk)
+        label_image.image = img_tk
+        label_image.pack(pady=10)
+    except Exception as e:
+        tk.Label(input_dialog, text=f"Error loading image: {e}").pack(pady=10)
+
+    def on_submit():
+        input_dialog.result = str(input_var.get())
+        input_dialog.destroy()
+
+    tk.Button(input_dialog, text="Submit", command=on_submit).pack(pady=10)
+    input_dialog.geometry("600x900")
+    input_dialog.transient(root)
+    input_dialog.grab_set()
+    root.wait_window(input_dialog)
+    root.destroy()
+    return input_dialog.result
+
+def choose_test_type():
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.overrideredirect(True)
+    root.geometry("0x0+0+0")
+    type_dialog = tk.Toplevel(root)
+    type_dialog.title("Choose Test Type")
+
+    tk.Label(
+        type_dialog,
+        text="Select the test type:\nChoose one of these options:",
+        font=("Arial", 12)
+    ).pack(pady=10)
+
+    test_type_var = tk.IntVar(value=1)
+    tk.Radiobutton(
+        type_dialog,
+        text="1 -> SPC (True/False)",
+        variable=test_type_var,
+        value=1,
+        font=("Arial", 10)
+    ).pack(pady=5)
+    tk.Radiobutton(
+        type_dialog,
+        text="2 -> DPC (OPEN/CLOSED). For testing switchgear.\n(Intermediate and Bad are not included)",
+        variable=test_type_var,
+        value=2,
+        font=("Arial", 10)
+    ).pack(pady=5)
+
+    def on_submit():
+        type_dialog.result = test_type_var.get()
+        type_dialog.destroy()
+
+    tk.Button(type_dialog, text="Submit", command=on_submit).pack(pady=20)
+    type_dialog.geometry("400x300")
+    type_dialog.transient(root)
+    type_dialog.grab_set()
+    root.wait_window(type_dialog)
+    root.destroy()
+
+    test_type = type_dialog.result
+    if test_type in [1, 2]:
+        logger.info("User selected: %s (%s)", test_type, 'SPC (True/False)' if test_type == 1 else 'DPC (OPEN/CLOSED)')
+        return test_type
+    else:
+        logger.warning("No valid selection made. Returning None.")
+        return None
+
+def choose_generation_mode():
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.overrideredirect(True)
+    root.geometry("0x0+0+0")
+    mode_dialog = tk.Toplevel(root)
+    mode_dialog.title("Choose Test Step Generation")
+
+    tk.Label(
+        mode_dialog,
+        text="Select how the test steps are generated:",
+        font=("Arial", 12)
+    ).pack(pady=10)
+
+    mode_var = tk.IntVar(value=1)
+    tk.Radiobutton(
+        mode_dialog,
+        text="1 -> Full truth table (every input combination)",
+        variable=mode_var,
+        value=1,
+        font=("Arial", 10)
+    ).pack(pady=5)
+    tk.Radiobutton(
+        mode_dialog,
+        text="2 -> MC/DC minimal set (independent effect of every input)",
+        variable=mode_var,
+        value=2,
+        font=("Arial", 10)
+    ).pack(pady=5)
+    tk.Radiobutton(
+        mode_dialog,
+        text=f"3 -> BDD paths (one step per decision diagram path, at most {BDD_MAX_STEPS})",
+        variable=mode_var,
+        value=3,
+        font=("Arial", 10)
+    ).pack(pady=5)
+
+    def on_submit():
+        mode_dialog.result = mode_var.get()
+        mode_dialog.destroy()
+
+    tk.Button(mode_dialog, text="Submit", command=on_submit).pack(pady=20)
+    mode_dialog.geometry("450x290")
+    mode_dialog.transient(root)
+    mode_dialog.grab_set()
+    root.wait_window(mode_dialog)
+    root.destroy()
+
+    generation_mode = GENERATION_MODES.get(getattr(mode_dialog, "result", 1), "full")
+    logger.info("User selected generation mode: %s", generation_mode)
+    return generation_mode
+
+def get_user_logic(num_inputs):
+    import tkinter as tk
+    from PIL import Image, ImageTk
+
+    root = tk.Tk()
+    root.overrideredirect(True)
+    root.geometry("0x0+0+0")
+    logic_dialog = tk.Toplevel(root)
+    logic_dialog.title("Input Logic Expression")
+
+    default_logic = " or ".join([f"Input{i+1}" for i in range(num_inputs)])
+
+    tk.Label(
+        logic_dialog,
+        text=f"Enter a logic expression using these variables:\n\n"
+             f"You can use logic operators 'and', 'or', 'not', '^'\n"
+             f"or IEC 61131-3 'AND', 'OR', 'XOR', 'NOT'\n"
+             f"Example expressions:\n"
+             f"(Input1 and Input2) or (not Input3)\n\n",
+        justify="left",
+        font=("Helvetica", 14, "bold")
+    ).pack(pady=10)
+
+    input_var = tk.StringVar(value=default_logic)
+    entry_input = tk.Entry(logic_dialog, textvariable=input_var, width=100)
+    entry_input.pack(pady=10)
+
+    logic_image_path = get_resource_path(os.path.join("Images", "Logic.PNG"))
+    try:
+        img = Image.open(logic_image_path)
+        img = img.resize((600, 250))
+        img_tk = ImageTk.PhotoImage(img)
+        label_image = tk.Label(logic_dialog, image=img_tk)
+        label_image.image = img_tk
+        label_image.pack(pady=10)
+    except Exception as e:
+        tk.Label(logic_dialog, text=f"Error loading image: {e}").pack(pady=10)
+
+    def on_submit():
+        logic_dialog.result = input_var.get()
+        logic_dialog.destroy()
+
+    tk.Button(logic_dialog, text="Submit", command=on_submit).pack(pady=10)
+    logic_dialog.geometry("1100x580")
+    logic_dialog.transient(root)
+    logic_dialog.grab_set()
+    root.wait_window(logic_dialog)
+    root.destroy()
+
+    return logic_dialog.result or default_logic
+
+def input_names(num_inputs):
+    return tuple(f"Input{i+1}" for i in range(num_inputs))
+
+def make_output_function(user_logic):
+    parse_logic(user_logic)  # Reject unsupported syntax before the first row is evaluated
+    def Output1(*inputs):
+        return compile_logic(user_logic, input_names(len(inputs)))(*inputs)
+    return Output1
+
+def truth_table(f, num_inputs):
+    variable_names = [f"Input{i+1}" for i in range(num_inputs)]
+    values = [list(x) + [f(*x)] for x in product([False, True], repeat=num_inputs)]
+    return pd.DataFrame(values, columns=variable_names + [f.__name__])
+
+def input_matrix(num_inputs):
+    """
+    Builds all 2^n input combinations as a uint8 matrix, one row per combination,
+    in the same order as itertools.product([False, True], repeat=num_inputs).
+    """
+    rows = np.arange(1 << num_inputs, dtype=np.uint32)
+    matrix = np.empty((len(rows), num_inputs), dtype=np.uint8, order="F")
+    for i in range(num_inputs):
+        matrix[:, i] = (rows >> (num_inputs - 1 - i)) & 1
+    return matrix
+
+def evaluate_logic(user_logic, inputs):
+    """
+    Evaluates the logic (text or logic_expr IR) for every row of the input matrix in one batched bitwise pass.
+
+    Returns:
+        np.ndarray: uint8 array with one output bit per row.
+    """
+    names = input_names(inputs.shape[1])
+    if isinstance(user_logic, str):
+        vectorized_logic = compile_logic(user_logic, names, vectorized=True)
+    else:
+        vectorized_logic = compile_ir(user_logic, names, vectorized=True)
+    result = vectorized_logic(*(inputs[:, i] for i in range(inputs.shape[1])))
+    return np.broadcast_to(np.asarray(result, dtype=np.uint8) & 1, (inputs.shape[0],))
+
+def vectorized_truth_table(user_logic, num_inputs, output_name="Output1"):
+    """Same table as truth_table(make_output_function(user_logic), num_inputs), built with NumPy."""
+    inputs = input_matrix(num_inputs)
+    outputs = evaluate_logic(user_logic, inputs)
+    columns = {f"Input{i+1}": inputs[:, i].astype(bool) for i in range(num_inputs)}
+    columns[output_name] = outputs.astype(bool)
+    return pd.DataFrame(columns)
+
+def bdd_truth_table(user_logic, num_inputs, max_steps=None, output_name="Output1"):
+    """
+    Builds a reduced truth table from the BDD of the logic: one row per BDD path of the logic
+    and of its negation, in truth table row order. Stays tractable for 20-40 inputs.
+    """
+    names = list(input_names(num_inputs))
+    bdd, root = build_bdd(user_logic, names)
+    logger.info("BDD: %d nodes, %d of %d input combinations are true", bdd.size(root), bdd.sat_count(root), 1 << num_inputs)
+    rows = sorted(list(inputs) + [output] for inputs, output in step_vectors(bdd, root, names, max_steps))
+    return pd.DataFrame(rows, columns=names + [output_name])
+
+def mcdc_truth_table(user_logic, num_inputs, output_name="Output1"):
+    """Builds a reduced truth table holding only the MC/DC vectors selected by mcdc.mcdc_vectors."""
+    names = list(input_names(num_inputs))
+    vectors, report = mcdc_vectors(user_logic, names)
+    print_mcdc_report(report)
+    rows = [list(inputs) + [output] for inputs, output in vectors]
+    return pd.DataFrame(rows, columns=names + [output_name])
+
+def build_truth_table(user_logic, num_inputs, generation_mode="full"):
+    """
+    Builds the truth table for the selected generation mode: every input combination ('full'),
+    the MC/DC minimal set ('mcdc') or one step per BDD path, at most BDD_MAX_STEPS ('bdd').
+    user_logic is logic text or its logic_expr IR, such as the shared IR of an FBD network.
+
+    Raises:
+        ValueError: If the generation mode is unknown.
+    """
+    if generation_mode == "mcdc":
+        return mcdc_truth_table(user_logic, num_inputs)
+    if generation_mode == "bdd":
+        return bdd_truth_table(user_logic, num_inputs, max_steps=BDD_MAX_STEPS)
+    if generation_mode != "full":
+        raise ValueError(f"Unknown generation mode {generation_mode!r}, "
+                         f"expected one of {', '.join(GENERATION_MODES.values())}.")
+    if num_inputs > FULL_TABLE_WARNING_INPUTS:
+        logger.warning("Warning: %d inputs, the full truth table has %d test steps. "
+                       "Choose 'mcdc' or 'bdd' for a reduced set.", num_inputs, 1 << num_inputs)
+    return vectorized_truth_table(user_logic, num_inputs)
+
+def to_test_values(truth_table_df, test_type):
+    """
+    Returns a new table with the input booleans replaced by test values: true/false for SPC (1),
+    CLOSED/OPEN for DPC (2). The boolean table passed in is left unchanged.
+    """
+    if test_type == 1:
+        values = {"False": "false", "FALSE": "false", "True": "true", "TRUE": "true"}
+    elif test_type == 2:
+        values = {"False": "CLOSED", "FALSE": "CLOSED", "True": "OPEN", "TRUE": "OPEN"}
+    else:
+        return truth_table_df.copy()
+    input_columns = [col for col in truth_table_df.columns if col.startswith("Input")]
+    return truth_table_df.assign(**{col: truth_table_df[col].astype(str).replace(values) for col in input_columns})
+
+# Steps start in column C of the column-per-step layout, so at most 16384 - 2 fit in one sheet
+COLUMN_LAYOUT_MAX_STEPS = 16382
+TEST_STEPS_LAYOUTS = ("auto", "columns", "rows")
+
+
+def write_test_steps_sheet(truth_table_df, destination_file, layout="auto"):
+    """
+    Writes the truth table into the 'Test Steps' sheet of the workbook.
+
+    Parameters:
+        truth_table_df (pd.DataFrame): Input1..InputN columns with the test values and the output column last.
+        destination_file (str): Path to the Excel file.
+        layout (str): 'columns' writes one column per step from C3 and 'ASSESS' in column B of the
+            output row, in one load and save of the workbook; rows 1 and 2 are kept. 'rows' writes
+            one row per step under a 'Step', Input1..InputN, 'ASSESS' header, streamed into the sheet,
+            for more steps than fit in Excel's columns. 'auto' takes 'columns' up to
+            COLUMN_LAYOUT_MAX_STEPS steps and 'rows' beyond.
+    """
+    from excel_utils_v2 import stream_rows_to_sheet, write_rows_to_sheet
+
+    if layout not in TEST_STEPS_LAYOUTS:
+        raise ValueError(f"Unknown Test Steps layout {layout!r}, expected one of {', '.join(TEST_STEPS_LAYOUTS)}.")
+    num_steps = truth_table_df.shape[0]
+    if layout == "auto":
+        layout = "columns" if num_steps <= COLUMN_LAYOUT_MAX_STEPS else "rows"
+
+    if layout == "rows":
+        logger.info("Writing %d test steps to %s, one row per step", num_steps, destination_file)
+        header = ["Step", *truth_table_df.columns[:-1], "ASSESS"]
+        steps = ([step, *values] for step, values in enumerate(truth_table_df.itertuples(index=False, name=None), start=1))
+        stream_rows_to_sheet(destination_file, "Test Steps", chain([header], steps), total=num_steps + 1)
+        return
+
+    rows = truth_table_df.transpose().values.tolist()
+    assess_row = 3 + len(rows) - 1
+    logger.info("Writing %d test steps to %s, 'ASSESS' in column B at row %d", num_steps, destination_file, assess_row)
+    # A sheet left in the row layout ('Step' in A1) is cleared completely
+    write_rows_to_sheet(
+        destination_file=destination_file,
+        sheet_name="Test Steps",
+        rows=rows,
+        start_cell="C3",
+        clear_from_row=3,
+        cell_values={f"B{assess_row}": "ASSESS"},
+        clear_sheet_if={"A1": "Step"}
+    )
+
+def select_xlsx_file():
+    import tkinter as tk
+    from tkinter import filedialog
+
+    root = tk.Tk()
+    root.withdraw()
+    file_path = filedialog.askopenfilename(
+        title="Select an Excel file",
+        filetypes=[("Excel files", "*.xlsx")],
+        defaultextension=".xlsx"
+    )
+    root.destroy()
+    return file_path
+
+def get_resource_path(relative_path):
+    """Get absolute path to resource (works in dev and PyInstaller)"""
+    if getattr(sys, 'frozen', False):  # Running as PyInstaller bundle
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, relative_path)
+
+def main(write_files=False):
+    """
+    Asks for the inputs, test type and logic and builds the truth table.
+
+    Parameters:
+        write_files (bool): Also write the out.csv, out_updated.csv and test_type.json hand-off files
+            used when the generator reads the test steps back from the workbook.
+
+    Returns:
+        tuple: The truth table (inputs as test values, output last) and the test type.
+    """
+    from prettytable import PrettyTable
+
+    logger.info("Truth table logic running")
+
+    user_input = get_user_input_with_image()
+    if not user_input or not user_input.isdigit() or int(user_input) <= 0:
+        logger.error("Invalid input. Please enter a valid number.")
+        exit()
+    num_inputs = int(user_input)
+    logger.info("User entered: %d", num_inputs)
+
+    test_type = choose_test_type()
+    if test_type not in [1, 2]:
+        logger.error("No valid test type selected.")
+        exit()
+
+    if write_files:
+        with open("test_type.json", "w") as f:
+            json.dump({"test_type": test_type}, f)
+        logger.info("test_type saved to test_type.json: %s", test_type)
+
+    user_logic = get_user_logic(num_inputs)
+    try:
+        compile_logic(user_logic, input_names(num_inputs))
+    except ValueError as e:
+        logger.error("Invalid logic expression: %s", e)
+        exit()
+
+    generation_mode = choose_generation_mode()
+    truth_table_df = build_truth_table(user_logic, num_inputs, generation_mode)
+    if write_files:
+        truth_table_df.to_csv('out.csv', index=False)
+
+    truth_table_df = to_test_values(truth_table_df, test_type)
+
+    if write_files:
+        truth_table_df.to_csv("out_updated.csv", index=False)
+        logger.info("Updated CSV saved as out_updated.csv")
+
+    # One line per step: only built at DEBUG, it dominates the runtime of large tables
+    if logger.isEnabledFor(logging.DEBUG):
+        mytable = PrettyTable(field_names=list(truth_table_df.columns))
+        mytable.add_rows(truth_table_df.values.tolist())
+        logger.debug("%s", mytable)
+        logger.debug("%s", truth_table_df.transpose())
+
+    destination_file = select_xlsx_file()
+    if destination_file:
+        write_test_steps_sheet(truth_table_df, destination_file)
+
+    return truth_table_df, test_type
+
+if __name__ == "__main__":
+    main(write_files=True)
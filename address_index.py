@@ -0,0 +1,69 @@
+class AddressIndex:
+    """
+    Index over the LNode signal addresses ('IED+LD/prefix+lnClass+inst') of an SCD for validating a
+    whole signal list in one pass.
+
+    Membership is a hash set lookup. A prefix trie over IED -> LD -> LN splits an address into its parts.
+    The IED level is a character trie because the IED name and the LD instance are written without a
+    separator. The trie resolves the IED of a name by longest prefix and explains why an address is missing.
+    """
+
+    _IED = object()  # Key of the IED name stored at the trie node where it ends
+
+    def __init__(self, addresses, ieds):
+        self.addresses = set(addresses)
+        self._trie = {}
+        self._lds = {}
+        for ied in ieds:
+            node = self._trie
+            for char in ied:
+                node = node.setdefault(char, {})
+            node[self._IED] = ied
+            self._lds.setdefault(ied, {})
+        for address in self.addresses:
+            ied = self.longest_ied_prefix(address)
+            if ied is not None:
+                ld, _, ln = address[len(ied):].partition("/")
+                self._lds[ied].setdefault(ld, set()).add(ln)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self.addresses
+
+    def longest_ied_prefix(self, name: str):
+        """Returns the longest IED name that `name` starts with, or None."""
+        node = self._trie
+        found = None
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                break
+            found = node.get(self._IED, found)
+        return found
+
+    def parent_ied(self, dut: str):
+        """IED of the device under test, e.g. 'AA1D1Q01Q1QB1' -> 'AA1D1Q01Q1'."""
+        return self.longest_ied_prefix(dut)
+
+    def explain(self, address: str) -> str:
+        """Says which level of IED/LD/LN of a missing address is not in the SCD."""
+        ied = self.longest_ied_prefix(address)
+        if ied is None:
+            return "no IED of the SCD matches"
+        ld, _, ln = address[len(ied):].partition("/")
+        if ld not in self._lds[ied]:
+            return f"IED {ied} has no LNode in logical device '{ld}'"
+        return f"logical device {ied}{ld} has no LNode '{ln}'"
+
+    def validate(self, signal_addresses) -> dict:
+        """
+        Checks every signal address (the part before the first '.') in one pass.
+
+        Returns:
+            dict: The missing addresses in signal list order, each with the reason from explain().
+        """
+        missing = {}
+        for signal in signal_addresses:
+            address = signal.split(".")[0]
+            if address not in self.addresses and address not in missing:
+                missing[address] = self.explain(address)
+        return missing
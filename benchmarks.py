@@ -0,0 +1,885 @@
+"""
+Benchmarks for the test case generation stages.
+
+Usage:
+    python benchmarks.py truth_table [--max-inputs 20] [--legacy-max-inputs 14]
+    python benchmarks.py startup [--repeat 3] [--top 10]
+    python benchmarks.py address_check [--signals 10000] [--lnodes 50000]
+    python benchmarks.py workbook_read [--steps 16382]
+    python benchmarks.py state_codes [--inputs 14]
+    python benchmarks.py validation [--steps 100000] [--legacy-steps 5000]
+    python benchmarks.py plcopen_parse [--pous 20] [--blocks 2000]
+    python benchmarks.py stages [--ieds 50] [--lnodes-per-ied 60] [--templates 0] [--inputs 12]
+                                [--baseline-out baseline.json] [--compare baseline.json] [--tolerance 0.25]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+import stage_timing
+import Truth_Table_1_9
+from address_index import AddressIndex
+from fat_json_schema import (check_document, schema_validator, test_case_schema, validate_document,
+                             validate_test_case_plan)
+from fat_json_writer import FAT_header, signal_layout, write_FAT_json
+from generator_log import logger
+from iec61131_3_v1_00 import extract_61850_address, index_plcopen
+from scd_index import index_scd
+from scd_types import DataTypeResolver
+from state_codes import (ASSESS_CODES, ASSESS_FALSE, ASSESS_TRUE, CAR_BLOCKED_BY_INTERLOCKING, CAR_NO_OPERATION,
+                         CAR_POSITION_CHANGED, CONTROL_CODES, INITIAL_CODES, encode_states)
+from workbook_reader import SIGNAL_ADDRESSES_SHEET, excel_engine, read_workbook
+
+
+def sample_logic(num_inputs: int) -> str:
+    """Builds an interlock-style expression over Input1..InputN mixing 'and', 'or' and 'not'."""
+    terms = []
+    for i in range(1, num_inputs + 1, 2):
+        if i + 1 <= num_inputs:
+            terms.append(f"(Input{i} and not Input{i + 1})")
+        else:
+            terms.append(f"Input{i}")
+    return " or ".join(terms)
+
+
+def _time_call(func, *args, repeat: int = 3) -> float:
+    """Returns the best wall-clock time of `repeat` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_truth_table(max_inputs: int = 20, legacy_max_inputs: int = 14) -> list:
+    """
+    Compares rows/second of the per-row eval truth table against the vectorized NumPy engine.
+
+    Returns:
+        list: One dict per input count with the timings and rows/second of both engines.
+    """
+    results = []
+    print(f"{'inputs':>6} {'rows':>10} {'legacy rows/s':>15} {'vectorized rows/s':>18} {'speed-up':>9}")
+    for num_inputs in range(2, max_inputs + 1, 2):
+        logic = sample_logic(num_inputs)
+        rows = 1 << num_inputs
+        result = {"inputs": num_inputs, "rows": rows}
+
+        vectorized = _time_call(Truth_Table_1_9.vectorized_truth_table, logic, num_inputs)
+        result["vectorized_s"] = vectorized
+        result["vectorized_rows_per_s"] = rows / vectorized
+
+        legacy_text, speed_up_text = "-", "-"
+        if num_inputs <= legacy_max_inputs:
+            output_function = Truth_Table_1_9.make_output_function(logic)
+            legacy = _time_call(Truth_Table_1_9.truth_table, output_function, num_inputs, repeat=1)
+            result["legacy_s"] = legacy
+            result["legacy_rows_per_s"] = rows / legacy
+            legacy_text = f"{rows / legacy:,.0f}"
+            speed_up_text = f"{legacy / vectorized:.1f}x"
+
+        print(f"{num_inputs:>6} {rows:>10} {legacy_text:>15} {rows / vectorized:>18,.0f} {speed_up_text:>9}")
+        results.append(result)
+    return results
+
+
+# Entry points timed by the startup benchmark, as code run in a fresh interpreter.
+STARTUP_TARGETS = {
+    "generator": "import importlib.util; spec = importlib.util.spec_from_file_location('Generate_Test_Case', "
+                 "'Generate_Test_Case_Ver_8.03.py'); spec.loader.exec_module(importlib.util.module_from_spec(spec))",
+    "cli": "import generate_cli",
+    "truth_table": "import Truth_Table_1_9",
+    "iec61131": "import iec61131_3_v1_00",
+}
+HEAVY_MODULES = ("tkinter", "matplotlib", "reportlab", "PIL", "jsonschema", "openpyxl", "pandas", "numpy")
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parses the '-X importtime' report into (module, self_us, cumulative_us, depth) tuples.
+    Depth 0 entries are the imports done directly by the timed code.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def bench_startup(repeat: int = 3, top: int = 10) -> list:
+    """
+    Times the cold start of every STARTUP_TARGETS entry in a fresh interpreter with '-X importtime',
+    which is what a PyInstaller build pays on every launch.
+
+    Returns:
+        list: One dict per target with the best wall-clock and import time and the heavy modules loaded.
+    """
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    print(f"{'target':<12} {'wall ms':>9} {'imports ms':>11}  heavy modules loaded")
+    for target, code in STARTUP_TARGETS.items():
+        probe = f"; import sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run = subprocess.run([sys.executable, "-X", "importtime", "-c", code + probe], cwd=repo_dir,
+                                 capture_output=True, text=True)
+            wall = time.perf_counter() - start
+            if run.returncode != 0:
+                raise RuntimeError(f"Startup of {target} failed:\n{run.stderr[-2000:]}")
+            if best is None or wall < best[0]:
+                best = (wall, run)
+        wall, run = best
+        entries = parse_importtime(run.stderr)
+        top_level = sorted((entry for entry in entries if entry[3] == 0), key=lambda entry: -entry[2])
+        heavy = [module for module in run.stdout.strip().split(",") if module]
+        result = {
+            "target": target,
+            "wall_s": wall,
+            "import_s": sum(entry[2] for entry in top_level) / 1e6,
+            "heavy_modules": heavy,
+            "top_imports": [(entry[0], entry[2] / 1e6) for entry in top_level[:top]],
+        }
+        print(f"{target:<12} {wall * 1000:>9.1f} {result['import_s'] * 1000:>11.1f}  {', '.join(heavy) or '-'}")
+        results.append(result)
+
+    for result in results:
+        print(f"\nSlowest imports of {result['target']}:")
+        for module, seconds in result["top_imports"]:
+            print(f"  {module:<40} {seconds * 1000:>9.1f} ms")
+    return results
+
+
+def synthetic_addresses(num_lnodes: int, lnodes_per_ied: int = 50) -> tuple:
+    """IED names sharing long prefixes (as in a real substation naming scheme) and their LNode addresses."""
+    ln_classes = ["CSWI", "CILO", "XCBR", "XSWI", "PTRC", "MMXU", "GGIO"]
+    ieds, addresses = [], []
+    for i in range((num_lnodes + lnodes_per_ied - 1) // lnodes_per_ied):
+        ied = f"AA1D{i // 100 + 1}Q{i % 100:02d}A1"
+        ieds.append(ied)
+        for j in range(min(lnodes_per_ied, num_lnodes - len(addresses))):
+            addresses.append(f"{ied}Q{j % 5}/{ln_classes[j % len(ln_classes)]}{j // 5 + 1}")
+    return ieds, addresses
+
+
+def bench_address_check(num_signals: int = 10000, num_lnodes: int = 50000, missing_ratio: float = 0.01) -> dict:
+    """
+    Compares the list scan of the signal address check (all(...) plus the missing list) against
+    AddressIndex, including the time to build the index.
+
+    Returns:
+        dict: Timings of both checks and the number of missing addresses found.
+    """
+    rng = random.Random(0)
+    ieds, scd_addresses = synthetic_addresses(num_lnodes)
+    signals = [f"{rng.choice(scd_addresses)}.Pos.stVal" for _ in range(num_signals)]
+    for i in rng.sample(range(num_signals), int(num_signals * missing_ratio)):
+        signals[i] = signals[i].replace("/", "X/", 1)
+    dut = rng.choice(scd_addresses).split("/")[0]
+
+    start = time.perf_counter()
+    signal_addresses_check = [address.split(".")[0] for address in signals]
+    all(address in scd_addresses for address in signal_addresses_check)
+    legacy_missing = [address for address in signal_addresses_check if address not in scd_addresses]
+    legacy_parent = next((ied for ied in ieds if ied in dut), None)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = AddressIndex(scd_addresses, ieds)
+    built = time.perf_counter() - start
+    missing = index.validate(signals)
+    parent = index.parent_ied(dut)
+    indexed = time.perf_counter() - start
+
+    assert set(missing) == set(legacy_missing)
+    result = {"signals": num_signals, "lnodes": num_lnodes, "missing": len(missing), "legacy_s": legacy,
+              "index_build_s": built, "indexed_s": indexed, "parent": parent, "legacy_parent": legacy_parent}
+    print(f"{num_signals} signals x {num_lnodes} LNodes, {len(missing)} missing")
+    print(f"  list scan      {legacy * 1000:10.1f} ms   parent {legacy_parent}")
+    print(f"  AddressIndex   {indexed * 1000:10.1f} ms   parent {parent} (index build {built * 1000:.1f} ms)")
+    print(f"  speed-up       {legacy / indexed:10.1f}x")
+    return result
+
+
+def synthetic_workbook(file_path: str, num_steps: int, num_signals: int = 6):
+    """
+    Writes a workbook like Example_test1.6.xlsx: a Signal Addresses sheet and a Test Steps sheet with
+    one column per step (step numbers, CONTROL positions, ASSESS and COMMAND rows).
+    """
+    from openpyxl import Workbook
+
+    rng = random.Random(0)
+    workbook = Workbook(write_only=True)
+    signals = workbook.create_sheet("Signal Addresses")
+    signals.append(["IED name", "Signal Addresse"])
+    signals.append(["AA1D1Q01Q1", "AA1D1Q01Q1QB1/CILO1.EnaCls", "ASSESS", "Output1"])
+    for i in range(1, num_signals + 1):
+        signals.append(["AA1D1Q01Q1", f"AA1D1Q01Q1QA{i}/CSWI1.Pos", "CONTROL", f"Input{i}"])
+    signals.append(["AA1D1Q01Q1", "AA1D1Q01Q1QB1/CSWI1.Pos", "COMMAND"])
+    steps = workbook.create_sheet("Test Steps")
+    steps.append([None, None] + list(range(1, num_steps + 1)))
+    steps.append([None, None] + [None] * num_steps)
+    for i in range(1, num_signals + 1):
+        steps.append([None, f"Input{i}"] + [rng.choice(("OPEN", "CLOSED")) for _ in range(num_steps)])
+    steps.append([None, "ASSESS"] + [rng.choice((True, False)) for _ in range(num_steps)])
+    workbook.save(file_path)
+
+
+def bench_workbook_read(num_steps: int = 16382) -> dict:
+    """
+    Compares reading the Signal Addresses and Test Steps sheets with one pd.read_excel call each
+    (get_signal_addresses + get_test_steps) against one read_workbook load with openpyxl and with
+    the default (fastest available) engine.
+
+    Returns:
+        dict: Seconds of both ways of reading.
+    """
+    from generate_cli import load_generator
+
+    generator = load_generator()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "wide_test_steps.xlsx")
+        synthetic_workbook(file_path, num_steps)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            generator.get_signal_addresses(file_path, "Signal Addresses")
+            legacy_steps = generator.get_test_steps(file_path, "Test Steps")
+            legacy = time.perf_counter() - start
+
+            timings = {}
+            for engine in ("openpyxl", excel_engine()):
+                start = time.perf_counter()
+                workbook = read_workbook(file_path, engine=engine)
+                timings[engine] = time.perf_counter() - start
+                assert workbook["sheets"]["Test Steps"].equals(legacy_steps)
+
+    print(f"Test Steps sheet with {num_steps} step columns")
+    print(f"  {'two pd.read_excel calls':<28} {legacy * 1000:10.1f} ms")
+    for engine, seconds in timings.items():
+        print(f"  {f'read_workbook ({engine})':<28} {seconds * 1000:10.1f} ms   {legacy / seconds:5.1f}x")
+    return {"steps": num_steps, "legacy_s": legacy, "read_workbook_s": timings}
+
+
+def _legacy_states(switch_positions: pd.DataFrame, assessment_row: np.ndarray) -> np.ndarray:
+    """The object array of strings the generator built for a DPC test before state codes."""
+    switch_positions = switch_positions.copy()
+    for old, new in (("CLOSED", "POS_ON"), ("closed", "POS_ON"), ("OPEN", "POS_OFF"), ("open", "POS_OFF"),
+                     ("true", "true"), ("false", "false")):
+        switch_positions.replace(old, new, inplace=True, regex=True)
+    switch_positions.insert(0, 0, "POS_OFF")
+    assessment_row = np.insert(assessment_row, 0, True)
+    command_row = ["CAR_NO_OPERATION"] * len(assessment_row)
+    command_row[int(np.where(assessment_row == True)[0][0])] = "CAR_POSITION_CHANGED"
+    command_row[int(np.where(assessment_row == False)[0][0])] = "CAR_BLOCKED_BY_INTERLOCKING"
+    return np.vstack([switch_positions.to_numpy(), assessment_row, command_row])
+
+
+def _coded_states(switch_positions: pd.DataFrame, assessment_row: np.ndarray) -> np.ndarray:
+    """The same values as int8 state codes, as the generator builds them now."""
+    positions = encode_states(switch_positions.to_numpy(), CONTROL_CODES[2], "switch position")
+    assessment_row = encode_states(assessment_row, ASSESS_CODES, "assessment")
+    initial_position, initial_assessment = INITIAL_CODES[2]
+    positions = np.insert(positions, 0, initial_position, axis=1)
+    assessment_row = np.insert(assessment_row, 0, initial_assessment)
+    command_row = np.full(len(assessment_row), CAR_NO_OPERATION, dtype=np.int8)
+    command_row[np.flatnonzero(assessment_row == ASSESS_TRUE)[0]] = CAR_POSITION_CHANGED
+    command_row[np.flatnonzero(assessment_row == ASSESS_FALSE)[0]] = CAR_BLOCKED_BY_INTERLOCKING
+    return np.vstack([positions, assessment_row, command_row])
+
+
+def bench_state_codes(num_inputs: int = 14) -> dict:
+    """
+    Compares the string representation of a DPC test (six regex replace passes, object array) with int8
+    state codes for all 2^num_inputs steps: time and peak memory to build val_assess_cmd, its size, and
+    the time to write the JSON from it. Both JSON files must be identical.
+
+    Returns:
+        dict: Seconds, peak and array bytes of both representations.
+    """
+    steps = np.array(list(np.ndindex(*([2] * num_inputs))), dtype=bool)
+    # Labelled like the Test Steps sheet columns (steps start in column C)
+    switch_positions = pd.DataFrame(np.where(steps.T, "OPEN", "CLOSED").astype(object),
+                                    columns=range(2, len(steps) + 2))
+    assessment_row = steps.any(axis=1).astype(object)
+    group_types = {"CONTROL": [f"AA1D1Q01Q1QA{i}/CSWI1.Pos" for i in range(1, num_inputs + 1)],
+                   "ASSESS": ["AA1D1Q01Q1QB1/CILO1.EnaCls"], "COMMAND": ["AA1D1Q01Q1QB1/CSWI1.Pos"]}
+    header = FAT_header(1.2, "benchmark", "AA1D1Q01Q1", group_types)
+    num_test_steps = len(steps) + 1
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, build in (("strings", _legacy_states), ("int8 codes", _coded_states)):
+            built = _time_call(build, switch_positions, assessment_row)
+            # Memory in a separate run, tracemalloc slows down allocations
+            tracemalloc.start()
+            val_assess_cmd = build(switch_positions, assessment_row)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            array_bytes = val_assess_cmd.nbytes
+            if val_assess_cmd.dtype == object:  # The string objects the array points to
+                array_bytes += sum(sys.getsizeof(value) for value in set(val_assess_cmd.ravel().tolist()))
+
+            json_file = os.path.join(temp_dir, f"{name.replace(' ', '_')}.json")
+            start = time.perf_counter()
+            write_FAT_json(json_file, header, signal_layout(group_types, 2, val_assess_cmd.shape[0]),
+                           val_assess_cmd, num_test_steps, 2)
+            written = time.perf_counter() - start
+            with open(json_file, "rb") as f:
+                results[name] = {"build_s": built, "peak_bytes": peak, "array_bytes": array_bytes,
+                                 "json_s": written, "json": f.read()}
+    assert results["strings"].pop("json") == results["int8 codes"].pop("json")
+
+    print(f"DPC test with {num_inputs} inputs, {num_test_steps} steps (identical JSON)")
+    print(f"  {'':<12} {'build':>10} {'peak memory':>12} {'array':>10} {'JSON write':>11}")
+    for name, result in results.items():
+        print(f"  {name:<12} {result['build_s'] * 1000:8.1f} ms {result['peak_bytes'] / 2**20:9.2f} MB "
+              f"{result['array_bytes'] / 2**20:7.2f} MB {result['json_s']:9.2f} s")
+    return {"inputs": num_inputs, "steps": num_test_steps, **results}
+
+
+def bench_validation(num_steps: int = 100000, legacy_steps: int = 5000) -> dict:
+    """
+    Validates a DPC test case of num_steps steps the former way (re-read the file, jsonschema.validate
+    with a validator built for the call) and with fat_json_schema: the compiled validator and the
+    structural check on the in-memory document, and the plan check before the JSON is written. Both
+    schema validators are run on the first legacy_steps steps and scaled, they take minutes at 100k steps.
+
+    Returns:
+        dict: Seconds of every way, for num_steps steps.
+    """
+    import jsonschema
+
+    num_inputs = 8
+    rng = np.random.default_rng(0)
+    positions = rng.choice(np.array([CONTROL_CODES[2]["OPEN"], CONTROL_CODES[2]["CLOSED"]], dtype=np.int8),
+                           size=(num_inputs, num_steps))
+    assessment_row = rng.choice(np.array([ASSESS_FALSE, ASSESS_TRUE], dtype=np.int8), size=num_steps)
+    command_row = np.where(assessment_row == ASSESS_TRUE, CAR_POSITION_CHANGED, CAR_BLOCKED_BY_INTERLOCKING)
+    val_assess_cmd = np.vstack([positions, assessment_row, command_row]).astype(np.int8)
+    group_types = {"CONTROL": [f"AA1D1Q01Q1QA{i}/CSWI1.Pos" for i in range(1, num_inputs + 1)],
+                   "ASSESS": ["AA1D1Q01Q1QB1/CILO1.EnaCls"], "COMMAND": ["AA1D1Q01Q1QB1/CSWI1.Pos"]}
+    header = FAT_header(1.2, "benchmark", "AA1D1Q01Q1", group_types)
+    layout = signal_layout(group_types, 2, val_assess_cmd.shape[0])
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_file = write_FAT_json(os.path.join(temp_dir, "benchmark.json"), header, layout, val_assess_cmd,
+                                   num_steps, 2)
+        with open(json_file) as f:
+            document = json.load(f)
+        legacy_document = {**document, "testCases": [{**document["testCases"][0],
+                                                      "testSteps": document["testCases"][0]["testSteps"][:legacy_steps]}]}
+
+        def legacy():
+            with open(json_file) as f:
+                json.load(f)
+            jsonschema.validate(legacy_document, test_case_schema)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results["jsonschema.validate (scaled)"] = _time_call(legacy, repeat=1) * num_steps / legacy_steps
+            schema_validator()  # Compiled once per process, not part of the timings below
+            results["compiled validator (scaled)"] = _time_call(schema_validator().validate, legacy_document,
+                                                                repeat=1) * num_steps / legacy_steps
+            results["structural check"] = _time_call(check_document, document)
+            results["plan check"] = _time_call(validate_test_case_plan, header, layout, val_assess_cmd, num_steps)
+
+    print(f"DPC test with {num_inputs} inputs, {num_steps} steps")
+    for name, seconds in results.items():
+        print(f"  {name:<30} {seconds:9.3f} s")
+    return {"steps": num_steps, **results}
+
+
+# DataTypeTemplates of the synthetic SCD: {LNodeType id: (lnClass, {DO: DOType id})}, {DOType id: (cdc,
+# [(DA, bType, type, fc)])} and {DAType id: [(BDA, bType, type)]}, as in the templates of a bay controller.
+SYNTHETIC_LNODE_TYPES = {
+    "LLN0_T": ("LLN0", {"Mod": "ENC_T", "Beh": "ENS_T", "Health": "ENS_T"}),
+    "CSWI_T": ("CSWI", {"Mod": "ENC_T", "Beh": "ENS_T", "Pos": "DPC_CTL_T"}),
+    "CILO_T": ("CILO", {"Mod": "ENC_T", "Beh": "ENS_T", "EnaOpn": "SPS_T", "EnaCls": "SPS_T"}),
+    "XCBR_T": ("XCBR", {"Mod": "ENC_T", "Beh": "ENS_T", "Loc": "SPS_T", "Pos": "DPC_ST_T", "BlkOpn": "SPS_T",
+                        "BlkCls": "SPS_T"}),
+    "XSWI_T": ("XSWI", {"Mod": "ENC_T", "Beh": "ENS_T", "Loc": "SPS_T", "Pos": "DPC_ST_T", "BlkOpn": "SPS_T",
+                        "BlkCls": "SPS_T"}),
+}
+SYNTHETIC_DO_TYPES = {
+    "ENC_T": ("ENC", [("stVal", "Enum", "Mod", "ST"), ("q", "Quality", "", "ST"), ("t", "Timestamp", "", "ST"),
+                      ("ctlModel", "Enum", "ctlModel", "CF")]),
+    "ENS_T": ("ENS", [("stVal", "Enum", "Beh", "ST"), ("q", "Quality", "", "ST"), ("t", "Timestamp", "", "ST")]),
+    "SPS_T": ("SPS", [("stVal", "BOOLEAN", "", "ST"), ("q", "Quality", "", "ST"), ("t", "Timestamp", "", "ST")]),
+    "DPC_ST_T": ("DPC", [("stVal", "Dbpos", "", "ST"), ("q", "Quality", "", "ST"), ("t", "Timestamp", "", "ST"),
+                         ("ctlModel", "Enum", "ctlModel", "CF")]),
+    "DPC_CTL_T": ("DPC", [("stVal", "Dbpos", "", "ST"), ("q", "Quality", "", "ST"), ("t", "Timestamp", "", "ST"),
+                          ("ctlModel", "Enum", "ctlModel", "CF"), ("Oper", "Struct", "DPC_OPER_T", "CO"),
+                          ("Cancel", "Struct", "DPC_CANCEL_T", "CO")]),
+}
+SYNTHETIC_DA_TYPES = {
+    "ORIGIN_T": [("orCat", "Enum", "orCategory"), ("orIdent", "Octet64", "")],
+    "DPC_OPER_T": [("ctlVal", "BOOLEAN", ""), ("origin", "Struct", "ORIGIN_T"), ("ctlNum", "INT8U", ""),
+                   ("T", "Timestamp", ""), ("Test", "BOOLEAN", ""), ("Check", "Check", "")],
+    "DPC_CANCEL_T": [("ctlVal", "BOOLEAN", ""), ("origin", "Struct", "ORIGIN_T"), ("ctlNum", "INT8U", ""),
+                     ("T", "Timestamp", ""), ("Test", "BOOLEAN", "")],
+}
+
+
+PLCOPEN_NS = "http://www.plcopen.org/xml/tc6_0200"
+
+
+def synthetic_plcopen(file_path: str, num_pous: int = 20, blocks_per_pou: int = 2000, num_inputs: int = 16,
+                      seed: int = 0):
+    """
+    Writes a PLCopen XML project like a CODESYS export: every POU has num_inputs documented inputs and
+    an FBD of AND/OR/XOR blocks, each fed by two or three earlier inputs or blocks (some negated),
+    with the last four blocks as outputs.
+    """
+    rng = random.Random(seed)
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(f'<?xml version="1.0" encoding="utf-8"?>\n<project xmlns="{PLCOPEN_NS}">\n<types><pous>\n')
+        for pou in range(num_pous):
+            num_outputs = min(4, blocks_per_pou)
+            f.write(f'<pou name="POU{pou + 1}" pouType="program"><interface>\n')
+            for section, names in (("inputVars", [f"Input{i + 1}" for i in range(num_inputs)]),
+                                   ("outputVars", [f"Output{i + 1}" for i in range(num_outputs)])):
+                f.write(f"<{section}>\n")
+                for i, name in enumerate(names):
+                    address = f"AA1D1Q{pou % 99 + 1:02d}Q1QA{i + 1}/CSWI1.Pos"
+                    f.write(f'<variable name="{name}"><type><BOOL /></type><documentation>'
+                            f'<xhtml xmlns="http://www.w3.org/1999/xhtml"> {address}</xhtml>'
+                            f'</documentation></variable>\n')
+                f.write(f"</{section}>\n")
+            f.write("</interface><body><FBD>\n")
+            for i in range(num_inputs):
+                f.write(f'<inVariable localId="{i + 1}"><position x="0" y="0" /><connectionPointOut />'
+                        f'<expression>Input{i + 1}</expression></inVariable>\n')
+            for block in range(num_inputs + 1, num_inputs + blocks_per_pou + 1):
+                f.write(f'<block localId="{block}" typeName="{rng.choice(("AND", "OR", "XOR"))}">'
+                        f'<position x="0" y="0" /><inputVariables>')
+                for pin, ref in enumerate(rng.sample(range(1, block), min(rng.choice((2, 3)), block - 1))):
+                    negated = ' negated="true"' if rng.random() < 0.2 else ""
+                    f.write(f'<variable formalParameter="In{pin + 1}"{negated}><connectionPointIn>'
+                            f'<connection refLocalId="{ref}" /></connectionPointIn></variable>')
+                f.write('</inputVariables><inOutVariables /><outputVariables><variable formalParameter="Out1">'
+                        '<connectionPointOut /></variable></outputVariables></block>\n')
+            last = num_inputs + blocks_per_pou
+            for i in range(num_outputs):
+                f.write(f'<outVariable localId="{last + i + 1}"><position x="0" y="0" /><connectionPointIn>'
+                        f'<connection refLocalId="{last - i}" formalParameter="Out1" /></connectionPointIn>'
+                        f'<expression>Output{i + 1}</expression></outVariable>\n')
+            f.write("</FBD></body></pou>\n")
+        f.write("</pous></types>\n</project>\n")
+
+
+def _legacy_index_plcopen(file_path: str) -> list:
+    """The tables of every POU as the importer read them before PouIndex: namespaces stripped from the
+    whole tree, then separate findall scans for blocks, inVariables, outVariables and interface."""
+    tree = ET.parse(file_path)
+    for elem in tree.iter():
+        if "}" in elem.tag:
+            elem.tag = elem.tag.split("}", 1)[1]
+    pous = []
+    for pou in tree.getroot().findall(".//pou"):
+        blocks, in_vars, out_vars = [], [], []
+        in_vars_dict, out_vars_dict, blocks_dict, block_inputs, out_connections = {}, {}, {}, {}, {}
+        for block in pou.findall(".//block"):
+            block_id = block.attrib["localId"]
+            blocks.append((block_id, block.attrib["typeName"], 0, 0))
+            blocks_dict[block_id] = block.attrib["typeName"]
+            inputs = []
+            for input_var in block.findall(".//inputVariables/variable"):
+                conn = input_var.find("connectionPointIn/connection")
+                if conn is not None:
+                    inputs.append((conn.attrib["refLocalId"], input_var.attrib.get("negated", "false") == "true"))
+            block_inputs[block_id] = inputs
+        for var in pou.findall(".//inVariable"):
+            in_vars.append((var.attrib["localId"], var.find("expression").text, 0, 0))
+            in_vars_dict[var.attrib["localId"]] = var.find("expression").text
+        for var in pou.findall(".//outVariable"):
+            out_vars.append((var.attrib["localId"], var.find("expression").text, 0, 0))
+            out_vars_dict[var.attrib["localId"]] = var.find("expression").text
+            conn = var.find("connectionPointIn/connection")
+            if conn is not None:
+                out_connections[var.attrib["localId"]] = conn.attrib["refLocalId"]
+        interface = {section: [{"name": variable.attrib["name"], "address": extract_61850_address(variable)}
+                               for variable in pou.findall(f".//interface//{section}//variable")]
+                     for section in ("inputVars", "outputVars")}
+        pous.append(((blocks, in_vars, out_vars, block_inputs, out_connections, in_vars_dict, out_vars_dict,
+                      blocks_dict), interface))
+    return pous
+
+
+def bench_plcopen_parse(num_pous: int = 20, blocks_per_pou: int = 2000) -> dict:
+    """
+    Reads a synthetic PLCopen project the former way (strip_namespace and findall scans per POU) and
+    with index_plcopen (one streaming pass): time and peak memory. Both must give the same tables.
+    The peak is what tracemalloc sees: with lxml installed, the libxml2 memory of the POU being read
+    is not included.
+
+    Returns:
+        dict: Seconds and peak bytes of both readers.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        xml_file = os.path.join(temp_dir, "project.xml")
+        synthetic_plcopen(xml_file, num_pous, blocks_per_pou)
+        size = os.path.getsize(xml_file)
+        legacy = _legacy_index_plcopen(xml_file)
+        indexed = [(pou.tables(), pou.interface) for pou in index_plcopen(xml_file)]
+        assert legacy == indexed
+        for name, read in (("strip + findall", _legacy_index_plcopen), ("index_plcopen", index_plcopen)):
+            seconds = _time_call(read, xml_file)
+            tracemalloc.start()
+            read(xml_file)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results[name] = {"seconds": seconds, "peak_bytes": peak}
+
+    print(f"PLCopen project: {num_pous} POUs x {blocks_per_pou} blocks, {size / 2**20:.1f} MB (identical tables)")
+    legacy_seconds = results["strip + findall"]["seconds"]
+    for name, result in results.items():
+        print(f"  {name:<16} {result['seconds'] * 1000:10.1f} ms {result['peak_bytes'] / 2**20:9.1f} MB peak"
+              f"   {legacy_seconds / result['seconds']:5.1f}x")
+    return {"pous": num_pous, "blocks_per_pou": blocks_per_pou, "bytes": size, **results}
+
+
+def synthetic_ied_name(index: int) -> str:
+    """Bay IED names of a substation naming scheme: 'AA1D1Q01A1', ..., 'AA1D1Q99A1', 'AA1D2Q01A1', ..."""
+    return f"AA1D{index // 99 + 1}Q{index % 99 + 1:02d}A1"
+
+
+def synthetic_scd(file_path: str, num_ieds: int = 50, lnodes_per_ied: int = 60, extra_types: int = 0) -> dict:
+    """
+    Writes an SCD with num_ieds bay controllers. The logical devices of an IED are its switches: QA1 (the
+    circuit breaker: CSWI, CILO and XCBR) and QB1, QB2, ... (disconnectors: CSWI, CILO and XSWI), so
+    lnodes_per_ied // 3 of them, each with an LLN0. Every LN has an LNode under the switch's
+    ConductingEquipment in the bay of the IED. The DataTypeTemplates hold the SYNTHETIC_* types plus
+    extra_types unused GGIO LNodeTypes and DOTypes, as vendor templates carry many.
+
+    Returns:
+        dict: 'ieds' (IED names) and 'devices' ({IED: [LD instances]}).
+    """
+    num_devices = max(1, lnodes_per_ied // 3)
+    devices = ["QA1"] + [f"QB{i}" for i in range(1, num_devices)]
+    ieds = [synthetic_ied_name(i) for i in range(num_ieds)]
+    classes = {"QA": ("CSWI", "CILO", "XCBR"), "QB": ("CSWI", "CILO", "XSWI")}
+
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<SCL xmlns="http://www.iec.ch/61850/2003/SCL" version="2007" revision="B">\n'
+                '  <Header id="synthetic" nameStructure="IEDName"/>\n  <Substation name="AA1">\n')
+        for voltage_level in sorted({ied[:4] for ied in ieds}):
+            f.write(f'    <VoltageLevel name="{voltage_level[3:]}">\n')
+            for ied in (ied for ied in ieds if ied.startswith(voltage_level)):
+                f.write(f'      <Bay name="{ied[4:7]}">\n')
+                for device in devices:
+                    f.write(f'        <ConductingEquipment name="{device}" type="{"CBR" if device[:2] == "QA" else "DIS"}">\n')
+                    for ln_class in classes[device[:2]]:
+                        f.write(f'          <LNode iedName="{ied}" ldInst="{device}" lnClass="{ln_class}" lnInst="1"/>\n')
+                    f.write('        </ConductingEquipment>\n')
+                f.write('      </Bay>\n')
+            f.write('    </VoltageLevel>\n')
+        f.write('  </Substation>\n')
+        for ied in ieds:
+            f.write(f'  <IED name="{ied}" manufacturer="synthetic">\n    <AccessPoint name="AP1">\n      <Server>\n'
+                    '        <Authentication/>\n')
+            for device in devices:
+                f.write(f'        <LDevice inst="{device}">\n          <LN0 lnClass="LLN0" inst="" lnType="LLN0_T"/>\n')
+                for ln_class in classes[device[:2]]:
+                    f.write(f'          <LN lnClass="{ln_class}" inst="1" lnType="{ln_class}_T"/>\n')
+                f.write('        </LDevice>\n')
+            f.write('      </Server>\n    </AccessPoint>\n  </IED>\n')
+        f.write('  <DataTypeTemplates>\n')
+        lnode_types = dict(SYNTHETIC_LNODE_TYPES)
+        do_types = dict(SYNTHETIC_DO_TYPES)
+        for k in range(extra_types):
+            lnode_types[f"GGIO_T{k}"] = ("GGIO", {"Mod": "ENC_T", **{f"Ind{i}": f"SPS_T{k}" for i in range(1, 9)}})
+            do_types[f"SPS_T{k}"] = SYNTHETIC_DO_TYPES["SPS_T"]
+        for type_id, (ln_class, dos) in lnode_types.items():
+            f.write(f'    <LNodeType id="{type_id}" lnClass="{ln_class}">\n')
+            f.writelines(f'      <DO name="{name}" type="{do_type}"/>\n' for name, do_type in dos.items())
+            f.write('    </LNodeType>\n')
+        for type_id, (cdc, das) in do_types.items():
+            f.write(f'    <DOType id="{type_id}" cdc="{cdc}">\n')
+            f.writelines(f'      <DA name="{name}" bType="{b_type}" type="{da_type}" fc="{fc}"/>\n'
+                         for name, b_type, da_type, fc in das)
+            f.write('    </DOType>\n')
+        for type_id, bdas in SYNTHETIC_DA_TYPES.items():
+            f.write(f'    <DAType id="{type_id}">\n')
+            f.writelines(f'      <BDA name="{name}" bType="{b_type}" type="{da_type}"/>\n' for name, b_type, da_type in bdas)
+            f.write('    </DAType>\n')
+        f.write('  </DataTypeTemplates>\n</SCL>\n')
+    return {"ieds": ieds, "devices": {ied: devices for ied in ieds}}
+
+
+def synthetic_signal_workbook(file_path: str, scd: dict, num_inputs: int) -> dict:
+    """
+    Writes a workbook with only a Signal Addresses sheet for an SCD of synthetic_scd: the interlock
+    (CILO1.EnaCls) of QB1 of the first IED is assessed and its CSWI1.Pos commanded, and the CSWI1.Pos
+    of num_inputs other switches, first of the same bay, then of the next bays, are the CONTROL signals.
+
+    Returns:
+        dict: The addresses by group type, as SignalList.group_types().
+
+    Raises:
+        ValueError: If the SCD has fewer than num_inputs other switches.
+    """
+    from openpyxl import Workbook
+
+    dut_ied = scd["ieds"][0]
+    switches = [(ied, device) for ied in scd["ieds"] for device in scd["devices"][ied] if (ied, device) != (dut_ied, "QB1")]
+    if len(switches) < num_inputs:
+        raise ValueError(f"The SCD has {len(switches)} switches besides the DUT, {num_inputs} inputs need as many.")
+    group_types = {"CONTROL": [f"{ied}{device}/CSWI1.Pos" for ied, device in switches[:num_inputs]],
+                   "ASSESS": [f"{dut_ied}QB1/CILO1.EnaCls"], "COMMAND": [f"{dut_ied}QB1/CSWI1.Pos"]}
+
+    workbook = Workbook(write_only=True)
+    signals = workbook.create_sheet("Signal Addresses")
+    signals.append(["IED name", "Signal Addresse"])
+    signals.append([dut_ied, group_types["ASSESS"][0], "ASSESS", "Output1"])
+    for i, address in enumerate(group_types["CONTROL"], start=1):
+        signals.append([address.split("/")[0], address, "CONTROL", f"Input{i}"])
+    signals.append([dut_ied, group_types["COMMAND"][0], "COMMAND"])
+    workbook.save(file_path)
+    return group_types
+
+
+def random_logic(num_inputs: int, seed: int = 0, negation: float = 0.3) -> str:
+    """
+    A random interlock expression over Input1..InputN: every input appears once, in a random tree of
+    'and'/'or' with negated inputs and subterms. Since no input repeats, the logic is never constant.
+    """
+    rng = random.Random(seed)
+    names = [f"Input{i}" for i in range(1, num_inputs + 1)]
+    rng.shuffle(names)
+
+    def build(names):
+        if len(names) == 1:
+            return f"not {names[0]}" if rng.random() < negation else names[0]
+        split = rng.randint(1, len(names) - 1)
+        text = f"({build(names[:split])} {rng.choice(('and', 'or'))} {build(names[split:])})"
+        return f"not {text}" if rng.random() < negation / 3 else text
+
+    return build(names)
+
+
+def _profile_stage(func, *args, repeat: int = 3) -> tuple:
+    """Best wall-clock time of `repeat` calls and the peak traced memory of one more call, and its result."""
+    seconds = _time_call(func, *args, repeat=repeat)
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": seconds, "peak_bytes": peak}, result
+
+
+def compare_baseline(current: dict, baseline: dict, tolerance: float = 0.25, min_seconds: float = 0.005) -> list:
+    """
+    Compares the stages of a bench_stages result with a baseline written by it.
+
+    Parameters:
+        tolerance (float): Allowed relative increase of time and peak memory, 0.25 is 25 %.
+        min_seconds (float): Timing differences below this are noise and never a regression.
+
+    Returns:
+        list: (stage, what, baseline value, current value) of every regression.
+    """
+    if current["parameters"] != baseline.get("parameters"):
+        print(f"Warning: the baseline was measured with {baseline.get('parameters')}, not {current['parameters']}.")
+    regressions = []
+    print(f"  {'stage':<28} {'baseline':>10} {'current':>10} {'ratio':>7} {'peak ratio':>11}")
+    for stage, result in current["stages"].items():
+        old = baseline.get("stages", {}).get(stage)
+        if old is None:
+            print(f"  {stage:<28} {'-':>10} {result['seconds'] * 1000:8.1f}ms   (new stage)")
+            continue
+        ratio = result["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+        peak_ratio = result["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] else 1.0
+        flags = []
+        if ratio > 1 + tolerance and result["seconds"] - old["seconds"] > min_seconds:
+            regressions.append((stage, "seconds", old["seconds"], result["seconds"]))
+            flags.append("SLOWER")
+        if peak_ratio > 1 + tolerance and result["peak_bytes"] - old["peak_bytes"] > 2**20:
+            regressions.append((stage, "peak_bytes", old["peak_bytes"], result["peak_bytes"]))
+            flags.append("MORE MEMORY")
+        print(f"  {stage:<28} {old['seconds'] * 1000:8.1f}ms {result['seconds'] * 1000:8.1f}ms {ratio:6.2f}x "
+              f"{peak_ratio:10.2f}x  {' '.join(flags)}")
+    return regressions
+
+
+def bench_stages(num_ieds: int = 50, lnodes_per_ied: int = 60, extra_types: int = 0, num_inputs: int = 12,
+                 seed: int = 0, repeat: int = 3) -> dict:
+    """
+    Times and memory-profiles every stage on a synthetic SCD, Signal Addresses workbook and random
+    interlock logic: the SCD index, the Excel read, the address and DataTypeTemplates check, the truth
+    table, validation of the written document, and every stage_timing stage of one generate_test_case
+    run (as 'pipeline/<stage>'; it builds, validates and writes the JSON). Logging is quiet meanwhile.
+
+    Returns:
+        dict: 'parameters', 'environment' and 'stages' ({stage: {'seconds', 'peak_bytes'}}), the layout of
+        a baseline file.
+    """
+    from generate_cli import load_generator
+
+    generator = load_generator()
+    parameters = {"ieds": num_ieds, "lnodes_per_ied": lnodes_per_ied, "extra_types": extra_types,
+                  "inputs": num_inputs, "seed": seed}
+    stages = {}
+    level = logger.level
+    logger.setLevel("WARNING")
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            scd_file = os.path.join(temp_dir, "synthetic.scd")
+            workbook_file = os.path.join(temp_dir, "synthetic.xlsx")
+            scd_info = synthetic_scd(scd_file, num_ieds, lnodes_per_ied, extra_types)
+            group_types = synthetic_signal_workbook(workbook_file, scd_info, num_inputs)
+            logic = random_logic(num_inputs, seed)
+
+            stages["scd_index"], scd = _profile_stage(index_scd, scd_file, repeat=repeat)
+            stages["excel_read"], workbook = _profile_stage(read_workbook, workbook_file, (SIGNAL_ADDRESSES_SHEET,),
+                                                            repeat=repeat)
+
+            def address_check():
+                index = AddressIndex(scd["lnode_addresses"], scd["ieds"])
+                workbook["signal_list"].assign_ieds(index)
+                signals = workbook["signal_list"].addresses()
+                return index.validate(signals), DataTypeResolver(scd["templates"], scd["ln_types"]).validate(signals)
+
+            stages["address_check"], (missing, resolved) = _profile_stage(address_check, repeat=repeat)
+            assert not missing and not any(result["error"] for result in resolved), (missing, resolved)
+
+            def truth_table():
+                return Truth_Table_1_9.to_test_values(Truth_Table_1_9.build_truth_table(logic, num_inputs), 2)
+
+            stages["truth_table"], truth_table_df = _profile_stage(truth_table, repeat=repeat)
+
+            def pipeline():
+                stage_timing.reset()
+                return generator.generate_test_case(
+                    workbook_file, scd_file, os.path.join(temp_dir, "synthetic"), truth_table_df=truth_table_df.copy(),
+                    test_type=2, scd_cache=False)
+
+            pipeline_stages = {}
+            for _ in range(repeat):
+                json_file = pipeline()
+                for stage, seconds in stage_timing.stages():
+                    pipeline_stages[stage] = min(seconds, pipeline_stages.get(stage, float("inf")))
+            tracemalloc.start()
+            try:
+                pipeline()
+            finally:
+                tracemalloc.stop()
+            peaks = dict(stage_timing.peaks())
+            for stage, seconds in pipeline_stages.items():
+                stages[f"pipeline/{stage}"] = {"seconds": seconds, "peak_bytes": peaks.get(stage, 0)}
+
+            with open(json_file) as f:
+                document = json.load(f)
+            stages["validation"], valid = _profile_stage(validate_document, document, repeat=repeat)
+            assert valid
+    finally:
+        logger.setLevel(level)
+
+    environment = {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+                   "platform": platform.platform(), "machine": platform.machine(), "excel_engine": excel_engine()}
+    result = {"parameters": parameters, "environment": environment, "stages": stages}
+    print(f"{num_ieds} IEDs x {lnodes_per_ied} LNodes ({num_ieds * (lnodes_per_ied // 3) * 3} LNodes), "
+          f"{len(SYNTHETIC_LNODE_TYPES) + extra_types} LNodeTypes, {num_inputs} inputs ({len(truth_table_df)} steps), "
+          f"{sum(len(addresses) for addresses in group_types.values())} signals")
+    print(f"  logic: {logic}")
+    print(f"  {'stage':<28} {'time':>10} {'peak memory':>12}")
+    for stage, measured in stages.items():
+        print(f"  {stage:<28} {measured['seconds'] * 1000:8.1f}ms {measured['peak_bytes'] / 2**20:9.2f} MB")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the test case generation stages.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    truth_table_parser = subparsers.add_parser("truth_table", help="Legacy vs vectorized truth table rows/second.")
+    truth_table_parser.add_argument("--max-inputs", type=int, default=20)
+    truth_table_parser.add_argument("--legacy-max-inputs", type=int, default=14)
+
+    startup_parser = subparsers.add_parser("startup", help="Cold start import time of the entry points.")
+    startup_parser.add_argument("--repeat", type=int, default=3)
+    startup_parser.add_argument("--top", type=int, default=10)
+
+    address_parser = subparsers.add_parser("address_check", help="Signal address check: list scan vs AddressIndex.")
+    address_parser.add_argument("--signals", type=int, default=10000)
+    address_parser.add_argument("--lnodes", type=int, default=50000)
+
+    workbook_parser = subparsers.add_parser("workbook_read", help="Two pd.read_excel calls vs one read_workbook.")
+    workbook_parser.add_argument("--steps", type=int, default=16382)
+
+    state_parser = subparsers.add_parser("state_codes", help="String values vs int8 state codes of the test steps.")
+    state_parser.add_argument("--inputs", type=int, default=14)
+
+    validation_parser = subparsers.add_parser("validation", help="jsonschema.validate vs fat_json_schema checks.")
+    validation_parser.add_argument("--steps", type=int, default=100000)
+    validation_parser.add_argument("--legacy-steps", type=int, default=5000)
+
+    plcopen_parser = subparsers.add_parser("plcopen_parse", help="strip_namespace + findall vs index_plcopen.")
+    plcopen_parser.add_argument("--pous", type=int, default=20)
+    plcopen_parser.add_argument("--blocks", type=int, default=2000)
+
+    stages_parser = subparsers.add_parser("stages", help="Time and peak memory of every stage on synthetic inputs.")
+    stages_parser.add_argument("--ieds", type=int, default=50)
+    stages_parser.add_argument("--lnodes-per-ied", type=int, default=60)
+    stages_parser.add_argument("--templates", type=int, default=0, help="Extra unused LNodeTypes in the SCD.")
+    stages_parser.add_argument("--inputs", type=int, default=12)
+    stages_parser.add_argument("--seed", type=int, default=0)
+    stages_parser.add_argument("--repeat", type=int, default=3)
+    stages_parser.add_argument("--baseline-out", help="Write the results as a JSON baseline.")
+    stages_parser.add_argument("--compare", help="Compare with a JSON baseline; exit code 1 on a regression.")
+    stages_parser.add_argument("--tolerance", type=float, default=0.25)
+
+    args = parser.parse_args()
+    if args.benchmark == "truth_table":
+        bench_truth_table(args.max_inputs, args.legacy_max_inputs)
+    elif args.benchmark == "startup":
+        bench_startup(args.repeat, args.top)
+    elif args.benchmark == "address_check":
+        bench_address_check(args.signals, args.lnodes)
+    elif args.benchmark == "workbook_read":
+        bench_workbook_read(args.steps)
+    elif args.benchmark == "state_codes":
+        bench_state_codes(args.inputs)
+    elif args.benchmark == "validation":
+        bench_validation(args.steps, args.legacy_steps)
+    elif args.benchmark == "plcopen_parse":
+        bench_plcopen_parse(args.pous, args.blocks)
+    elif args.benchmark == "stages":
+        result = bench_stages(args.ieds, args.lnodes_per_ied, args.templates, args.inputs, args.seed, args.repeat)
+        if args.baseline_out:
+            with open(args.baseline_out, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+            print(f"Baseline written to {args.baseline_out}")
+        if args.compare:
+            with open(args.compare, encoding="utf-8") as f:
+                baseline = json.load(f)
+            print(f"Compared with {args.compare} (tolerance {args.tolerance:.0%}):")
+            regressions = compare_baseline(result, baseline, args.tolerance)
+            for stage, what, old, new in regressions:
+                print(f"Regression: {stage} {what} {old:.4g} -> {new:.4g}")
+            return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,65 +1,238 @@
-from tqdm import tqdm
-import openpyxl
-
-def copy_columns_between_excel_files(
-    source_file: str,
-    destination_file: str,
-    source_sheet_name: str,
-    destination_sheet_name: str,
-    column_range: str,
-    start_row: int,
-    end_row: int,
-    start_cell_in_destination: str
-):
-    """
-    Copies specified columns from a source Excel file to a destination Excel file,
-    starting from a specified cell in the destination sheet.
-
-    Parameters:
-        source_file (str): Path to the source Excel file.
-        destination_file (str): Path to the destination Excel file.
-        source_sheet_name (str): Name of the sheet in the source file.
-        destination_sheet_name (str): Name of the sheet in the destination file.
-        column_range (str): The columns to copy (e.g., "A:BL").
-        start_row (int): The starting row to copy from in the source sheet.
-        end_row (int): The ending row to copy from in the source sheet.
-        start_cell_in_destination (str): The top-left cell where the range will be pasted (e.g., "C3").
-    """
-    # Load workbooks
-    source_wb = openpyxl.load_workbook(source_file, data_only=True)
-    destination_wb = openpyxl.load_workbook(destination_file)
-
-    # Load sheets
-    source_sheet = source_wb[source_sheet_name]
-    destination_sheet = destination_wb[destination_sheet_name]
-
-    # Parse the start cell in the destination
-    start_row_dest, start_col_dest = openpyxl.utils.cell.coordinate_to_tuple(start_cell_in_destination)
-
-    # Get the starting and ending columns from the column range
-    start_col, end_col = column_range.split(":")
-    start_col_index = openpyxl.utils.column_index_from_string(start_col)
-    end_col_index = openpyxl.utils.column_index_from_string(end_col)
-
-    # Calculate total cells to process for progress bar
-    total_cells = (end_col_index - start_col_index + 1) * (end_row - start_row + 1)
-
-    # Copy columns with a progress bar
-    with tqdm(total=total_cells, desc="Copying columns", unit="cell") as pbar:
-        for col_index in range(start_col_index, end_col_index + 1):
-            dest_col_index = start_col_dest + (col_index - start_col_index)
-            col_letter = openpyxl.utils.get_column_letter(col_index)
-            dest_col_letter = openpyxl.utils.get_column_letter(dest_col_index)
-
-            # Copy each cell in the specified row range
-            for row in range(start_row, end_row + 1):
-                source_value = source_sheet[f"{col_letter}{row}"].value
-                dest_row = start_row_dest + (row - start_row)
-                destination_sheet[f"{dest_col_letter}{dest_row}"].value = source_value
-
-                # Update progress bar
-                pbar.update(1)
-
-    # Save the destination file
-    destination_wb.save(destination_file)
-    print("Columns copied successfully starting from the specified cell!")
\ No newline at end of file
+import numbers
+import os
+import re
+import tempfile
+import zipfile
+from xml.sax.saxutils import escape
+
+import numpy as np
+from tqdm import tqdm
+import openpyxl
+
+from generator_log import is_quiet, logger
+
+# Sheet size limits of the xlsx format
+MAX_ROWS = 1048576
+MAX_COLUMNS = 16384
+
+def copy_columns_between_excel_files(
+    source_file: str,
+    destination_file: str,
+    source_sheet_name: str,
+    destination_sheet_name: str,
+    column_range: str,
+    start_row: int,
+    end_row: int,
+    start_cell_in_destination: str
+):
+    """
+    Copies specified columns from a source Excel file to a destination Excel file,
+    starting from a specified cell in the destination sheet.
+
+    Parameters:
+        source_file (str): Path to the source Excel file.
+        destination_file (str): Path to the destination Excel file.
+        source_sheet_name (str): Name of the sheet in the source file.
+        destination_sheet_name (str): Name of the sheet in the destination file.
+        column_range (str): The columns to copy (e.g., "A:BL").
+        start_row (int): The starting row to copy from in the source sheet.
+        end_row (int): The ending row to copy from in the source sheet.
+        start_cell_in_destination (str): The top-left cell where the range will be pasted (e.g., "C3").
+    """
+    # Load workbooks
+    source_wb = openpyxl.load_workbook(source_file, data_only=True)
+    destination_wb = openpyxl.load_workbook(destination_file)
+
+    # Load sheets
+    source_sheet = source_wb[source_sheet_name]
+    destination_sheet = destination_wb[destination_sheet_name]
+
+    # Parse the start cell in the destination
+    start_row_dest, start_col_dest = openpyxl.utils.cell.coordinate_to_tuple(start_cell_in_destination)
+
+    # Get the starting and ending columns from the column range
+    start_col, end_col = column_range.split(":")
+    start_col_index = openpyxl.utils.column_index_from_string(start_col)
+    end_col_index = openpyxl.utils.column_index_from_string(end_col)
+
+    # Calculate total cells to process for progress bar
+    total_cells = (end_col_index - start_col_index + 1) * (end_row - start_row + 1)
+
+    # Copy columns with a progress bar
+    with tqdm(total=total_cells, desc="Copying columns", unit="cell", disable=is_quiet()) as pbar:
+        for col_index in range(start_col_index, end_col_index + 1):
+            dest_col_index = start_col_dest + (col_index - start_col_index)
+            col_letter = openpyxl.utils.get_column_letter(col_index)
+            dest_col_letter = openpyxl.utils.get_column_letter(dest_col_index)
+
+            # Copy each cell in the specified row range
+            for row in range(start_row, end_row + 1):
+                source_value = source_sheet[f"{col_letter}{row}"].value
+                dest_row = start_row_dest + (row - start_row)
+                destination_sheet[f"{dest_col_letter}{dest_row}"].value = source_value
+
+                # Update progress bar
+                pbar.update(1)
+
+    # Save the destination file
+    destination_wb.save(destination_file)
+    logger.info("Columns copied successfully starting from the specified cell!")
+
+def write_rows_to_sheet(
+    destination_file: str,
+    sheet_name: str,
+    rows: list,
+    start_cell: str,
+    clear_from_row: int = None,
+    cell_values: dict = None,
+    clear_sheet_if: dict = None
+):
+    """
+    Writes a block of values into a sheet with one load and one save of the workbook, reporting
+    progress per row. Cell styles are kept.
+
+    Parameters:
+        destination_file (str): Path to the Excel file.
+        sheet_name (str): Name of the sheet to write.
+        rows (list): One list of values per sheet row.
+        start_cell (str): The top-left cell of the block (e.g., "C3").
+        clear_from_row (int): Clear the values of this row and all rows below it first.
+        cell_values (dict): Single values to write as well, e.g. {"B9": "ASSESS"}.
+        clear_sheet_if (dict): Cell values, e.g. {"A1": "Step"}; if the sheet holds all of them, it is
+            cleared from row 1 instead of clear_from_row.
+    """
+    start_row, start_col = openpyxl.utils.cell.coordinate_to_tuple(start_cell)
+    width = max((len(values) for values in rows), default=0)
+    if start_col + width - 1 > MAX_COLUMNS:
+        raise ValueError(f"{width} columns from {start_cell} do not fit in Excel's {MAX_COLUMNS} columns.")
+
+    workbook = openpyxl.load_workbook(destination_file)
+    sheet = workbook[sheet_name]
+
+    if clear_sheet_if and all(str(sheet[coordinate].value).strip() == value
+                              for coordinate, value in clear_sheet_if.items()):
+        clear_from_row = 1
+    if clear_from_row is not None and sheet.max_row >= clear_from_row:
+        for row in sheet.iter_rows(min_row=clear_from_row, max_row=sheet.max_row, max_col=sheet.max_column):
+            for cell in row:
+                cell.value = None
+
+    with tqdm(total=len(rows), desc=f"Writing {sheet_name}", unit="row", disable=is_quiet()) as pbar:
+        for row_offset, values in enumerate(rows):
+            row_index = start_row + row_offset
+            for col_offset, value in enumerate(values):
+                sheet.cell(row=row_index, column=start_col + col_offset, value=value)
+            pbar.update(1)
+
+    for coordinate, value in (cell_values or {}).items():
+        sheet[coordinate] = value
+
+    workbook.save(destination_file)
+    logger.info("%d rows written to '%s' from %s.", len(rows), sheet_name, start_cell)
+
+
+def _xml_cell(reference: str, value) -> str:
+    """One <c> element of sheet XML: booleans, numbers, or inline strings. NaN leaves the cell empty."""
+    if isinstance(value, (bool, np.bool_)):
+        return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, numbers.Number):
+        if value != value:
+            return ""
+        return f'<c r="{reference}"><v>{value}</v></c>'
+    return f'<c r="{reference}" t="inlineStr"><is><t>{escape(str(value))}</t></is></c>'
+
+
+def stream_rows_to_sheet(excel_file: str, sheet_name: str, rows, total: int = None):
+    """
+    Replaces the content of a sheet by the given rows, written straight into the sheet XML inside the
+    workbook file one row at a time. Neither the rows nor the other sheets are loaded as cell objects,
+    so this works for sheets of any height up to Excel's row limit. Only the <sheetData> of the sheet
+    is replaced: its columns, views and frozen panes, merged cells, conditional formats, tables and
+    drawings are copied through with the rest of the workbook, so their relationships stay valid.
+    The styles of the replaced cells are not kept.
+
+    Parameters:
+        excel_file (str): Path to the Excel file.
+        sheet_name (str): Name of an existing sheet.
+        rows: Iterable of lists of values (str, bool or numbers; None leaves a cell empty).
+        total (int): Number of rows, for the progress bar.
+    """
+    from workbook_reader import sheet_paths
+
+    calc_chain = "xl/calcChain.xml"
+    directory = os.path.dirname(os.path.abspath(excel_file))
+    handle, temp_file = tempfile.mkstemp(suffix=".xlsx", dir=directory)
+    os.close(handle)
+    try:
+        with zipfile.ZipFile(excel_file) as source, \
+                zipfile.ZipFile(temp_file, "w", zipfile.ZIP_DEFLATED) as target:
+            paths = sheet_paths(source)
+            if sheet_name not in paths:
+                raise ValueError(f"Sheet '{sheet_name}' not found in {excel_file}.")
+            has_calc_chain = calc_chain in source.namelist()
+            for item in source.infolist():
+                if item.filename == paths[sheet_name]:
+                    written = _write_sheet_xml(target, item.filename, source.read(item.filename), rows, total,
+                                               sheet_name)
+                elif item.filename == calc_chain:
+                    # The calculation chain lists formula cells of all sheets; Excel rebuilds it
+                    continue
+                elif has_calc_chain and item.filename in ("[Content_Types].xml", "xl/_rels/workbook.xml.rels"):
+                    text = source.read(item.filename).decode("utf-8")
+                    text = re.sub(r'<(Override|Relationship)\b[^>]*calcChain\.xml"[^>]*/>', "", text)
+                    target.writestr(item, text.encode("utf-8"))
+                else:
+                    target.writestr(item, source.read(item.filename))
+        os.chmod(temp_file, os.stat(excel_file).st_mode)
+        os.replace(temp_file, excel_file)
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+    logger.info("%d rows written to '%s'.", written, sheet_name)
+
+
+def _split_sheet_xml(sheet_xml: bytes, sheet_name: str) -> tuple:
+    """
+    Splits sheet XML around its <sheetData> element: the XML before it (without the <dimension>,
+    which would no longer match the rows), the namespace prefix of the element, and the XML after it.
+    """
+    match = re.search(rb"<(\w+:)?sheetData\b[^>]*?(/?)>", sheet_xml)
+    if match is None:
+        raise ValueError(f"Sheet '{sheet_name}' has no <sheetData> element.")
+    prefix = match.group(1) or b""
+    if match.group(2):
+        end = match.end()
+    else:
+        closing = b"</" + prefix + b"sheetData>"
+        end = sheet_xml.find(closing, match.end())
+        if end < 0:
+            raise ValueError(f"Sheet '{sheet_name}' has no closing </sheetData>.")
+        end += len(closing)
+    head = re.sub(rb"<(\w+:)?dimension\b[^>]*/>", b"", sheet_xml[:match.start()], count=1)
+    return head, prefix, sheet_xml[end:]
+
+
+def _write_sheet_xml(archive: zipfile.ZipFile, part_name: str, sheet_xml: bytes, rows, total: int,
+                     sheet_name: str) -> int:
+    head, prefix, tail = _split_sheet_xml(sheet_xml, sheet_name)
+    written = 0
+    with archive.open(part_name, "w") as f, tqdm(total=total, desc=f"Writing {sheet_name}", unit="row",
+                                                disable=is_quiet()) as pbar:
+        f.write(head)
+        # The rows and cells are written unprefixed, in the spreadsheetml namespace
+        f.write(b"<" + prefix + b'sheetData xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                if prefix else b"<sheetData>")
+        for row_index, values in enumerate(rows, start=1):
+            if row_index > MAX_ROWS:
+                raise ValueError(f"More than Excel's {MAX_ROWS} rows for sheet '{sheet_name}'.")
+            if len(values) > MAX_COLUMNS:
+                raise ValueError(f"Row {row_index} has more than Excel's {MAX_COLUMNS} columns.")
+            cells = "".join(
+                _xml_cell(f"{openpyxl.utils.get_column_letter(column)}{row_index}", value)
+                for column, value in enumerate(values, start=1) if value is not None)
+            f.write(f'<row r="{row_index}">{cells}</row>'.encode("utf-8"))
+            written = row_index
+            pbar.update(1)
+        f.write(b"</" + prefix + b"sheetData>")
+        f.write(tail)
+    return written
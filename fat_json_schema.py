@@ -0,0 +1,291 @@
+import numpy as np
+
+from generator_log import logger
+from state_codes import STATE_VALUES
+
+# Schema of the StationScout test case JSON
+test_case_schema = {
+    # Most recent json schema specification
+    "$schema": "http://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "properties": {
+        "version": {
+            "type": "string"
+        },
+        "testCases": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {
+                        "type": "string"
+                    },
+                    "autoSetControlValues": {
+                        "type": "boolean"
+                    },
+                    "autoAssess": {
+                        "type": "boolean"
+                    },
+                    "assessmentLockoutTime": {
+                        "type": "number"
+                    },
+                    "autoAssessTimeout": {
+                        "type": "number"
+                    },
+                    "switchOperationTime": {
+                        "type": "number"
+                    },
+                    "parent": {
+                        "type": "string"
+                    },
+                    "signalGroups": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "groupType": {
+                                    "type": "string",
+                                    "enum": ["CONTROL", "ASSESS", "COMMAND"]
+                                },
+                                "signalRefs": {
+                                    "type": "array",
+                                    "items": {
+                                        "type": "string"
+                                    }
+                                }
+                            },
+                            "required": ["groupType", "signalRefs"]
+                        }
+                    },
+                    "testSteps": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "description": {
+                                    "type": "string"
+                                },
+                                "ordered": {
+                                    "type": "boolean"
+                                },
+                                "expected": {
+                                    "type": "array",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "signalRef": {
+                                                "type": "string"
+                                            },
+                                            "value": {
+                                                "type": ["string", "boolean"]
+                                            },
+                                            "commandResult": {
+                                                "type": "string"
+                                            }
+                                        },
+                                        "required": ["signalRef"],
+                                        "oneOf": [
+                                            {
+                                                "required": ["value"]
+                                            },
+                                            {
+                                                "required": ["commandResult"]
+                                            }
+                                        ]
+                                    }
+                                }
+                            },
+                            "required": ["ordered", "expected"]
+                        }
+                    }
+                },
+                "required": [
+                    "name",
+                    "parent",
+                    "autoSetControlValues",
+                    "autoAssess",
+                    "assessmentLockoutTime",
+                    "autoAssessTimeout",
+                    "switchOperationTime",
+                    "signalGroups",
+                    "testSteps"
+                ]
+            }
+        }
+    },
+    "required": ["version", "testCases"]
+}
+
+
+GROUP_TYPES = ("CONTROL", "ASSESS", "COMMAND")
+# Test case fields of the schema and their JSON types (bool is not a JSON number)
+_TEST_CASE_FIELDS = {
+    "name": (str,), "parent": (str,), "autoSetControlValues": (bool,), "autoAssess": (bool,),
+    "assessmentLockoutTime": (int, float), "autoAssessTimeout": (int, float), "switchOperationTime": (int, float),
+    "signalGroups": (list,), "testSteps": (list,),
+}
+_VALUE_TYPES = (str, bool, np.str_, np.bool_)
+_STRING_TYPES = (str, np.str_)
+
+_validator = None
+
+
+def schema_validator():
+    """The jsonschema validator of test_case_schema, checked and built once per process."""
+    global _validator
+    if _validator is None:
+        from jsonschema.validators import validator_for
+
+        validator_class = validator_for(test_case_schema)
+        validator_class.check_schema(test_case_schema)
+        _validator = validator_class(test_case_schema)
+    return _validator
+
+
+def _is_type(value, types: tuple) -> bool:
+    return isinstance(value, types) and (bool in types or not isinstance(value, (bool, np.bool_)))
+
+
+def check_test_step(step, where: str) -> list:
+    """Structural check of one test step against the schema. Returns the problems found."""
+    if not isinstance(step, dict):
+        return [f"{where} is not an object"]
+    problems = []
+    if not _is_type(step.get("ordered"), (bool,)):
+        problems.append(f"{where}.ordered is missing or not a boolean")
+    if "description" in step and not _is_type(step["description"], _STRING_TYPES):
+        problems.append(f"{where}.description is not a string")
+    expected = step.get("expected")
+    if not isinstance(expected, list):
+        return problems + [f"{where}.expected is missing or not an array"]
+    for position, entry in enumerate(expected):
+        if not isinstance(entry, dict):
+            problems.append(f"{where}.expected[{position}] is not an object")
+            continue
+        if not _is_type(entry.get("signalRef"), _STRING_TYPES):
+            problems.append(f"{where}.expected[{position}].signalRef is missing or not a string")
+        if ("value" in entry) == ("commandResult" in entry):
+            problems.append(f"{where}.expected[{position}] needs exactly one of value and commandResult")
+        if "value" in entry and not _is_type(entry["value"], _VALUE_TYPES):
+            problems.append(f"{where}.expected[{position}].value is not a string or boolean")
+        if "commandResult" in entry and not _is_type(entry["commandResult"], _STRING_TYPES):
+            problems.append(f"{where}.expected[{position}].commandResult is not a string")
+    return problems
+
+
+def check_test_case(test_case, where: str = "testCases[0]", steps: bool = True) -> list:
+    """
+    Structural check of one test case for the fixed StationScout shape, with plain type checks instead
+    of the schema's per-entry oneOf. It checks every constraint of test_case_schema, so a test case it
+    passes is valid. Returns the problems found.
+    """
+    if not isinstance(test_case, dict):
+        return [f"{where} is not an object"]
+    problems = []
+    for field, types in _TEST_CASE_FIELDS.items():
+        if field not in test_case:
+            problems.append(f"{where}.{field} is missing")
+        elif not _is_type(test_case[field], types):
+            problems.append(f"{where}.{field} has the wrong type")
+    for position, group in enumerate(test_case.get("signalGroups") or []):
+        if not isinstance(group, dict) or group.get("groupType") not in GROUP_TYPES \
+                or not isinstance(group.get("signalRefs"), list) \
+                or not all(_is_type(signal, _STRING_TYPES) for signal in group["signalRefs"]):
+            problems.append(f"{where}.signalGroups[{position}] is not a group of signal references")
+    if steps and isinstance(test_case.get("testSteps"), list):
+        for position, step in enumerate(test_case["testSteps"]):
+            problems += check_test_step(step, f"{where}.testSteps[{position}]")
+    return problems
+
+
+def check_document(document) -> list:
+    """Structural check of a whole StationScout document, see check_test_case."""
+    if not isinstance(document, dict):
+        return ["the document is not an object"]
+    problems = [] if _is_type(document.get("version"), _STRING_TYPES) else ["version is missing or not a string"]
+    if not isinstance(document.get("testCases"), list):
+        return problems + ["testCases is missing or not an array"]
+    for position, test_case in enumerate(document["testCases"]):
+        problems += check_test_case(test_case, f"testCases[{position}]")
+    return problems
+
+
+def validate_document(document, full: bool = False) -> bool:
+    """
+    Validates a StationScout document in memory. The structural check decides if it passes; only a
+    document it rejects (or full=True) goes through the compiled jsonschema validator, whose
+    error is logged.
+
+    Returns:
+        bool: True if the document is valid.
+    """
+    if not full and not check_document(document):
+        logger.info("JSON is valid.")
+        return True
+    errors = sorted(schema_validator().iter_errors(document), key=lambda error: list(error.absolute_path))
+    if not errors:
+        logger.info("JSON is valid.")
+        return True
+    logger.error("JSON is invalid.\n%s", errors[0])
+    if len(errors) > 1:
+        logger.error("... and %d more schema errors.", len(errors) - 1)
+    return False
+
+
+def check_test_steps(layout: list, val_assess_cmd: np.ndarray, num_test_steps: int, descriptions=None) -> list:
+    """
+    Checks the test steps write_FAT_json writes, from the data they are written from instead of the
+    JSON text: every 'expected' entry of every step is built from `layout`, so it is enough to check the
+    layout once and the types of the distinct values of each row of val_assess_cmd.
+
+    Returns:
+        list: The problems found.
+    """
+    problems = []
+    num_columns = val_assess_cmd.shape[1]
+    for signal, field, row in layout:
+        if not _is_type(signal, _STRING_TYPES):
+            problems.append(f"signalRef {signal!r} is not a string")
+        if field not in ("value", "commandResult"):
+            problems.append(f"{signal}: unknown field {field!r}")
+            continue
+        if row is None or num_columns == 0:
+            continue  # Written as "Undefined"
+        values = val_assess_cmd[row, :num_test_steps]
+        if np.issubdtype(values.dtype, np.integer):
+            codes = np.unique(values)
+            if codes.min() < 0 or codes.max() >= len(STATE_VALUES):
+                problems.append(f"{signal}: unknown state codes {codes.tolist()}")
+                continue
+            values = [STATE_VALUES[code] for code in codes]
+        types = _VALUE_TYPES if field == "value" else _STRING_TYPES
+        wrong = {type(value).__name__ for value in values if not _is_type(value, types)}
+        if wrong:
+            problems.append(f"{signal}: {field} values of type {', '.join(sorted(wrong))}")
+    if descriptions is not None:
+        wrong = {type(text).__name__ for text in descriptions if not _is_type(text, _STRING_TYPES)}
+        if wrong:
+            problems.append(f"descriptions of type {', '.join(sorted(wrong))}")
+    return problems
+
+
+def validate_test_case_plan(header: dict, layout: list, val_assess_cmd: np.ndarray, num_test_steps: int,
+                            descriptions=None) -> bool:
+    """
+    Validates a test case before or while it is streamed by write_FAT_json: the header (FAT_header,
+    without test steps) against the compiled schema, the steps with check_test_steps. The cost does not
+    grow with the number of signals times steps, so 100k-step tests validate in well under a second.
+
+    Returns:
+        bool: True if the written JSON is valid.
+    """
+    header_errors = list(schema_validator().iter_errors(header))
+    problems = [error.message for error in header_errors]
+    problems += check_test_steps(layout, val_assess_cmd, num_test_steps, descriptions)
+    if problems:
+        logger.error("JSON is invalid.")
+        for problem in problems:
+            logger.error("  %s", problem)
+        return False
+    logger.info("JSON is valid.")
+    return True
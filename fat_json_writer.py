@@ -0,0 +1,242 @@
+import gzip
+import json
+
+import numpy as np
+
+from state_codes import STATE_VALUES, decode_states
+
+UNDEFINED = "Undefined"
+
+
+def FAT_header(version: float, test_name: str, dut_name: str, group_types: dict) -> dict:
+    """Returns the StationScout test case document without test steps."""
+    return {
+        "version": str(version),
+        "testCases": [
+            {
+                "name": test_name,
+                "parent": dut_name,
+                "autoSetControlValues": True,
+                "autoAssess": True,
+                "assessmentLockoutTime": 1.5,
+                "autoAssessTimeout": 1.5,
+                "switchOperationTime": 1.5,
+                "signalGroups": [
+                    {"groupType": group_type, "signalRefs": signals}
+                    for group_type, signals in group_types.items()
+                ],
+                "testSteps": []
+            }
+        ]
+    }
+
+
+def signal_layout(group_types: dict, test_type: int, num_rows: int) -> list:
+    """
+    Lists the entries of the 'expected' array of every test step as (signalRef, field, row) tuples,
+    where row is the row of val_assess_cmd holding the value, or None if there is no such row.
+
+    CONTROL signals take the first rows, ASSESS signals the row after them and, for DPC tests only,
+    COMMAND signals the row after that as 'commandResult'.
+    """
+    controls = group_types.get("CONTROL", [])
+    assess_row = len(controls)
+    layout = [(signal, "value", idx if idx < num_rows else None) for idx, signal in enumerate(controls)]
+    layout += [(signal, "value", assess_row if assess_row < num_rows else None)
+               for signal in group_types.get("ASSESS", [])]
+    if test_type == 2:
+        layout += [(signal, "commandResult", assess_row + 1 if assess_row + 1 < num_rows else None)
+                   for signal in group_types.get("COMMAND", [])]
+    return layout
+
+
+def step_ordered(step: int, test_type: int) -> bool:
+    """The initial step of a DPC test sets all values at once. Every other step is ordered."""
+    return not (test_type == 2 and step == 0)
+
+
+def is_state_codes(val_assess_cmd: np.ndarray) -> bool:
+    """True if val_assess_cmd holds int8 state codes (see state_codes) instead of the values themselves."""
+    return np.issubdtype(val_assess_cmd.dtype, np.integer)
+
+
+def step_description(descriptions, step: int) -> str:
+    """Description of a step, '' for steps without one."""
+    return descriptions[step] if descriptions is not None and step < len(descriptions) else ""
+
+
+def entry_order(layout_size: int, order) -> list:
+    """Positions of the layout entries for a step: `order` for the first entries, the rest unchanged."""
+    return list(order) + list(range(len(order), layout_size))
+
+
+def iter_test_steps(layout: list, val_assess_cmd: np.ndarray, num_test_steps: int, test_type: int,
+                    descriptions=None, entry_orders=None):
+    """Yields the test step dicts of the StationScout JSON one at a time."""
+    if is_state_codes(val_assess_cmd):
+        val_assess_cmd = decode_states(val_assess_cmd)
+    num_columns = val_assess_cmd.shape[1]
+    for step in range(num_test_steps):
+        order = (entry_orders or {}).get(step)
+        step_layout = layout if order is None else [layout[i] for i in entry_order(len(layout), order)]
+        yield {
+            "description": step_description(descriptions, step),
+            "ordered": step_ordered(step, test_type),
+            "expected": [
+                {"signalRef": signal, field: val_assess_cmd[row, step]
+                 if row is not None and step < num_columns else UNDEFINED}
+                for signal, field, row in step_layout
+            ]
+        }
+
+
+class _Formatter:
+    """Builds JSON text at a fixed nesting level, matching json.dumps with the same indent/separators."""
+
+    def __init__(self, indent):
+        self.indent = indent
+        self.key_sep = ": " if indent is not None else ":"
+        self._values = {}
+
+    def newline(self, level: int) -> str:
+        return "" if self.indent is None else "\n" + " " * (self.indent * level)
+
+    def value(self, value) -> str:
+        if isinstance(value, np.generic):
+            value = value.item()
+        key = (type(value), value)
+        text = self._values.get(key)
+        if text is None:
+            text = json.dumps(value)
+            self._values[key] = text
+        return text
+
+
+def _step_fragments(layout: list, formatter: _Formatter) -> list:
+    """Precomputes the constant JSON text around the value of every 'expected' entry."""
+    fragments = []
+    for signal, field, row in layout:
+        prefix = ("{" + formatter.newline(7) + '"signalRef"' + formatter.key_sep + json.dumps(signal) + ","
+                  + formatter.newline(7) + json.dumps(field) + formatter.key_sep)
+        fragments.append((prefix, formatter.newline(6) + "}", row))
+    return fragments
+
+
+def iter_test_step_json(layout: list, val_assess_cmd: np.ndarray, num_test_steps: int, test_type: int,
+                        indent=2, descriptions=None, entry_orders=None):
+    """
+    Yields the JSON text of every test step. The per-step work is value lookups and string joins.
+    State codes are decoded here: the JSON text of every code is built once and indexed by the code.
+    Steps in entry_orders ({step: positions of the first layout entries}) list their entries in that order.
+    """
+    formatter = _Formatter(indent)
+    fragments = _step_fragments(layout, formatter)
+    reordered = {}  # The fragments of every distinct entry order, built once
+    undefined = formatter.value(UNDEFINED)
+    entry_sep = "," + formatter.newline(6)
+    description_start = "{" + formatter.newline(5) + '"description"' + formatter.key_sep
+    step_start = {
+        ordered: "," + formatter.newline(5) + '"ordered"' + formatter.key_sep + ("true" if ordered else "false") + ","
+                 + formatter.newline(5) + '"expected"' + formatter.key_sep + "["
+        for ordered in (True, False)
+    }
+    expected_start = formatter.newline(6) if fragments else ""
+    step_end = (formatter.newline(5) if fragments else "") + "]" + formatter.newline(4) + "}"
+    num_columns = val_assess_cmd.shape[1]
+    if is_state_codes(val_assess_cmd):
+        encode = [formatter.value(value) for value in STATE_VALUES].__getitem__
+    else:
+        encode = formatter.value
+    encode_text = formatter.value  # Descriptions repeat, their JSON text is cached
+    for step in range(num_test_steps):
+        column = val_assess_cmd[:, step] if step < num_columns else None
+        order = entry_orders.get(step) if entry_orders else None
+        if order is None:
+            step_fragments = fragments
+        else:
+            order = tuple(order)
+            if order not in reordered:
+                reordered[order] = [fragments[i] for i in entry_order(len(fragments), order)]
+            step_fragments = reordered[order]
+        entries = entry_sep.join(
+            prefix + (encode(column[row]) if row is not None and column is not None else undefined) + suffix
+            for prefix, suffix, row in step_fragments
+        )
+        yield (description_start + encode_text(step_description(descriptions, step))
+               + step_start[step_ordered(step, test_type)] + expected_start + entries + step_end)
+
+
+def write_FAT_json(file_path: str, header: dict, layout: list, val_assess_cmd: np.ndarray, num_test_steps: int,
+                   test_type: int, compact: bool = False, use_gzip: bool = False, descriptions=None,
+                   entry_orders=None) -> str:
+    """
+    Streams the StationScout JSON to disk, writing the test steps one at a time instead of building
+    the whole document in memory. With compact=False the output matches json.dump(..., indent=2).
+
+    Parameters:
+        file_path (str): Output path. '.gz' is appended when use_gzip is set and missing.
+        header (dict): Document from FAT_header, with an empty 'testSteps' list.
+        layout (list): Entries of every step from signal_layout.
+        val_assess_cmd (np.ndarray): CONTROL, ASSESS and COMMAND values, or their state codes, by step.
+        num_test_steps (int): Number of steps to write.
+        test_type (int): 1 for SPC, 2 for DPC.
+        compact (bool): Write without indentation or spaces after separators.
+        use_gzip (bool): Gzip-compress the output.
+        descriptions: Description of every step, e.g. from transition_descriptions. Empty if None.
+        entry_orders (dict): {step: positions of the first layout entries in the order to write them},
+            e.g. the CONTROL entries from step_ordering.switch_entry_orders. Other steps keep the layout order.
+
+    Returns:
+        str: The path written.
+    """
+    indent = None if compact else 2
+    separators = (",", ":") if compact else None
+    head, tail = json.dumps(header, indent=indent, separators=separators).split(
+        '"testSteps"' + (":" if compact else ": ") + "[]", 1)
+    newline = _Formatter(indent).newline
+
+    if use_gzip and not file_path.endswith(".gz"):
+        file_path += ".gz"
+    opener = gzip.open if use_gzip else open
+    with opener(file_path, "wt", encoding="utf-8") as file:
+        file.write(head + '"testSteps"' + (":" if compact else ": ") + "[")
+        first = True
+        for step_json in iter_test_step_json(layout, val_assess_cmd, num_test_steps, test_type, indent,
+                                             descriptions, entry_orders):
+            file.write(("" if first else ",") + newline(4) + step_json)
+            first = False
+        file.write(("]" if first else newline(3) + "]") + tail)
+    return file_path
+
+
+def write_test_cases_json(file_path: str, version: float, test_cases, compact: bool = False,
+                          use_gzip: bool = False) -> str:
+    """
+    Writes one StationScout document holding several test cases, e.g. one per POU. The test cases are
+    taken one at a time from the `test_cases` iterable, so only one of them is in memory at once.
+    With compact=False the output matches json.dump(..., indent=2) of the whole document.
+
+    Returns:
+        str: The path written.
+    """
+    indent = None if compact else 2
+    separators = (",", ":") if compact else None
+    key_sep = ":" if compact else ": "
+    head, tail = json.dumps({"version": str(version), "testCases": []}, indent=indent,
+                            separators=separators).split('"testCases"' + key_sep + "[]", 1)
+    newline = _Formatter(indent).newline
+
+    if use_gzip and not file_path.endswith(".gz"):
+        file_path += ".gz"
+    opener = gzip.open if use_gzip else open
+    with opener(file_path, "wt", encoding="utf-8") as file:
+        file.write(head + '"testCases"' + key_sep + "[")
+        first = True
+        for test_case in test_cases:
+            text = json.dumps(test_case, indent=indent, separators=separators)
+            if indent is not None:
+                text = text.replace("\n", newline(2))
+            file.write(("" if first else ",") + newline(2) + text)
+            first = False
+        file.write(("]" if first else newline(1) + "]") + tail)
+    return file_path
@@ -0,0 +1,361 @@
+"""
+Headless command line entry point: runs the whole test case generation from a job manifest,
+without any Tk dialog (tkinter is never imported).
+
+Usage:
+    python generate_cli.py jobs.yaml [--timings]
+    python generate_cli.py --plcopen project.xml --scd station.scd --output out/project [--workers 4]
+
+The manifest is JSON or YAML (YAML needs PyYAML). It holds one job, or a 'jobs' list whose entries
+are merged over an optional 'defaults' mapping. Paths are relative to the manifest folder.
+
+    defaults:
+      workbook: Example_test1.6.xlsx
+      scd: 20240610_NUCBX1.scd
+    jobs:
+      - logic: Input1 and not (Input2 or Input3)
+        test_type: DPC            # 1/SPC (true/false) or 2/DPC (OPEN/CLOSED)
+        output: out/QA1_interlock # JSON file without extension, also the test case name
+        generation_mode: full     # full (every combination), mcdc or bdd
+        num_inputs: 3             # optional, defaults to the highest InputN of the logic
+        step_ordering: auto       # auto, gray, nearest or none; default auto, none for a Test Steps sheet
+        compact: false
+        gzip: false
+        write_test_steps: false   # also write the steps to the workbook's 'Test Steps' sheet
+        test_steps_layout: auto   # auto, columns (one column per step) or rows (one row per step)
+        scd_cache: true           # reuse the cached SCD index of an unchanged SCD
+
+A job without 'logic' reads its test steps from the workbook's 'Test Steps' sheet.
+
+With --plcopen, every output of every POU of a PLCopen XML file becomes a test case. The signal list is
+taken from the 61850 addresses documented on the POU variables instead of a workbook. The POUs are
+generated in parallel in a process pool and collected into one document (out/project.json) with one
+'testCases' entry per POU output. The JSON and the log of each POU are kept in out/project_pous/, and a
+failing POU is reported without stopping the others.
+"""
+import time
+
+_start = time.perf_counter()
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import logging
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import stage_timing
+import Truth_Table_1_9
+from fat_json_schema import check_test_case, validate_document
+from fat_json_writer import write_test_cases_json
+from generator_log import LOG_LEVELS, configure_logging, logger
+from logic_expr import parse_logic, rename_variables, to_text, variables
+
+JOB_KEYS = {"workbook", "scd", "logic", "num_inputs", "test_type", "output", "generation_mode",
+            "step_ordering", "compact", "gzip", "write_test_steps", "test_steps_layout", "scd_cache"}
+TEST_TYPES = {"1": 1, "SPC": 1, "2": 2, "DPC": 2}
+
+_generator = None
+
+
+def load_generator():
+    """Imports Generate_Test_Case_Ver_8.03.py, whose file name is not a valid module name."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Generate_Test_Case_Ver_8.03.py")
+    spec = importlib.util.spec_from_file_location("Generate_Test_Case", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_generator():
+    """Loads the generator once per process, so pool workers import it only for their first POU."""
+    global _generator
+    if _generator is None:
+        _generator = load_generator()
+    return _generator
+
+
+def load_manifest(manifest_file: str) -> list:
+    """
+    Reads a JSON or YAML job manifest.
+
+    Returns:
+        list: One dict per job with the defaults applied and paths made absolute.
+    """
+    with open(manifest_file, "r", encoding="utf-8") as f:
+        text = f.read()
+    if manifest_file.lower().endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML manifests need PyYAML (pip install pyyaml). Use a .json manifest instead.")
+        manifest = yaml.safe_load(text)
+    else:
+        manifest = json.loads(text)
+    if not isinstance(manifest, dict):
+        raise ValueError(f"{manifest_file}: the manifest must be a mapping with job keys or a 'jobs' list.")
+
+    defaults = manifest.get("defaults", {})
+    entries = manifest["jobs"] if "jobs" in manifest else [{k: v for k, v in manifest.items() if k != "defaults"}]
+    base_dir = os.path.dirname(os.path.abspath(manifest_file))
+    jobs = []
+    for number, entry in enumerate(entries, start=1):
+        job = {**defaults, **entry}
+        unknown = set(job) - JOB_KEYS
+        if unknown:
+            raise ValueError(f"Job {number}: unknown keys {sorted(unknown)}. Expected keys from: {sorted(JOB_KEYS)}")
+        for key in ("workbook", "scd", "output"):
+            if key not in job:
+                raise ValueError(f"Job {number}: '{key}' is required.")
+            job[key] = os.path.join(base_dir, job[key])
+        jobs.append(job)
+    return jobs
+
+
+def parse_test_type(value) -> int:
+    test_type = TEST_TYPES.get(str(value).upper())
+    if test_type is None:
+        raise ValueError(f"Invalid test_type {value!r}. Use 1/SPC (true/false) or 2/DPC (OPEN/CLOSED).")
+    return test_type
+
+
+def infer_num_inputs(logic: str) -> int:
+    """Highest N of the InputN variables used by the logic."""
+    numbers = [int(m.group(1)) for name in variables(parse_logic(logic))
+               for m in [re.fullmatch(r"Input(\d+)", name)] if m]
+    if not numbers:
+        raise ValueError(f"Cannot infer num_inputs from logic {logic!r}: it uses no InputN variables.")
+    return max(numbers)
+
+
+def run_job(generator, job: dict) -> str:
+    """Runs one manifest job through the pipeline and returns the path of the JSON written."""
+    test_type = parse_test_type(job["test_type"]) if "test_type" in job else None
+    truth_table_df = None
+    if job.get("logic"):
+        if test_type is None:
+            raise ValueError("'test_type' is required when 'logic' is given.")
+        num_inputs = int(job.get("num_inputs") or infer_num_inputs(job["logic"]))
+        truth_table_df = Truth_Table_1_9.build_truth_table(
+            job["logic"], num_inputs, job.get("generation_mode", "full"))
+        truth_table_df = Truth_Table_1_9.to_test_values(truth_table_df, test_type)
+        stage_timing.lap("truth table")
+        if job.get("write_test_steps"):
+            Truth_Table_1_9.write_test_steps_sheet(
+                truth_table_df, job["workbook"], job.get("test_steps_layout", "auto"))
+            stage_timing.lap("Test Steps sheet")
+    elif test_type is None:
+        raise ValueError("'test_type' is required: test_type.json is not read in headless runs.")
+
+    output_dir = os.path.dirname(job["output"])
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    return generator.generate_test_case(
+        test_sequence_file=job["workbook"],
+        scd_file=job["scd"],
+        json_output_file=job["output"],
+        truth_table_df=truth_table_df,
+        test_type=test_type,
+        step_ordering=job.get("step_ordering"),
+        compact=bool(job.get("compact", generator.JSON_COMPACT)),
+        use_gzip=bool(job.get("gzip", generator.JSON_GZIP)),
+        scd_cache=bool(job.get("scd_cache", generator.SCD_CACHE)),
+    )
+
+
+def run_pou_job(definition: dict, scd_file: str, pou_dir: str, test_type: int, generation_mode: str = "full",
+                step_ordering: str = None, log_level: str = None) -> dict:
+    """
+    Generates the test case of one POU output. Runs in a pool worker: everything the POU logs goes to
+    its own log file and any error is returned in the result instead of being raised.
+    log_level is set in the worker, which does not inherit the level of the parent under spawn.
+
+    Returns:
+        dict: Test case name, JSON path (None on failure), error text, seconds and stage timings.
+    """
+    name = f"{definition['pou']}_{definition['output']}"
+    result = {"name": name, "json_file": None, "error": None, "log": os.path.join(pou_dir, name + ".log")}
+    stage_timing.reset()
+    if log_level:
+        configure_logging(log_level)
+    with open(result["log"], "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        try:
+            if definition.get("error"):
+                raise ValueError(definition["error"])
+            generator = get_generator()
+            missing = [variable for variable, address in zip(definition["inputs"], definition["control_addresses"])
+                       if not address]
+            if missing or not definition["assess_address"]:
+                raise ValueError(f"No 61850 address documented for: {missing or [definition['output']]}")
+            names = Truth_Table_1_9.input_names(len(definition["inputs"]))
+            mapping = dict(zip(definition["inputs"], names))
+            if definition.get("ir") is not None:  # Shared IR: never expanded into text
+                logic = rename_variables(definition["ir"], mapping, normalized=False)
+                logger.info("%s: %s", name, definition['logic'])
+            else:
+                logic = to_text(rename_variables(parse_logic(definition["logic"]), mapping))
+                logger.info("%s: %s -> %s", name, definition['logic'], logic)
+            truth_table_df = Truth_Table_1_9.build_truth_table(logic, len(names), generation_mode)
+            truth_table_df = Truth_Table_1_9.to_test_values(truth_table_df, test_type)
+            stage_timing.lap("truth table")
+
+            command = generator.command_address(definition["assess_address"]) if test_type == 2 else None
+            signal_addresses = generator.signal_addresses_from_lists(
+                definition["control_addresses"], [definition["assess_address"]], [command] if command else [])
+            result["json_file"] = generator.generate_test_case(
+                test_sequence_file=None,
+                scd_file=scd_file,
+                json_output_file=os.path.join(pou_dir, name),
+                truth_table_df=truth_table_df,
+                test_type=test_type,
+                step_ordering=step_ordering,
+                signal_addresses=signal_addresses,
+            )
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            logger.error("Failed: %s", result['error'])
+    result["stages"] = stage_timing.stages()
+    result["seconds"] = stage_timing.total()
+    return result
+
+
+def run_plcopen(plcopen_file: str, scd_file: str, output: str, test_type: int, generation_mode: str = "full",
+                workers: int = None, compact: bool = False, use_gzip: bool = False, timings: bool = False,
+                log_level: str = None) -> int:
+    """
+    Generates a test case for every POU output of a PLCopen file in a process pool and writes them
+    into one document.
+
+    Returns:
+        int: Number of POU outputs that failed.
+    """
+    import iec61131_3_v1_00
+
+    stages = []
+    lap_start = time.perf_counter()
+
+    def lap(name):
+        nonlocal lap_start
+        now = time.perf_counter()
+        stages.append((name, now - lap_start))
+        lap_start = now
+
+    definitions = iec61131_3_v1_00.pou_test_definitions(plcopen_file)
+    logger.info("%d POU outputs found in %s", len(definitions), plcopen_file)
+    pou_dir = output + "_pous"
+    os.makedirs(pou_dir, exist_ok=True)
+    lap("PLCopen parse")
+
+    results = []
+    jobs = [(definition, scd_file, pou_dir, test_type, generation_mode, None, log_level) for definition in definitions]
+    if workers == 1:
+        results = [run_pou_job(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_pou_job, *job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                definition = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:  # The worker process itself died
+                    results.append({"name": f"{definition['pou']}_{definition['output']}", "json_file": None,
+                                    "error": f"{type(e).__name__}: {e}", "seconds": 0.0, "stages": [], "log": None})
+    lap("POU generation")
+
+    order = {f"{definition['pou']}_{definition['output']}": i for i, definition in enumerate(definitions)}
+    results.sort(key=lambda result: order[result["name"]])
+    succeeded = [result for result in results if result["json_file"]]
+
+    invalid = []
+
+    def test_cases():
+        # Each test case is checked as it passes through, instead of re-reading the combined document
+        for result in succeeded:
+            with open(result["json_file"], "r", encoding="utf-8") as f:
+                for test_case in json.load(f)["testCases"]:
+                    problems = check_test_case(test_case, result["name"])
+                    if problems and not validate_document({"version": "1.2", "testCases": [test_case]}):
+                        invalid.append(result["name"])
+                    yield test_case
+
+    json_file = write_test_cases_json(output + ".json", 1.2, test_cases(), compact=compact, use_gzip=use_gzip)
+    if invalid:
+        logger.error("JSON is invalid for: %s", ", ".join(invalid))
+    else:
+        logger.info("JSON is valid.")
+    lap("document write")
+
+    logger.info("\n%-40s %8s  result", "POU output", "seconds")
+    for result in results:
+        # Failures are always reported, also in quiet mode
+        logger.log(logging.ERROR if result["error"] else logging.INFO, "%-40s %8.2f  %s",
+                   result["name"], result["seconds"], result["error"] or "ok")
+        if timings:
+            for stage, seconds in result["stages"]:
+                print(f"    {stage:<20} {seconds * 1000:10.1f} ms")
+    logger.info("\n%d/%d POU outputs written to %s", len(succeeded), len(results), json_file)
+    if timings:
+        for stage, seconds in stages:
+            print(f"  {stage:<20} {seconds * 1000:10.1f} ms")
+    return len(results) - len(succeeded)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate StationScout test cases from a job manifest, without GUI.")
+    parser.add_argument("manifest", nargs="?", help="JSON or YAML job manifest.")
+    parser.add_argument("--timings", action="store_true", help="Print startup and per-stage wall-clock times.")
+    parser.add_argument("--plcopen", help="PLCopen XML file: generate a test case for every POU output.")
+    parser.add_argument("--scd", help="SCD file for --plcopen.")
+    parser.add_argument("--output", help="Output document for --plcopen, without extension.")
+    parser.add_argument("--test-type", default="DPC", help="Test type for --plcopen: 1/SPC or 2/DPC (default).")
+    parser.add_argument("--generation-mode", default="full", choices=["full", "mcdc", "bdd"])
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--compact", action="store_true")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--log-level", choices=list(LOG_LEVELS), default=None,
+                        help="debug, info (default, or $TEST_CASE_LOG_LEVEL), quiet (warnings and errors only).")
+    parser.add_argument("--quiet", action="store_const", const="quiet", dest="log_level",
+                        help="Same as --log-level quiet: no per-step or per-signal output is formatted.")
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level)
+
+    if args.plcopen:
+        if not args.scd or not args.output:
+            parser.error("--plcopen needs --scd and --output.")
+        if args.timings:
+            print(f"Startup (imports): {(time.perf_counter() - _start) * 1000:.1f} ms")
+        failures = run_plcopen(args.plcopen, args.scd, args.output, parse_test_type(args.test_type),
+                               args.generation_mode, args.workers, args.compact, args.gzip, args.timings,
+                               args.log_level)
+        return 1 if failures else 0
+    if not args.manifest:
+        parser.error("Give a job manifest or --plcopen.")
+
+    generator = get_generator()
+    startup = time.perf_counter() - _start
+    jobs = load_manifest(args.manifest)
+    if args.timings:
+        print(f"Startup (imports): {startup * 1000:.1f} ms")
+
+    failures = 0
+    for number, job in enumerate(jobs, start=1):
+        logger.info("\n=== Job %d/%d: %s ===", number, len(jobs), job['output'])
+        stage_timing.reset()
+        try:
+            json_file = run_job(generator, job)
+            logger.info("Job %d done: %s", number, json_file)
+        except Exception as e:
+            failures += 1
+            logger.error("Job %d failed: %s", number, e)
+        if args.timings:
+            stage_timing.print_stages(f"Job {number} stage timings")
+
+    logger.info("\n%d/%d jobs succeeded.", len(jobs) - failures, len(jobs))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
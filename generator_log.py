@@ -0,0 +1,68 @@
+import logging
+import os
+import sys
+
+LOGGER_NAME = "test_case_generator"
+# Environment variable with the default level, e.g. TEST_CASE_LOG_LEVEL=quiet for production runs
+LOG_LEVEL_ENV = "TEST_CASE_LOG_LEVEL"
+# 'quiet' only shows warnings and errors: no O(n) structure (addresses, arrays, tables) is formatted
+LOG_LEVELS = {"debug": logging.DEBUG, "info": logging.INFO, "quiet": logging.WARNING,
+              "warning": logging.WARNING, "error": logging.ERROR}
+
+# The single logger of the generator. Messages use %-style arguments, so they are only formatted
+# when their level is enabled; DEBUG holds the full arrays, DataFrames and address lists.
+logger = logging.getLogger(LOGGER_NAME)
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """
+    Writes to sys.stdout as it is when a record is emitted, not when the handler is created, so
+    contextlib.redirect_stdout (the per POU logs of generate_cli) captures the log like it did the prints.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def configure_logging(level=None) -> logging.Logger:
+    """
+    Sets the level of the generator logger and attaches its stdout handler once.
+
+    Parameters:
+        level: A name of LOG_LEVELS, a logging level number, or None for $TEST_CASE_LOG_LEVEL (default 'info').
+
+    Returns:
+        logging.Logger: The generator logger.
+
+    Raises:
+        ValueError: If the level name is unknown.
+    """
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV) or "info"
+    if isinstance(level, str):
+        if level.lower() not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level '{level}', expected one of {', '.join(LOG_LEVELS)}.")
+        level = LOG_LEVELS[level.lower()]
+    if not any(isinstance(handler, _StdoutHandler) for handler in logger.handlers):
+        handler = _StdoutHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+    return logger
+
+
+def is_quiet() -> bool:
+    """True if INFO messages are off, e.g. to disable progress bars."""
+    return not logger.isEnabledFor(logging.INFO)
+
+
+configure_logging()
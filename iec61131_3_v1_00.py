@@ -1,255 +1,516 @@
-import os
-import xml.etree.ElementTree as ET
-import tkinter as tk
-from tkinter import filedialog
-from tkinter import Toplevel
-import matplotlib.pyplot as plt
-from PIL import ImageTk, Image
-import pandas as pd
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from io import BytesIO
-from datetime import datetime
-import matplotlib.patches as patches
-import re
-
-DEBUG = True  # Set to False to disable debug prints
-
-# ---------------- Helper: Remove XML namespaces ----------------
-def strip_namespace(tree):
-    for elem in tree.iter():
-        if '}' in elem.tag:
-            elem.tag = elem.tag.split('}', 1)[1]
-    return tree
-
-# ---------------- Generate Function Block Diagram ----------------
-def generate_matplotlib_diagram(pou_name, blocks, in_vars, out_vars, block_inputs, out_connections, save_path=None):
-    fig, ax = plt.subplots(figsize=(10, 8))
-    ax.set_xlim(0, 12)
-    ax.set_ylim(0, 10)
-    ax.set_aspect('equal')
-    ax.axis('off')
-
-    node_positions = {}
-    y_offset = 8
-
-    block_spacing = 2
-    for block_id, type_name, _, _ in blocks:
-        ax.add_patch(patches.Rectangle((3, y_offset), 3, 1, linewidth=1, edgecolor='black', facecolor='lightblue'))
-        ax.text(4.5, y_offset + 0.5, type_name, ha='center', va='center', fontsize=10)
-        node_positions[block_id] = (4.5, y_offset + 0.5)
-        y_offset -= block_spacing
-
-    y_offset = 8
-    input_spacing = 1.5
-    for var_id, expr, _, _ in in_vars:
-        ax.add_patch(patches.Ellipse((1, y_offset), 2, 1, linewidth=1, edgecolor='black', facecolor='lightgreen'))
-        ax.text(1, y_offset, expr, ha='center', va='center', fontsize=10)
-        node_positions[var_id] = (1, y_offset)
-        y_offset -= input_spacing
-
-    y_offset = 8
-    for var_id, expr, _, _ in out_vars:
-        ax.add_patch(patches.Ellipse((11, y_offset), 2, 1, linewidth=1, edgecolor='black', facecolor='lightcoral'))
-        ax.text(11, y_offset, expr, ha='center', va='center', fontsize=10)
-        node_positions[var_id] = (11, y_offset)
-        y_offset -= input_spacing
-
-    for block_id, inputs in block_inputs.items():
-        for ref_id, neg in inputs:
-            x_start, y_start = node_positions[ref_id]
-            x_end, y_end = node_positions[block_id]
-            ax.annotate('', xy=(x_end, y_end), xytext=(x_start, y_start),
-                        arrowprops=dict(arrowstyle="->", lw=1, color='black'))
-
-    for out_id, ref_id in out_connections.items():
-        x_start, y_start = node_positions[ref_id]
-        x_end, y_end = node_positions[out_id]
-        ax.annotate('', xy=(x_end, y_end), xytext=(x_start, y_start),
-                    arrowprops=dict(arrowstyle="->", lw=1, color='black'))
-
-    ax.text(12, y_offset + 0.5, 'Output', ha='center', va='center', fontsize=10)
-
-    if save_path:
-        plt.savefig(save_path, format='png', bbox_inches='tight', dpi=300)
-        plt.close(fig)
-
-# ---------------- Boolean Expression Builder ----------------
-def build_expression(node_id, in_vars_dict, blocks_dict, block_inputs):
-    if node_id in in_vars_dict:
-        return in_vars_dict[node_id]
-    if node_id in blocks_dict:
-        block_type = blocks_dict[node_id].upper()
-        inputs = block_inputs.get(node_id, [])
-        input_exprs = []
-        for ref_id, is_neg in inputs:
-            sub_expr = build_expression(ref_id, in_vars_dict, blocks_dict, block_inputs)
-            if is_neg:
-                sub_expr = f"not ({sub_expr})"
-            input_exprs.append(sub_expr)
-        if block_type == "AND":
-            return "(" + " and ".join(input_exprs) + ")"
-        elif block_type == "OR":
-            return "(" + " or ".join(input_exprs) + ")"
-        elif block_type == "XOR":
-            return "(" + " ^ ".join(input_exprs) + ")"
-        else:
-            return f"{block_type}(" + ", ".join(input_exprs) + ")"
-    if DEBUG:
-        print(f"[DEBUG] Unknown reference: {node_id} (not in inputs or blocks)")
-    return f"UNKNOWN({node_id})"
-
-# ---------------- Main POU Parser ----------------
-def parse_pou(pou):
-    blocks, in_vars, out_vars = [], [], []
-    in_vars_dict, out_vars_dict, blocks_dict, block_inputs, out_connections = {}, {}, {}, {}, {}
-
-    for block in pou.findall(".//block"):
-        block_id = block.attrib['localId']
-        type_name = block.attrib['typeName']
-        blocks.append((block_id, type_name, 0, 0))
-        blocks_dict[block_id] = type_name
-        inputs = []
-        for input_var in block.findall(".//inputVariables/variable"):
-            conn = input_var.find("connectionPointIn/connection")
-            if conn is not None:
-                ref_id = conn.attrib['refLocalId']
-                is_neg = input_var.attrib.get("negated", "false") == "true"
-                inputs.append((ref_id, is_neg))
-        block_inputs[block_id] = inputs
-
-    for var in pou.findall(".//inVariable"):
-        var_id = var.attrib['localId']
-        expr = var.find("expression").text
-        in_vars.append((var_id, expr, 0, 0))
-        in_vars_dict[var_id] = expr
-
-    for var in pou.findall(".//outVariable"):
-        var_id = var.attrib['localId']
-        expr = var.find("expression").text
-        out_vars.append((var_id, expr, 0, 0))
-        out_vars_dict[var_id] = expr
-        conn = var.find("connectionPointIn/connection")
-        if conn is not None:
-            ref_id = conn.attrib['refLocalId']
-            out_connections[var_id] = ref_id
-
-    return blocks, in_vars, out_vars, block_inputs, out_connections, in_vars_dict, out_vars_dict, blocks_dict
-
-# ---------------- Function to Extract 61850 Address ----------------
-def extract_61850_address(variable_elem):
-    try:
-        documentation = variable_elem.find('.//documentation')
-        if documentation is not None:
-            xhtml_elem = documentation.find('.//xhtml')
-            if xhtml_elem is not None and xhtml_elem.text:
-                address = xhtml_elem.text.strip()
-                if '/' in address or '.' in address:
-                    return address
-    except Exception as e:
-        if DEBUG:
-            print(f"[DEBUG] Error extracting address for variable {variable_elem.attrib.get('name', 'UNKNOWN')}: {e}")
-    return ""
-
-# ---------------- Main Script ----------------
-def main():
-    root = tk.Tk()
-    root.withdraw()
-    file_path = filedialog.askopenfilename(title="Select PLCOpen XML File", filetypes=[("XML files", "*.xml")])
-    if not file_path:
-        print("No file selected.")
-        return
-
-    tree = ET.parse(file_path)
-    tree = strip_namespace(tree)
-    root_elem = tree.getroot()
-    pous = root_elem.findall(".//pou")
-    project_name = os.path.splitext(os.path.basename(file_path))[0]
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    folder_name = f"{project_name}_Export_{len(pous)}POUs_{timestamp}"
-    export_folder = os.path.join(os.getcwd(), folder_name)
-    os.makedirs(export_folder, exist_ok=True)
-
-    pdf_path = os.path.join(export_folder, f"{project_name}_FBD_Documentation.pdf")
-    doc = SimpleDocTemplate(pdf_path, pagesize=A4)
-    styles = getSampleStyleSheet()
-    story = [Paragraph("<b>Table of Contents</b>", styles['Heading1'])]
-
-    for i, pou in enumerate(pous, start=1):
-        pou_name = pou.attrib['name']
-        story.append(Paragraph(f"{i}. {pou_name}", styles['Normal']))
-    story.append(PageBreak())
-
-    for pou in pous:
-        pou_name = pou.attrib['name']
-        if DEBUG:
-            print(f"[DEBUG] Processing POU: {pou_name}")
-        story.append(Paragraph(f"<b>POU: {pou_name}</b>", styles['Heading2']))
-        blocks, in_vars, out_vars, block_inputs, out_connections, in_vars_dict, out_vars_dict, blocks_dict = parse_pou(pou)
-
-        png_path = os.path.join(export_folder, f"{pou_name}_diagram.png")
-        generate_matplotlib_diagram(pou_name, blocks, in_vars, out_vars, block_inputs, out_connections, save_path=png_path)
-
-        if DEBUG:
-            print(f"POU: {pou_name} Boolean Expressions:")
-        boolean_expressions = []
-        for out_id, src_block in out_connections.items():
-            if DEBUG:
-                print(f"[DEBUG] Building expression for output '{out_vars_dict.get(out_id, 'UNKNOWN')}' from block {src_block}")
-            expr = build_expression(src_block, in_vars_dict, blocks_dict, block_inputs)
-            boolean_expressions.append(expr)
-            if DEBUG:
-                print(f"{out_vars_dict[out_id]} = {expr}")
-
-        img_buf = BytesIO()
-        generate_matplotlib_diagram(pou_name, blocks, in_vars, out_vars, block_inputs, out_connections, save_path=img_buf)
-        img_buf.seek(0)
-        story.append(Image(img_buf, width=6.5 * inch, height=4.5 * inch))
-        story.append(Spacer(1, 0.2 * inch))
-
-        in_vars_elements = [variable_elem for variable_elem in pou.findall(".//interface//inputVars//variable")]
-        out_vars_elements = [variable_elem for variable_elem in pou.findall(".//interface//outputVars//variable")]
-
-        control_vars = [v.attrib['name'] for v in in_vars_elements]
-        assess_vars = [v.attrib['name'] for v in out_vars_elements]
-        control_addresses = [extract_61850_address(variable_elem) for variable_elem in in_vars_elements]
-        assess_addresses = [extract_61850_address(variable_elem) for variable_elem in out_vars_elements]
-
-        # Ensure equal lengths for all columns
-        max_len = max(len(control_vars), len(assess_vars), len(boolean_expressions))
-        control_vars += [''] * (max_len - len(control_vars))
-        assess_vars += [''] * (max_len - len(assess_vars))
-        boolean_expressions += [''] * (max_len - len(boolean_expressions))
-        control_addresses += [''] * (max_len - len(control_addresses))
-        assess_addresses += [''] * (max_len - len(assess_addresses))
-
-        df = pd.DataFrame({
-            "CONTROL": control_vars,
-            "ASSESS": assess_vars,
-            "LOGIC": boolean_expressions,
-            "CONTROL_ADDRESS": control_addresses,
-            "ASSESS_ADDRESS": assess_addresses
-        })
-
-        excel_path = os.path.join(export_folder, f"{pou_name}_IO_List.xlsx")
-        df.to_excel(excel_path, index=False)
-
-        story.append(Paragraph("<b>I/O Table:</b>", styles['Heading3']))
-        data = [["CONTROL", "ASSESS", "LOGIC", "CONTROL_ADDRESS", "ASSESS_ADDRESS"]] + df.values.tolist()
-        table = Table(data, colWidths=[2.5 * inch, 2.5 * inch, 2.5 * inch, 2.5 * inch, 2.5 * inch])
-        table.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-                                   ('GRID', (0, 0), (-1, -1), 0.5, colors.black)]))
-        story.append(table)
-        story.append(PageBreak())
-
-    doc.build(story)
-
-    print(f"\nPDF saved to: {pdf_path}")
-    print(f"Export folder: {export_folder}")
-    print("Use the files generated here as a reference for filling in the information needed in the next prompts.")
-
-if __name__ == "__main__":
-    main()
+import functools
+import os
+import xml.etree.ElementTree as ET
+import pandas as pd
+from io import BytesIO
+from datetime import datetime
+import re
+from collections import Counter
+from generator_log import logger
+from logic_bdd import build_bdd
+from logic_expr import parse_logic
+from scd_index import HAVE_LXML, local_name
+
+if HAVE_LXML:
+    from lxml import etree
+
+# Debug traces go to logger.debug: run with TEST_CASE_LOG_LEVEL=debug to see them (see generator_log)
+# Write the LOGIC column of the I/O lists with a binding ('_B<localId> := ...;') for every block whose
+# output feeds several inputs, so the text grows linearly with the network. False writes the expanded
+# expression, which repeats a shared block at every input it feeds and grows exponentially.
+# The BDD summary and the batch path (pou_test_definitions) always use the shared IR of build_logic_ir.
+SHARED_SUBEXPRESSIONS = True
+
+# ---------------- Generate Function Block Diagram ----------------
+def generate_matplotlib_diagram(pou_name, blocks, in_vars, out_vars, block_inputs, out_connections, save_path=None):
+    # matplotlib is only needed for the diagrams, so it is not loaded by the batch/CLI modes
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+
+    fig, ax = plt.subplots(figsize=(10, 8))
+    ax.set_xlim(0, 12)
+    ax.set_ylim(0, 10)
+    ax.set_aspect('equal')
+    ax.axis('off')
+
+    node_positions = {}
+    y_offset = 8
+
+    block_spacing = 2
+    for block_id, type_name, _, _ in blocks:
+        ax.add_patch(patches.Rectangle((3, y_offset), 3, 1, linewidth=1, edgecolor='black', facecolor='lightblue'))
+        ax.text(4.5, y_offset + 0.5, type_name, ha='center', va='center', fontsize=10)
+        node_positions[block_id] = (4.5, y_offset + 0.5)
+        y_offset -= block_spacing
+
+    y_offset = 8
+    input_spacing = 1.5
+    for var_id, expr, _, _ in in_vars:
+        ax.add_patch(patches.Ellipse((1, y_offset), 2, 1, linewidth=1, edgecolor='black', facecolor='lightgreen'))
+        ax.text(1, y_offset, expr, ha='center', va='center', fontsize=10)
+        node_positions[var_id] = (1, y_offset)
+        y_offset -= input_spacing
+
+    y_offset = 8
+    for var_id, expr, _, _ in out_vars:
+        ax.add_patch(patches.Ellipse((11, y_offset), 2, 1, linewidth=1, edgecolor='black', facecolor='lightcoral'))
+        ax.text(11, y_offset, expr, ha='center', va='center', fontsize=10)
+        node_positions[var_id] = (11, y_offset)
+        y_offset -= input_spacing
+
+    for block_id, inputs in block_inputs.items():
+        for ref_id, neg in inputs:
+            x_start, y_start = node_positions[ref_id]
+            x_end, y_end = node_positions[block_id]
+            ax.annotate('', xy=(x_end, y_end), xytext=(x_start, y_start),
+                        arrowprops=dict(arrowstyle="->", lw=1, color='black'))
+
+    for out_id, ref_id in out_connections.items():
+        x_start, y_start = node_positions[ref_id]
+        x_end, y_end = node_positions[out_id]
+        ax.annotate('', xy=(x_end, y_end), xytext=(x_start, y_start),
+                    arrowprops=dict(arrowstyle="->", lw=1, color='black'))
+
+    ax.text(12, y_offset + 0.5, 'Output', ha='center', va='center', fontsize=10)
+
+    if save_path:
+        plt.savefig(save_path, format='png', bbox_inches='tight', dpi=300)
+        plt.close(fig)
+
+# ---------------- Boolean Expression Builder ----------------
+def _block_expression(block_type, input_exprs):
+    block_type = block_type.upper()
+    if block_type == "AND":
+        return "(" + " and ".join(input_exprs) + ")"
+    elif block_type == "OR":
+        return "(" + " or ".join(input_exprs) + ")"
+    elif block_type == "XOR":
+        return "(" + " ^ ".join(input_exprs) + ")"
+    else:
+        return f"{block_type}(" + ", ".join(input_exprs) + ")"
+
+def _leaf_expression(node_id, in_vars_dict):
+    if node_id in in_vars_dict:
+        return in_vars_dict[node_id]
+    logger.debug("Unknown reference: %s (not in inputs or blocks)", node_id)
+    return f"UNKNOWN({node_id})"
+
+def blocks_in_order(node_id, blocks_dict, block_inputs, done=()):
+    """
+    The blocks the output of node_id depends on, each once and after all blocks feeding it, found with
+    an explicit stack (deep networks do not hit the recursion limit). Blocks in `done` are skipped.
+
+    Raises:
+        ValueError: If the blocks form a feedback loop.
+    """
+    if node_id not in blocks_dict or node_id in done:
+        return []
+    order, path, on_path, seen = [], [node_id], {node_id}, {node_id}
+    stack = [(node_id, iter(block_inputs.get(node_id, [])))]
+    while stack:
+        block_id, inputs = stack[-1]
+        for ref_id, _ in inputs:
+            if ref_id in on_path:
+                loop = path[path.index(ref_id):] + [ref_id]
+                raise ValueError(f"Feedback loop through blocks {' -> '.join(loop)}: "
+                                 "only loop-free networks can be turned into logic.")
+            if ref_id in blocks_dict and ref_id not in seen and ref_id not in done:
+                seen.add(ref_id)
+                path.append(ref_id)
+                on_path.add(ref_id)
+                stack.append((ref_id, iter(block_inputs.get(ref_id, []))))
+                break
+        else:
+            stack.pop()
+            path.pop()
+            on_path.discard(block_id)
+            order.append(block_id)
+    return order
+
+def build_expression(node_id, in_vars_dict, blocks_dict, block_inputs, memo=None):
+    """
+    Builds the expanded logic text of an FBD node. Every block is expanded once, keyed by its localId in
+    `memo`; pass one memo for all outputs of a POU to share the work. The text still repeats a block at
+    every input it feeds, so it grows exponentially on chains of shared blocks: build_shared_expression
+    and build_logic_ir stay linear.
+
+    Raises:
+        ValueError: If the node depends on a feedback loop.
+    """
+    if node_id in in_vars_dict or node_id not in blocks_dict:
+        return _leaf_expression(node_id, in_vars_dict)
+    memo = {} if memo is None else memo
+    for block_id in blocks_in_order(node_id, blocks_dict, block_inputs, memo):
+        input_exprs = []
+        for ref_id, is_neg in block_inputs.get(block_id, []):
+            sub_expr = memo[ref_id] if ref_id in memo else _leaf_expression(ref_id, in_vars_dict)
+            input_exprs.append(f"not ({sub_expr})" if is_neg else sub_expr)
+        memo[block_id] = _block_expression(blocks_dict[block_id], input_exprs)
+    return memo[node_id]
+
+def build_shared_expression(node_id, in_vars_dict, blocks_dict, block_inputs):
+    """
+    Builds the logic of an FBD node with shared subexpressions: a block whose output feeds more than
+    one input below node_id is bound to a name ('_B<localId>') and referenced by it. Unlike the expanded
+    form of build_expression, the text grows linearly with the network.
+
+    Returns:
+        tuple: The bindings [(name, expression)], each using only earlier ones, and the expression.
+
+    Raises:
+        ValueError: If the node depends on a feedback loop.
+    """
+    order = blocks_in_order(node_id, blocks_dict, block_inputs)
+    if not order:
+        return [], _leaf_expression(node_id, in_vars_dict)
+    uses = Counter(ref_id for block_id in order for ref_id, _ in block_inputs.get(block_id, [])
+                   if ref_id in blocks_dict)
+    bindings, texts = [], {}
+    for block_id in order:
+        input_exprs = []
+        for ref_id, is_neg in block_inputs.get(block_id, []):
+            sub_expr = texts[ref_id] if ref_id in texts else _leaf_expression(ref_id, in_vars_dict)
+            input_exprs.append(f"not ({sub_expr})" if is_neg else sub_expr)
+        texts[block_id] = _block_expression(blocks_dict[block_id], input_exprs)
+        if uses[block_id] > 1:
+            name = "_B" + re.sub(r"\W", "_", block_id)
+            bindings.append((name, texts[block_id]))
+            texts[block_id] = name
+    return bindings, texts[node_id]
+
+def format_shared_expression(bindings, expression):
+    """'_B5 := (a and b);' lines for the bindings, then the expression."""
+    return "\n".join([f"{name} := {text};" for name, text in bindings] + [expression])
+
+def _block_ir(block_type, operands):
+    block_type = block_type.upper()
+    if block_type in ("AND", "OR", "XOR") and operands:
+        return operands[0] if len(operands) == 1 else (block_type.lower(), tuple(operands))
+    if block_type == "NOT" and len(operands) == 1:
+        return ("not", operands[0])
+    raise ValueError(f"Unsupported block {block_type} with {len(operands)} inputs: "
+                     "only AND, OR, XOR and NOT blocks can be turned into logic.")
+
+def _leaf_ir(node_id, in_vars_dict):
+    if node_id in in_vars_dict:
+        return parse_logic(in_vars_dict[node_id])
+    raise ValueError(f"Unknown reference {node_id} (not in inputs or blocks).")
+
+def build_logic_ir(node_id, in_vars_dict, blocks_dict, block_inputs, memo=None):
+    """
+    Builds the logic_expr IR of an FBD node without going through text. The IR of every block is built
+    once, keyed by its localId in `memo`, and its output is the same node object at each input it feeds,
+    so the IR is a DAG as large as the network. The BDD and compile_ir visit each of its nodes once.
+
+    Raises:
+        ValueError: If the node depends on a feedback loop, an unknown reference or a block other than
+            AND, OR, XOR and NOT.
+    """
+    if node_id in in_vars_dict or node_id not in blocks_dict:
+        return _leaf_ir(node_id, in_vars_dict)
+    memo = {} if memo is None else memo
+    for block_id in blocks_in_order(node_id, blocks_dict, block_inputs, memo):
+        operands = []
+        for ref_id, is_neg in block_inputs.get(block_id, []):
+            operand = memo[ref_id] if ref_id in memo else _leaf_ir(ref_id, in_vars_dict)
+            operands.append(("not", operand) if is_neg else operand)
+        memo[block_id] = _block_ir(blocks_dict[block_id], operands)
+    return memo[node_id]
+
+# ---------------- Main POU Parser ----------------
+class PouIndex:
+    """
+    The FBD network and interface of one POU as localId-indexed tables, built in a single walk over
+    the POU. Tags are matched by local name as they come, so the document never has its namespaces
+    stripped and no part of it is searched twice: a <block>, <inVariable>, <outVariable> or
+    <interface> is read where the walk meets it, and only the other elements are descended into.
+
+    blocks_dict ({localId: typeName}) and block_inputs ({localId: [(refLocalId, negated)]}) are the
+    nodes and edges of the network, in_vars_dict and out_vars_dict ({localId: expression}) its inputs
+    and outputs and out_connections ({output localId: refLocalId}) the edges into the outputs.
+    interface holds the 'inputVars' and 'outputVars' of the POU as [{'name', 'address'}].
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.blocks, self.in_vars, self.out_vars = [], [], []
+        self.blocks_dict, self.block_inputs, self.in_vars_dict, self.out_vars_dict = {}, {}, {}, {}
+        self.out_connections = {}
+        self.interface = {"inputVars": [], "outputVars": []}
+
+    @classmethod
+    def from_element(cls, pou) -> "PouIndex":
+        """Indexes a parsed <pou> element (ElementTree or lxml, with or without namespaces)."""
+        index = cls(pou.get("name"))
+        readers = {"block": index._read_block, "inVariable": index._read_in_variable,
+                   "outVariable": index._read_out_variable, "interface": index._read_interface}
+        stack = list(pou)[::-1]
+        while stack:
+            elem = stack.pop()
+            reader = readers.get(_local_name(elem.tag))
+            if reader is None:
+                stack.extend(list(elem)[::-1])
+            else:
+                reader(elem)
+        return index
+
+    def _read_block(self, block):
+        block_id, type_name = block.get("localId"), block.get("typeName")
+        self.blocks.append((block_id, type_name, 0, 0))
+        self.blocks_dict[block_id] = type_name
+        inputs = []
+        for input_vars in _children(block, "inputVariables"):
+            for input_var in _children(input_vars, "variable"):
+                ref_id = _connection(input_var)
+                if ref_id is not None:
+                    inputs.append((ref_id, input_var.get("negated", "false") == "true"))
+        self.block_inputs[block_id] = inputs
+
+    def _read_in_variable(self, var):
+        var_id, expr = var.get("localId"), _expression(var)
+        self.in_vars.append((var_id, expr, 0, 0))
+        self.in_vars_dict[var_id] = expr
+
+    def _read_out_variable(self, var):
+        var_id, expr = var.get("localId"), _expression(var)
+        self.out_vars.append((var_id, expr, 0, 0))
+        self.out_vars_dict[var_id] = expr
+        ref_id = _connection(var)
+        if ref_id is not None:
+            self.out_connections[var_id] = ref_id
+
+    def _read_interface(self, interface):
+        for section in interface:
+            variables = self.interface.get(_local_name(section.tag))
+            if variables is not None:
+                variables.extend({"name": variable.get("name"), "address": extract_61850_address(variable)}
+                                 for variable in _children(section, "variable"))
+
+    def tables(self) -> tuple:
+        """The tables in the order parse_pou returns them."""
+        return (self.blocks, self.in_vars, self.out_vars, self.block_inputs, self.out_connections,
+                self.in_vars_dict, self.out_vars_dict, self.blocks_dict)
+
+_local_name = functools.lru_cache(maxsize=None)(local_name)
+
+def _children(elem, name):
+    """Child elements named `name` in any (or no) namespace; lxml filters them without creating the others."""
+    if hasattr(elem, "iterchildren"):
+        return elem.iterchildren("{*}" + name)
+    return [child for child in elem if _local_name(child.tag) == name]
+
+def _expression(var):
+    """Text of the <expression> of an in/outVariable."""
+    for expression in _children(var, "expression"):
+        return expression.text
+    return None
+
+def _connection(var):
+    """refLocalId of the first connectionPointIn/connection of a variable, or None."""
+    for connection_point in _children(var, "connectionPointIn"):
+        for connection in _children(connection_point, "connection"):
+            return connection.get("refLocalId")
+    return None
+
+def index_plcopen(file_path) -> list:
+    """
+    Indexes every POU of a PLCopen XML file in one streaming pass (with lxml if installed, which
+    hands over only the <pou> elements). Each POU is released as soon as it is indexed, so only one
+    POU of the project is held as elements at a time.
+
+    Returns:
+        list: A PouIndex per POU, in file order.
+    """
+    pous = []
+    if HAVE_LXML:
+        for _, pou in etree.iterparse(file_path, events=("end",), tag="{*}pou", huge_tree=True):
+            pous.append(PouIndex.from_element(pou))
+            pou.clear()
+            while pou.getprevious() is not None:
+                del pou.getparent()[0]
+        return pous
+    for _, elem in ET.iterparse(file_path, events=("end",)):
+        if _local_name(elem.tag) == "pou":
+            pous.append(PouIndex.from_element(elem))
+            elem.clear()
+    return pous
+
+def parse_pou(pou):
+    return PouIndex.from_element(pou).tables()
+
+# ---------------- Function to Extract 61850 Address ----------------
+def extract_61850_address(variable_elem):
+    try:
+        documentation = variable_elem.find('.//{*}documentation')
+        if documentation is not None:
+            xhtml_elem = documentation.find('.//{*}xhtml')
+            if xhtml_elem is not None and xhtml_elem.text:
+                address = xhtml_elem.text.strip()
+                if '/' in address or '.' in address:
+                    return address
+    except Exception as e:
+        logger.debug("Error extracting address for variable %s: %s", variable_elem.attrib.get('name', 'UNKNOWN'), e)
+    return ""
+
+# ---------------- Test Case Definitions ----------------
+def pou_test_definitions(file_path, shared=True):
+    """
+    Reads every POU of a PLCopen XML file as test case definitions, one per connected output.
+
+    Parameters:
+        file_path (str): PLCopen XML file.
+        shared (bool): Give the logic as the shared IR of build_logic_ir ('ir') and its text with
+            bindings (format_shared_expression), which both grow linearly with the network. False gives
+            the expanded text of build_expression only, which grows exponentially with shared blocks.
+
+    Returns:
+        list: One dict per POU output with the POU and output names, the logic built from the FBD,
+        the input variable names and their 61850 addresses (CONTROL) and the output address (ASSESS).
+    """
+    definitions = []
+    for pou in index_plcopen(file_path):
+        pou_name = pou.name
+        _, _, _, block_inputs, out_connections, in_vars_dict, out_vars_dict, blocks_dict = pou.tables()
+        control_vars = pou.interface["inputVars"]
+        assess_addresses = {variable["name"]: variable["address"] for variable in pou.interface["outputVars"]}
+        memo = {}  # Blocks shared by several outputs of the POU are built once
+        for out_id, src_block in out_connections.items():
+            output_name = out_vars_dict.get(out_id, "UNKNOWN")
+            ir, error = None, None
+            try:
+                if shared:
+                    ir = build_logic_ir(src_block, in_vars_dict, blocks_dict, block_inputs, memo)
+                    logic = format_shared_expression(
+                        *build_shared_expression(src_block, in_vars_dict, blocks_dict, block_inputs))
+                else:
+                    logic = build_expression(src_block, in_vars_dict, blocks_dict, block_inputs, memo)
+            except ValueError as e:  # Reported as the failure of this output only
+                ir, logic, error = None, None, f"POU {pou_name}: {e}"
+            definitions.append({
+                "pou": pou_name,
+                "output": output_name,
+                "logic": logic,
+                "ir": ir,
+                "error": error,
+                "inputs": [variable["name"] for variable in control_vars],
+                "control_addresses": [variable["address"] for variable in control_vars],
+                "assess_address": assess_addresses.get(output_name, ""),
+            })
+    return definitions
+
+# ---------------- Main Script ----------------
+def main():
+    import tkinter as tk
+    from tkinter import filedialog
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, PageBreak
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib import colors
+
+    root = tk.Tk()
+    root.withdraw()
+    file_path = filedialog.askopenfilename(title="Select PLCOpen XML File", filetypes=[("XML files", "*.xml")])
+    if not file_path:
+        logger.warning("No file selected.")
+        return
+
+    pous = index_plcopen(file_path)
+    project_name = os.path.splitext(os.path.basename(file_path))[0]
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    folder_name = f"{project_name}_Export_{len(pous)}POUs_{timestamp}"
+    export_folder = os.path.join(os.getcwd(), folder_name)
+    os.makedirs(export_folder, exist_ok=True)
+
+    pdf_path = os.path.join(export_folder, f"{project_name}_FBD_Documentation.pdf")
+    doc = SimpleDocTemplate(pdf_path, pagesize=A4)
+    styles = getSampleStyleSheet()
+    story = [Paragraph("<b>Table of Contents</b>", styles['Heading1'])]
+
+    for i, pou in enumerate(pous, start=1):
+        pou_name = pou.name
+        story.append(Paragraph(f"{i}. {pou_name}", styles['Normal']))
+    story.append(PageBreak())
+
+    for pou in pous:
+        pou_name = pou.name
+        logger.debug("Processing POU: %s", pou_name)
+        story.append(Paragraph(f"<b>POU: {pou_name}</b>", styles['Heading2']))
+        blocks, in_vars, out_vars, block_inputs, out_connections, in_vars_dict, out_vars_dict, blocks_dict = pou.tables()
+
+        png_path = os.path.join(export_folder, f"{pou_name}_diagram.png")
+        generate_matplotlib_diagram(pou_name, blocks, in_vars, out_vars, block_inputs, out_connections, save_path=png_path)
+
+        logger.debug("POU: %s Boolean Expressions:", pou_name)
+        boolean_expressions = []
+        memo, ir_memo = {}, {}
+        for out_id, src_block in out_connections.items():
+            logger.debug("Building expression for output '%s' from block %s",
+                         out_vars_dict.get(out_id, 'UNKNOWN'), src_block)
+            try:
+                if SHARED_SUBEXPRESSIONS:
+                    expr = format_shared_expression(
+                        *build_shared_expression(src_block, in_vars_dict, blocks_dict, block_inputs))
+                else:
+                    expr = build_expression(src_block, in_vars_dict, blocks_dict, block_inputs, memo)
+            except ValueError as e:
+                logger.warning("Warning: no logic for output '%s': %s", out_vars_dict.get(out_id, 'UNKNOWN'), e)
+                boolean_expressions.append(f"ERROR: {e}")
+                continue
+            try:
+                bdd, bdd_root = build_bdd(build_logic_ir(src_block, in_vars_dict, blocks_dict, block_inputs, ir_memo))
+                logger.info("%s: %d inputs, %d of %d input combinations true, BDD size %d",
+                            out_vars_dict.get(out_id, 'UNKNOWN'), len(bdd.order), bdd.sat_count(bdd_root),
+                            1 << len(bdd.order), bdd.size(bdd_root))
+            except ValueError as e:
+                logger.warning("Warning: logic for output '%s' cannot be used for test generation: %s",
+                               out_vars_dict.get(out_id, 'UNKNOWN'), e)
+            boolean_expressions.append(expr)
+            logger.debug("%s = %s", out_vars_dict[out_id], expr)
+
+        img_buf = BytesIO()
+        generate_matplotlib_diagram(pou_name, blocks, in_vars, out_vars, block_inputs, out_connections, save_path=img_buf)
+        img_buf.seek(0)
+        story.append(Image(img_buf, width=6.5 * inch, height=4.5 * inch))
+        story.append(Spacer(1, 0.2 * inch))
+
+        control_vars = [variable["name"] for variable in pou.interface["inputVars"]]
+        assess_vars = [variable["name"] for variable in pou.interface["outputVars"]]
+        control_addresses = [variable["address"] for variable in pou.interface["inputVars"]]
+        assess_addresses = [variable["address"] for variable in pou.interface["outputVars"]]
+
+        # Ensure equal lengths for all columns
+        max_len = max(len(control_vars), len(assess_vars), len(boolean_expressions))
+        control_vars += [''] * (max_len - len(control_vars))
+        assess_vars += [''] * (max_len - len(assess_vars))
+        boolean_expressions += [''] * (max_len - len(boolean_expressions))
+        control_addresses += [''] * (max_len - len(control_addresses))
+        assess_addresses += [''] * (max_len - len(assess_addresses))
+
+        df = pd.DataFrame({
+            "CONTROL": control_vars,
+            "ASSESS": assess_vars,
+            "LOGIC": boolean_expressions,
+            "CONTROL_ADDRESS": control_addresses,
+            "ASSESS_ADDRESS": assess_addresses
+        })
+
+        excel_path = os.path.join(export_folder, f"{pou_name}_IO_List.xlsx")
+        df.to_excel(excel_path, index=False)
+
+        story.append(Paragraph("<b>I/O Table:</b>", styles['Heading3']))
+        data = [["CONTROL", "ASSESS", "LOGIC", "CONTROL_ADDRESS", "ASSESS_ADDRESS"]] + df.values.tolist()
+        table = Table(data, colWidths=[2.5 * inch, 2.5 * inch, 2.5 * inch, 2.5 * inch, 2.5 * inch])
+        table.setStyle(TableStyle([('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                                   ('GRID', (0, 0), (-1, -1), 0.5, colors.black)]))
+        story.append(table)
+        story.append(PageBreak())
+
+    doc.build(story)
+
+    logger.info("\nPDF saved to: %s", pdf_path)
+    logger.info("Export folder: %s", export_folder)
+    logger.info("Use the files generated here as a reference for filling in the information needed in the next prompts.")
+
+if __name__ == "__main__":
+    main()
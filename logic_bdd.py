@@ -0,0 +1,258 @@
+from collections import Counter
+
+from logic_expr import operands, parse_logic, postorder, variables
+
+# Node ids 0 and 1 are the FALSE and TRUE terminals.
+FALSE, TRUE = 0, 1
+
+
+class BDD:
+    """
+    Reduced ordered binary decision diagram (ROBDD) manager for one variable order.
+
+    Nodes are stored as (level, low, high) triples in a unique table, so equal sub-functions
+    are shared and every function has exactly one node id. Satisfiability, row counts and
+    witness vectors are answered from the graph without enumerating the 2^n truth table.
+    """
+
+    def __init__(self, order: list):
+        self.order = list(order)
+        self.level = {name: i for i, name in enumerate(self.order)}
+        terminal_level = len(self.order)
+        self._nodes = [(terminal_level, None, None), (terminal_level, None, None)]
+        self._unique = {}
+        self._apply_cache = {}
+        self._not_cache = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def node(self, u: int) -> tuple:
+        return self._nodes[u]
+
+    def mk(self, level: int, low: int, high: int) -> int:
+        if low == high:
+            return low
+        key = (level, low, high)
+        u = self._unique.get(key)
+        if u is None:
+            u = len(self._nodes)
+            self._nodes.append(key)
+            self._unique[key] = u
+        return u
+
+    def var(self, name: str) -> int:
+        return self.mk(self.level[name], FALSE, TRUE)
+
+    def negate(self, u: int) -> int:
+        if u <= TRUE:
+            return 1 - u
+        result = self._not_cache.get(u)
+        if result is None:
+            level, low, high = self._nodes[u]
+            result = self.mk(level, self.negate(low), self.negate(high))
+            self._not_cache[u] = result
+        return result
+
+    def apply(self, op: str, u: int, v: int) -> int:
+        """Combines two functions with 'and', 'or' or 'xor'."""
+        if u <= TRUE and v <= TRUE:
+            return {"and": u & v, "or": u | v, "xor": u ^ v}[op]
+        if op == "and" and (u == FALSE or v == FALSE):
+            return FALSE
+        if op == "or" and (u == TRUE or v == TRUE):
+            return TRUE
+        if u == v:
+            return FALSE if op == "xor" else u
+        if u > v:  # All three operators are commutative
+            u, v = v, u
+        key = (op, u, v)
+        result = self._apply_cache.get(key)
+        if result is None:
+            u_level, u_low, u_high = self._nodes[u]
+            v_level, v_low, v_high = self._nodes[v]
+            level = min(u_level, v_level)
+            if u_level != level:
+                u_low = u_high = u
+            if v_level != level:
+                v_low = v_high = v
+            result = self.mk(level, self.apply(op, u_low, v_low), self.apply(op, u_high, v_high))
+            self._apply_cache[key] = result
+        return result
+
+    def from_ir(self, ir: tuple) -> int:
+        """Builds the BDD of a logic_expr IR, each shared node once."""
+        results = {}
+        for node in postorder(ir):
+            kind = node[0]
+            if kind == "var":
+                result = self.var(node[1])
+            elif kind == "const":
+                result = TRUE if node[1] else FALSE
+            elif kind == "not":
+                result = self.negate(results[id(node[1])])
+            else:
+                result = results[id(node[1][0])]
+                for operand in node[1][1:]:
+                    result = self.apply(kind, result, results[id(operand)])
+            results[id(node)] = result
+        return results[id(ir)]
+
+    def restrict(self, u: int, name: str, value: bool) -> int:
+        """Returns the cofactor of u with variable `name` fixed to `value`."""
+        target = self.level[name]
+        cache = {}
+
+        def walk(w):
+            if w <= TRUE:
+                return w
+            if w in cache:
+                return cache[w]
+            level, low, high = self._nodes[w]
+            if level > target:
+                result = w
+            elif level == target:
+                result = high if value else low
+            else:
+                result = self.mk(level, walk(low), walk(high))
+            cache[w] = result
+            return result
+
+        return walk(u)
+
+    def size(self, u: int) -> int:
+        """Number of internal nodes reachable from u."""
+        seen, stack = set(), [u]
+        while stack:
+            w = stack.pop()
+            if w <= TRUE or w in seen:
+                continue
+            seen.add(w)
+            stack.extend(self._nodes[w][1:])
+        return len(seen)
+
+    def is_satisfiable(self, u: int) -> bool:
+        return u != FALSE
+
+    def sat_count(self, u: int) -> int:
+        """Number of rows of the full truth table over all variables of the order where u is true."""
+        counts = {FALSE: 0, TRUE: 1}
+
+        def count(w):
+            if w not in counts:
+                level, low, high = self._nodes[w]
+                counts[w] = (count(low) << (self._nodes[low][0] - level - 1)) + \
+                            (count(high) << (self._nodes[high][0] - level - 1))
+            return counts[w]
+
+        return count(u) << self._nodes[u][0]
+
+    def iter_cubes(self, u: int):
+        """Yields every path to TRUE as a dict of the variables fixed on that path."""
+        stack = [(u, {})]
+        while stack:
+            w, cube = stack.pop()
+            if w == FALSE:
+                continue
+            if w == TRUE:
+                yield cube
+                continue
+            level, low, high = self._nodes[w]
+            name = self.order[level]
+            stack.append((high, {**cube, name: True}))
+            stack.append((low, {**cube, name: False}))
+
+    def witness(self, u: int, default: bool = False):
+        """Returns one satisfying assignment of all variables, or None if u is unsatisfiable."""
+        cube = next(self.iter_cubes(u), None)
+        if cube is None:
+            return None
+        return {name: cube.get(name, default) for name in self.order}
+
+
+def variable_order(ir: tuple, names=None, heuristic: str = "appearance") -> list:
+    """
+    Variable order heuristics for building the BDD.
+
+    Parameters:
+        ir (tuple): Normalized logic_expr IR.
+        names (list): All input names, including ones the logic does not use. They go last.
+        heuristic (str): 'appearance' keeps variables in depth-first order of first use, which keeps
+            inputs of the same block together; 'frequency' puts the most used variables first. Uses are
+            counted in the expanded expression: a shared node counts once per path to it.
+
+    Returns:
+        list: Variable names in BDD order.
+    """
+    nodes = postorder(ir)
+    paths = Counter({id(ir): 1})
+    for node in reversed(nodes):  # Every node before its operands
+        for operand in operands(node):
+            paths[id(operand)] += paths[id(node)]
+    appearance = []
+    counts = Counter()
+    for node in nodes:
+        if node[0] == "var":
+            if node[1] not in counts:
+                appearance.append(node[1])
+            counts[node[1]] += paths[id(node)]
+    if heuristic == "appearance":
+        order = appearance
+    elif heuristic == "frequency":
+        order = sorted(appearance, key=lambda name: -counts[name])
+    else:
+        raise ValueError(f"Unknown variable order heuristic: {heuristic}")
+    return order + [name for name in (names or []) if name not in counts]
+
+
+def build_bdd(logic, names=None, heuristic: str = "best") -> tuple:
+    """
+    Builds the BDD of a logic expression (text or IR).
+
+    Parameters:
+        logic (str or tuple): Logic text in any syntax accepted by logic_expr, or its IR.
+        names (list): All input names of the test, e.g. Input1..InputN.
+        heuristic (str): A variable_order heuristic, or 'best' to keep the smallest of all of them.
+
+    Returns:
+        tuple: The BDD manager and the root node id.
+    """
+    ir = parse_logic(logic) if isinstance(logic, str) else logic
+    unknown = variables(ir) - set(names) if names is not None else set()
+    if unknown:
+        raise ValueError(f"Unknown variables in logic: {sorted(unknown)}. Expected names from: {list(names)}")
+    heuristics = ["appearance", "frequency"] if heuristic == "best" else [heuristic]
+    best = None
+    for candidate in heuristics:
+        bdd = BDD(variable_order(ir, names, candidate))
+        root = bdd.from_ir(ir)
+        if best is None or bdd.size(root) < best[0].size(best[1]):
+            best = (bdd, root)
+    return best
+
+
+def step_vectors(bdd: BDD, root: int, names: list, max_steps: int = None):
+    """
+    Yields (inputs, output) test vectors taken from the BDD paths of the logic and of its negation,
+    alternating between the two so both outcomes are covered before max_steps is reached.
+    Inputs not fixed on a path are set to False. Paths are disjoint, so no vector repeats.
+
+    Parameters:
+        bdd (BDD): The BDD manager.
+        root (int): Root node of the logic.
+        names (list): Input names in the column order of the truth table.
+        max_steps (int): Stop after this many vectors. None yields every path.
+    """
+    generators = [(True, bdd.iter_cubes(root)), (False, bdd.iter_cubes(bdd.negate(root)))]
+    produced = 0
+    while generators and (max_steps is None or produced < max_steps):
+        for entry in list(generators):
+            output, cubes = entry
+            cube = next(cubes, None)
+            if cube is None:
+                generators.remove(entry)
+                continue
+            yield tuple(cube.get(name, False) for name in names), output
+            produced += 1
+            if max_steps is not None and produced >= max_steps:
+                return
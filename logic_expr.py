@@ -0,0 +1,336 @@
+import hashlib
+import keyword
+import re
+from collections import Counter
+from functools import lru_cache
+
+# Intermediate representation (IR) of a logic expression, built from plain tuples so it is hashable:
+#   ("var", name), ("const", bool), ("not", operand),
+#   ("and", operands), ("or", operands), ("xor", operands)   (operands is a tuple)
+# A node may be the operand of several others (the IR of an FBD network is a DAG). variables,
+# rename_variables(normalized=False), compile_ir and the BDD visit each distinct node once; normalize
+# and to_text work on the expanded tree, so they are only used for parsed text.
+
+_TOKEN_RE = re.compile(r"\s*(?:(?P<name>[A-Za-z_][A-Za-z0-9_]*)|(?P<op>[()&|^,]))")
+
+PYTHON_KEYWORDS = {"and", "or", "not", "True", "False"}
+ST_KEYWORDS = {"AND", "OR", "XOR", "NOT", "TRUE", "FALSE"}
+FUNCTION_BLOCKS = {"AND", "OR", "XOR", "NOT"}
+
+
+def tokenize(text: str) -> list:
+    """
+    Splits a logic expression into name and operator tokens.
+
+    Raises:
+        ValueError: If the expression contains anything other than names, '&', '|', '^', ',' and brackets.
+    """
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise ValueError(f"Unsupported character {text[pos:].lstrip()[:1]!r} at position {pos} in logic: {text}")
+        tokens.append(match.group("name") or match.group("op"))
+        pos = match.end()
+    if not tokens:
+        raise ValueError("The logic expression is empty.")
+    return tokens
+
+
+def detect_dialect(tokens: list) -> str:
+    """
+    Returns 'python' for 'and/or/not/^' logic and 'st' for IEC 61131-3 Structured Text 'AND/OR/XOR/NOT'.
+    ST keywords are case-insensitive, as in the parser: any spelling other than Python's lowercase
+    'and/or/not' ('AND', 'And', 'Not', 'xor') makes the logic ST, and 'and/or/not' are then ST keywords
+    too. Function-call style blocks such as AND(a, b) are allowed in both.
+
+    >>> detect_dialect(tokenize("a And Not b"))
+    'st'
+    >>> detect_dialect(tokenize("a and b Or c"))
+    'st'
+    >>> detect_dialect(tokenize("a and not (b ^ c)"))
+    'python'
+    """
+    python_ops, st_ops = set(), set()
+    for i, token in enumerate(tokens):
+        is_call = i + 1 < len(tokens) and tokens[i + 1] == "("
+        if token in ("^", "|"):
+            python_ops.add(token)
+        elif token.upper() in ("AND", "OR", "XOR", "NOT") and token not in ("and", "or", "not") and not is_call:
+            st_ops.add(token)
+    if python_ops and st_ops:
+        raise ValueError(
+            f"Logic mixes Python operators {sorted(python_ops)} with IEC 61131-3 operators {sorted(st_ops)}."
+        )
+    return "st" if st_ops else "python"
+
+
+class _Parser:
+    """Recursive descent parser for both dialects. Operator precedence follows the dialect."""
+
+    def __init__(self, tokens: list, dialect: str):
+        if dialect == "st":  # ST keywords are case-insensitive
+            tokens = [token.upper() if token.upper() in ST_KEYWORDS else token for token in tokens]
+        self.tokens = tokens
+        self.dialect = dialect
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, expected=None):
+        token = self.peek()
+        if token is None or (expected is not None and token != expected):
+            raise ValueError(f"Expected {expected or 'an operand'!r} but found {token!r} in logic: {' '.join(self.tokens)}")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        ir = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected {self.peek()!r} in logic: {' '.join(self.tokens)}")
+        return ir
+
+    def _binary(self, operators, operand, kind):
+        operands = [operand()]
+        while self.peek() in operators:
+            self.take()
+            operands.append(operand())
+        return operands[0] if len(operands) == 1 else (kind, tuple(operands))
+
+    # Python: or < and < not < | < ^ < &
+    # ST:     OR < XOR < AND/& < NOT
+    def parse_or(self):
+        if self.dialect == "st":
+            return self._binary(("OR",), self.parse_xor, "or")
+        return self._binary(("or",), self.parse_and, "or")
+
+    def parse_xor(self):
+        return self._binary(("XOR",), self.parse_and, "xor")
+
+    def parse_and(self):
+        if self.dialect == "st":
+            return self._binary(("AND", "&"), self.parse_not, "and")
+        return self._binary(("and",), self.parse_not, "and")
+
+    def parse_not(self):
+        not_keyword = "NOT" if self.dialect == "st" else "not"
+        is_call = self.pos + 1 < len(self.tokens) and self.tokens[self.pos + 1] == "("
+        if self.peek() == not_keyword and not (not_keyword == "NOT" and is_call):
+            self.take()
+            return ("not", self.parse_not())
+        return self.parse_atom() if self.dialect == "st" else self.parse_bit_or()
+
+    def parse_bit_or(self):
+        return self._binary(("|",), self.parse_bit_xor, "or")
+
+    def parse_bit_xor(self):
+        return self._binary(("^",), self.parse_bit_and, "xor")
+
+    def parse_bit_and(self):
+        return self._binary(("&",), self.parse_atom, "and")
+
+    def parse_atom(self):
+        token = self.take()
+        if token == "(":
+            ir = self.parse_or()
+            self.take(")")
+            return ir
+        if token in ("True", "TRUE"):
+            return ("const", True)
+        if token in ("False", "FALSE"):
+            return ("const", False)
+        if self.peek() == "(":
+            return self.parse_call(token)
+        if token in PYTHON_KEYWORDS or token in ST_KEYWORDS or not (token[0].isalpha() or token[0] == "_"):
+            raise ValueError(f"Expected an operand but found {token!r} in logic: {' '.join(self.tokens)}")
+        if keyword.iskeyword(token) or token.startswith("__"):
+            raise ValueError(f"Unsupported name {token!r} in logic: {' '.join(self.tokens)}")
+        return ("var", token)
+
+    def parse_call(self, name):
+        block = name.upper()
+        if block not in FUNCTION_BLOCKS:
+            raise ValueError(f"Unsupported function block {name!r} in logic. Only {sorted(FUNCTION_BLOCKS)} are allowed.")
+        self.take("(")
+        args = [self.parse_or()]
+        while self.peek() == ",":
+            self.take()
+            args.append(self.parse_or())
+        self.take(")")
+        if block == "NOT":
+            if len(args) != 1:
+                raise ValueError(f"NOT takes exactly one input, got {len(args)}.")
+            return ("not", args[0])
+        return args[0] if len(args) == 1 else (block.lower(), tuple(args))
+
+
+def normalize(ir: tuple) -> tuple:
+    """
+    Returns a canonical form of the IR: nested AND/OR/XOR are flattened, operands are sorted
+    and double negations removed, so equivalent spellings of the same interlock share one cache entry.
+    """
+    kind = ir[0]
+    if kind in ("var", "const"):
+        return ir
+    if kind == "not":
+        operand = normalize(ir[1])
+        if operand[0] == "not":
+            return operand[1]
+        if operand[0] == "const":
+            return ("const", not operand[1])
+        return ("not", operand)
+    operands = []
+    for operand in (normalize(child) for child in ir[1]):
+        if operand[0] == kind:
+            operands.extend(operand[1])
+        else:
+            operands.append(operand)
+    operands.sort(key=to_text)
+    return (kind, tuple(operands))
+
+
+def to_text(ir: tuple) -> str:
+    """Renders the IR as Python-syntax logic, the format accepted by the truth table GUI."""
+    kind = ir[0]
+    if kind == "var":
+        return ir[1]
+    if kind == "const":
+        return "True" if ir[1] else "False"
+    if kind == "not":
+        return f"not ({to_text(ir[1])})"
+    joiner = {"and": " and ", "or": " or ", "xor": " ^ "}[kind]
+    return "(" + joiner.join(to_text(operand) for operand in ir[1]) + ")"
+
+
+def operands(node: tuple) -> tuple:
+    """The operand nodes of an IR node, empty for variables and constants."""
+    if node[0] in ("var", "const"):
+        return ()
+    if node[0] == "not":
+        return (node[1],)
+    return node[1]
+
+
+def postorder(ir: tuple) -> list:
+    """
+    The distinct nodes of the IR, shared nodes once, each after its operands. Uses an explicit
+    stack, so IR built from deep networks does not hit the recursion limit.
+    """
+    order, seen, stack = [], set(), [(ir, False)]
+    while stack:
+        node, done = stack.pop()
+        if done:
+            order.append(node)
+        elif id(node) not in seen:
+            seen.add(id(node))
+            stack.append((node, True))
+            stack.extend((operand, False) for operand in reversed(operands(node)))
+    return order
+
+
+def variables(ir: tuple) -> set:
+    """Returns the set of variable names used by the IR."""
+    return {node[1] for node in postorder(ir) if node[0] == "var"}
+
+
+def rename_variables(ir: tuple, mapping: dict, normalized: bool = True) -> tuple:
+    """
+    Returns the IR with every variable renamed through `mapping` (names not in it are kept), normalized.
+    With normalized=False the IR keeps its shape and its shared nodes.
+    """
+    renamed = {}
+    for node in postorder(ir):
+        if node[0] == "var":
+            result = ("var", mapping.get(node[1], node[1]))
+        elif node[0] == "const":
+            result = node
+        elif node[0] == "not":
+            result = ("not", renamed[id(node[1])])
+        else:
+            result = (node[0], tuple(renamed[id(operand)] for operand in node[1]))
+        renamed[id(node)] = result
+    return normalize(renamed[id(ir)]) if normalized else renamed[id(ir)]
+
+
+@lru_cache(maxsize=1024)
+def parse_logic(text: str, dialect: str = None) -> tuple:
+    """
+    Parses hand-typed logic ('and/or/not/^') or IEC 61131-3 ST logic ('AND/OR/XOR/NOT', '&')
+    into the normalized IR. Anything that is not a name, a boolean constant, a supported operator
+    or an AND/OR/XOR/NOT block call is rejected before any code is generated.
+
+    Raises:
+        ValueError: If the expression is empty, malformed or uses unsupported constructs.
+    """
+    tokens = tokenize(text)
+    return normalize(_Parser(tokens, dialect or detect_dialect(tokens)).parse())
+
+
+def _to_source(ir: tuple, vectorized: bool) -> tuple:
+    """
+    Python source of the IR: assignments of the nodes used more than once to temporaries ('__s0', a name
+    the parser never accepts), then the expression using them. The source grows linearly with the IR.
+    """
+    nodes = postorder(ir)
+    uses = Counter(id(operand) for node in nodes for operand in operands(node))
+    statements, sources = [], {}
+    for node in nodes:
+        kind = node[0]
+        if kind == "var":
+            source = node[1]
+        elif kind == "const":
+            if vectorized:
+                source = "1" if node[1] else "0"
+            else:
+                source = "True" if node[1] else "False"
+        elif kind == "not":
+            operand = sources[id(node[1])]
+            source = f"({operand} ^ 1)" if vectorized else f"(not {operand})"
+        else:
+            if vectorized:
+                joiner = {"and": " & ", "or": " | ", "xor": " ^ "}[kind]
+            else:
+                joiner = {"and": " and ", "or": " or ", "xor": " ^ "}[kind]
+            source = "(" + joiner.join(sources[id(operand)] for operand in node[1]) + ")"
+        if uses[id(node)] > 1 and kind not in ("var", "const"):
+            statements.append(f"__s{len(statements)} = {source}")
+            source = f"__s{len(statements) - 1}"
+        sources[id(node)] = source
+    return statements, sources[id(ir)]
+
+
+_compiled = {}
+
+
+def compile_ir(ir: tuple, names: tuple, vectorized: bool = False):
+    """
+    Compiles the IR into a function taking the inputs positionally in the order of `names`.
+    With vectorized=True the function works on whole uint8 NumPy arrays using bitwise operators.
+    Compiled functions are memoized by a hash of their source, so identical logic compiles once per process.
+
+    Raises:
+        ValueError: If the logic uses variables that are not in `names`.
+    """
+    statements, expression = _to_source(ir, vectorized)
+    source = "".join([f"def logic({', '.join(names)}):\n"] + [f"    {statement}\n" for statement in statements] +
+                     [f"    return {expression}\n"])
+    key = hashlib.sha1(source.encode("utf-8")).hexdigest()
+    func = _compiled.get(key)
+    if func is None:
+        unknown = variables(ir) - set(names)
+        if unknown:
+            raise ValueError(f"Unknown variables in logic: {sorted(unknown)}. Expected names from: {list(names)}")
+        namespace = {"__builtins__": {}}
+        exec(compile(source, "<logic>", "exec"), namespace)
+        func = namespace["logic"]
+        _compiled[key] = func
+    return func
+
+
+@lru_cache(maxsize=1024)
+def compile_logic(text: str, names: tuple, vectorized: bool = False):
+    """Parses and compiles a logic expression, see parse_logic and compile_ir."""
+    return compile_ir(parse_logic(text), names, vectorized)
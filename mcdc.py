@@ -0,0 +1,89 @@
+from generator_log import logger
+from logic_bdd import FALSE, build_bdd
+from logic_expr import compile_ir, parse_logic
+
+
+def _flip(vector: tuple, index: int) -> tuple:
+    return vector[:index] + (not vector[index],) + vector[index + 1:]
+
+
+def mcdc_vectors(user_logic: str, names: list) -> tuple:
+    """
+    Selects a small set of input vectors that shows the independent effect of every input
+    (unique-cause MC/DC): for each input there is a pair of selected vectors that differ only
+    in that input and give different outputs.
+
+    Pairs are taken greedily: an input is covered by an existing pair if possible, then by flipping
+    one already selected vector, and only otherwise by a new pair found in the Boolean difference
+    f(x_i=0) XOR f(x_i=1) of the BDD. This keeps the set between n + 1 and 2n vectors.
+
+    Parameters:
+        user_logic (str or tuple): Logic expression in any syntax accepted by logic_expr, or its IR.
+        names (list): Input names in truth table column order.
+
+    Returns:
+        tuple: Selected (inputs, output) vectors in truth table row order, and a coverage report dict.
+    """
+    ir = parse_logic(user_logic) if isinstance(user_logic, str) else user_logic
+    logic = compile_ir(ir, tuple(names))
+    bdd, root = build_bdd(ir, names)
+
+    selected = []
+    selected_set = set()
+    outputs = {}
+
+    def output(vector):
+        if vector not in outputs:
+            outputs[vector] = bool(logic(*vector))
+        return outputs[vector]
+
+    def select(vector):
+        if vector not in selected_set:
+            selected.append(vector)
+            selected_set.add(vector)
+
+    pairs = {}
+    not_coverable = []
+    for index, name in enumerate(names):
+        difference = bdd.apply("xor", bdd.restrict(root, name, False), bdd.restrict(root, name, True))
+        if difference == FALSE:
+            not_coverable.append(name)
+            continue
+        pair = next(((vector, _flip(vector, index)) for vector in selected
+                     if _flip(vector, index) in selected_set and output(vector) != output(_flip(vector, index))), None)
+        if pair is None:
+            pair = next(((vector, _flip(vector, index)) for vector in selected
+                         if output(vector) != output(_flip(vector, index))), None)
+        if pair is None:
+            witness = bdd.witness(difference)
+            vector = tuple(witness[n] if n != name else False for n in names)
+            pair = (vector, _flip(vector, index))
+        select(pair[0])
+        select(pair[1])
+        pairs[name] = pair
+
+    if not selected:
+        select(tuple(False for _ in names))
+
+    full_rows = 1 << len(names)
+    report = {
+        "inputs": len(names),
+        "covered_inputs": len(pairs),
+        "not_coverable_inputs": not_coverable,
+        "coverage": len(pairs) / len(names) if names else 1.0,
+        "vectors": len(selected),
+        "full_rows": full_rows,
+        "reduction_ratio": full_rows / len(selected),
+        "pairs": pairs,
+    }
+    return [(vector, output(vector)) for vector in sorted(selected)], report
+
+
+def print_mcdc_report(report: dict):
+    """Logs the achieved coverage and the reduction against the full truth table."""
+    logger.info("MC/DC coverage: %d/%d inputs (%.0f%%) with %d test vectors instead of %d (reduction %.1fx)",
+                report['covered_inputs'], report['inputs'], report['coverage'] * 100, report['vectors'],
+                report['full_rows'], report['reduction_ratio'])
+    if report["not_coverable_inputs"]:
+        logger.warning("Inputs without independent effect on the output (not coverable): %s",
+                       report['not_coverable_inputs'])
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from contextlib import closing
+
+from generator_log import logger
+from scd_index import PARSER_VERSION, index_scd
+
+# The cache lives in one sqlite file; SCD_INDEX_CACHE overrides its location.
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "stationscout_testgen", "scd_index.sqlite")
+# Least recently used indexes are evicted once the cache holds more than this many (compressed) bytes.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_file_path() -> str:
+    return os.environ.get("SCD_INDEX_CACHE", DEFAULT_CACHE_FILE)
+
+
+def file_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of the file content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _connect(cache_file: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+    connection = sqlite3.connect(cache_file, timeout=30)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS scd_index ("
+        " scd_hash TEXT NOT NULL, parser_version INTEGER NOT NULL, scd_name TEXT, size INTEGER NOT NULL,"
+        " last_used REAL NOT NULL, data BLOB NOT NULL, PRIMARY KEY (scd_hash, parser_version))"
+    )
+    return connection
+
+
+def evict(connection: sqlite3.Connection, max_bytes: int) -> int:
+    """Deletes least recently used indexes until the cache is within max_bytes. Returns the number deleted."""
+    rows = connection.execute(
+        "SELECT scd_hash, parser_version, size FROM scd_index ORDER BY last_used DESC").fetchall()
+    kept_bytes = 0
+    evicted = []
+    for scd_hash, parser_version, size in rows:
+        kept_bytes += size
+        if kept_bytes > max_bytes:
+            evicted.append((scd_hash, parser_version))
+    connection.executemany("DELETE FROM scd_index WHERE scd_hash = ? AND parser_version = ?", evicted)
+    return len(evicted)
+
+
+def cached_index_scd(scd_file: str, cache_file: str = None, max_bytes: int = DEFAULT_MAX_BYTES) -> dict:
+    """
+    Returns index_scd(scd_file), from the on-disk cache when the same SCD content was indexed before by
+    the same PARSER_VERSION. A warm run only hashes the file and does not parse any XML.
+
+    Parameters:
+        scd_file (str): Path to the SCD file.
+        cache_file (str): sqlite cache file. Defaults to cache_file_path().
+        max_bytes (int): Size bound of the cache, enforced by least recently used eviction.
+
+    Returns:
+        dict: The SCD index, see index_scd.
+    """
+    cache_file = cache_file or cache_file_path()
+    scd_hash = file_hash(scd_file)
+    try:
+        with closing(_connect(cache_file)) as connection, connection:
+            row = connection.execute(
+                "SELECT data FROM scd_index WHERE scd_hash = ? AND parser_version = ?",
+                (scd_hash, PARSER_VERSION)).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE scd_index SET last_used = ? WHERE scd_hash = ? AND parser_version = ?",
+                    (time.time(), scd_hash, PARSER_VERSION))
+                logger.info("SCD index loaded from cache %s", cache_file)
+                return json.loads(zlib.decompress(row[0]))
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Warning: SCD index cache not usable (%s), parsing the SCD.", e)
+        return index_scd(scd_file)
+
+    scd = index_scd(scd_file)
+    data = zlib.compress(json.dumps(scd).encode("utf-8"))
+    try:
+        with closing(_connect(cache_file)) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO scd_index VALUES (?, ?, ?, ?, ?, ?)",
+                (scd_hash, PARSER_VERSION, os.path.basename(scd_file), len(data), time.time(), data))
+            evicted = evict(connection, max_bytes)
+        logger.info("SCD index stored in cache %s%s", cache_file, f", {evicted} old entries evicted" if evicted else "")
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Warning: SCD index not stored in cache (%s).", e)
+    return scd
+
+
+def clear_cache(cache_file: str = None):
+    """Deletes every cached SCD index."""
+    with closing(_connect(cache_file or cache_file_path())) as connection, connection:
+        connection.execute("DELETE FROM scd_index")
@@ -0,0 +1,182 @@
+try:
+    from lxml import etree
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as etree
+    HAVE_LXML = False
+
+from generator_log import logger
+
+# Bump when index_scd collects more or different data, so cached indexes are rebuilt (see scd_cache).
+PARSER_VERSION = 3
+
+# Substation section elements whose names give the context of an LNode.
+CONTEXT_ELEMENTS = {
+    "Substation": "substation",
+    "VoltageLevel": "voltage_level",
+    "Bay": "bay",
+    "ConductingEquipment": "equipment",
+    "PowerTransformer": "equipment",
+}
+
+
+def local_name(tag) -> str:
+    """'{http://www.iec.ch/61850/2003/SCL}LNode' -> 'LNode'."""
+    return tag.rpartition("}")[2] if isinstance(tag, str) else ""
+
+
+def lnode_address(attributes) -> str:
+    """
+    Builds the signal address 'iedName+ldInst/prefix+lnClass+lnInst' of an LNode, or returns None
+    if iedName, ldInst or lnClass is missing.
+    """
+    ied_name = attributes.get("iedName", "")
+    ld_inst = attributes.get("ldInst", "")
+    ln_class = attributes.get("lnClass", "")
+    if not (ied_name and ld_inst and ln_class):
+        return None
+    return f"{ied_name}{ld_inst}/{attributes.get('prefix', '')}{ln_class}{attributes.get('lnInst', '')}"
+
+
+def fcda_reference(ied_name: str, attributes) -> str:
+    """'IED+ldInst/prefix+lnClass+lnInst.doName[.daName] [fc]' of an FCDA of a DataSet."""
+    reference = (f"{ied_name}{attributes.get('ldInst', '')}/{attributes.get('prefix', '')}"
+                 f"{attributes.get('lnClass', '')}{attributes.get('lnInst', '')}.{attributes.get('doName', '')}")
+    if attributes.get("daName"):
+        reference += f".{attributes.get('daName')}"
+    return f"{reference} [{attributes.get('fc', '')}]"
+
+
+def _iterparse(scd_file: str, events: tuple):
+    if HAVE_LXML:
+        # huge_tree lifts lxml's limits on very large text nodes and deep trees in big SCDs
+        return etree.iterparse(scd_file, events=events, huge_tree=True)
+    return etree.iterparse(scd_file, events=events)
+
+
+def index_scd(scd_file: str) -> dict:
+    """
+    Reads everything the generator needs from an SCD in one streaming pass. Every element is dropped
+    from the tree as soon as it has been read, so memory stays flat however large the SCD is.
+
+    Parameters:
+        scd_file (str): Path to the SCD file.
+
+    Returns:
+        dict: 'namespaces' (the first declared namespace under the 'scl' prefix, then the others),
+        'ieds' (IED names), 'lnode_addresses' (LNode signal addresses, in file order),
+        'lnode_context' (substation, voltage_level, bay and equipment names of each LNode address),
+        'ln_types' (lnType of every LN/LN0 instance of the IEDs, by the same kind of address) and
+        'datasets' (FCDA references of every DataSet, by 'IED+LD/LN.DataSet') and 'templates', the
+        DataTypeTemplates as {'lnode_types': {id: {'lnClass', 'dos': {name: type}}},
+        'do_types': {id: {'cdc', 'sdos': {name: type}, 'das': {name: {'bType', 'type', 'fc'}}}},
+        'da_types': {id: {'bdas': {name: {'bType', 'type'}}}}}.
+    """
+    namespaces = {}
+    ieds = []
+    lnode_addresses = []
+    lnode_context = {}
+    ln_types = {}
+    datasets = {}
+    templates = {"lnode_types": {}, "do_types": {}, "da_types": {}}
+    ied_name = ld_inst = ln_address = dataset = None
+    lnode_type = do_type = da_type = None
+    context = []  # (key, name) of the enclosing Substation/VoltageLevel/Bay/ConductingEquipment
+    stack = []
+
+    try:
+        for event, item in _iterparse(scd_file, ("start-ns", "start", "end")):
+            if event == "start-ns":
+                prefix, uri = item
+                namespaces.setdefault(prefix, uri)
+                continue
+            name = local_name(item.tag)
+            if event == "start":
+                stack.append(item)
+                if name in CONTEXT_ELEMENTS:
+                    context.append((CONTEXT_ELEMENTS[name], item.get("name", "")))
+                elif name == "IED":
+                    ied_name = item.get("name")
+                    if ied_name:
+                        ieds.append(ied_name)
+                    else:
+                        logger.warning("Warning: An IED element is missing the 'name' attribute.")
+                elif name == "LDevice":
+                    ld_inst = item.get("inst", "")
+                elif name in ("LN0", "LN") and ied_name and ld_inst is not None:
+                    ln_address = (f"{ied_name}{ld_inst}/{item.get('prefix', '')}"
+                                  f"{item.get('lnClass', '')}{item.get('inst', '')}")
+                    ln_types[ln_address] = item.get("lnType", "")
+                elif name == "DataSet" and ln_address:
+                    dataset = f"{ln_address}.{item.get('name', '')}"
+                    datasets[dataset] = []
+                elif name == "FCDA" and dataset:
+                    datasets[dataset].append(fcda_reference(ied_name, item.attrib))
+                elif name == "LNodeType":
+                    lnode_type = {"lnClass": item.get("lnClass", ""), "dos": {}}
+                    templates["lnode_types"][item.get("id", "")] = lnode_type
+                elif name == "DO" and lnode_type is not None:
+                    lnode_type["dos"][item.get("name", "")] = item.get("type", "")
+                elif name == "DOType":
+                    do_type = {"cdc": item.get("cdc", ""), "sdos": {}, "das": {}}
+                    templates["do_types"][item.get("id", "")] = do_type
+                elif name == "SDO" and do_type is not None:
+                    do_type["sdos"][item.get("name", "")] = item.get("type", "")
+                elif name == "DA" and do_type is not None:
+                    do_type["das"][item.get("name", "")] = {
+                        "bType": item.get("bType", ""), "type": item.get("type", ""), "fc": item.get("fc", "")}
+                elif name == "DAType":
+                    da_type = {"bdas": {}}
+                    templates["da_types"][item.get("id", "")] = da_type
+                elif name == "BDA" and da_type is not None:
+                    da_type["bdas"][item.get("name", "")] = {"bType": item.get("bType", ""), "type": item.get("type", "")}
+                elif name == "LNode":
+                    address = lnode_address(item.attrib)
+                    if address is None:
+                        logger.warning("Warning: Incomplete LNode attributes: %s", dict(item.attrib))
+                    else:
+                        lnode_addresses.append(address)
+                        lnode_context.setdefault(address, dict(context))
+                continue
+
+            # end: the element is finished, drop it (and its finished children) from the tree
+            stack.pop()
+            if name in CONTEXT_ELEMENTS:
+                context.pop()
+            elif name == "IED":
+                ied_name = None
+            elif name == "LDevice":
+                ld_inst = None
+            elif name in ("LN0", "LN"):
+                ln_address = None
+            elif name == "DataSet":
+                dataset = None
+            elif name == "LNodeType":
+                lnode_type = None
+            elif name == "DOType":
+                do_type = None
+            elif name == "DAType":
+                da_type = None
+            item.clear()
+            if stack:
+                stack[-1].remove(item)
+    except FileNotFoundError:
+        logger.error("Error: File not found: %s", scd_file)
+        raise
+    except etree.ParseError as e:
+        logger.error("Error parsing the XML file: %s. %s", scd_file, e)
+        raise
+
+    if namespaces:
+        first_prefix = next(iter(namespaces))
+        namespaces = {"scl": namespaces.pop(first_prefix), **namespaces}
+
+    return {
+        "namespaces": namespaces,
+        "ieds": ieds,
+        "lnode_addresses": lnode_addresses,
+        "lnode_context": lnode_context,
+        "ln_types": ln_types,
+        "datasets": datasets,
+        "templates": templates,
+    }
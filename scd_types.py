@@ -0,0 +1,103 @@
+import logging
+
+from generator_log import logger
+
+
+class DataTypeResolver:
+    """
+    Resolves signal paths like 'AA1D1Q05Q1CBSW/XCBR1.Pos.stVal' through the DataTypeTemplates of an SCD:
+    the LN instance gives the LNodeType, the first name after the LN is one of its DOs, and the rest is a
+    path of SDOs, DAs and BDAs below that DO's DOType.
+
+    Every DOType and DAType is expanded once into the set of all paths below it, so checking a signal
+    list costs one dict lookup per signal after the first use of a type.
+    """
+
+    def __init__(self, templates: dict, ln_types: dict):
+        self.lnode_types = templates.get("lnode_types", {})
+        self.do_types = templates.get("do_types", {})
+        self.da_types = templates.get("da_types", {})
+        self.ln_types = ln_types
+        self._do_paths = {}
+        self._da_paths = {}
+
+    def da_type_paths(self, type_id: str, _expanding=frozenset()) -> frozenset:
+        """All BDA paths below a DAType, e.g. {'ctlVal', 'origin', 'origin.orCat', ...}."""
+        if type_id in self._da_paths:
+            return self._da_paths[type_id]
+        if type_id in _expanding:  # Recursive type definitions do not occur in valid SCL
+            raise ValueError(f"DAType {type_id} contains itself.")
+        paths = set()
+        for name, bda in self.da_types.get(type_id, {}).get("bdas", {}).items():
+            paths.add(name)
+            if bda["bType"] == "Struct":
+                paths.update(f"{name}.{sub}" for sub in self.da_type_paths(bda["type"], _expanding | {type_id}))
+        self._da_paths[type_id] = frozenset(paths)
+        return self._da_paths[type_id]
+
+    def do_type_paths(self, type_id: str, _expanding=frozenset()) -> frozenset:
+        """All SDO/DA/BDA paths below a DOType, e.g. {'stVal', 'q', 'Oper', 'Oper.ctlVal', ...}."""
+        if type_id in self._do_paths:
+            return self._do_paths[type_id]
+        if type_id in _expanding:
+            raise ValueError(f"DOType {type_id} contains itself.")
+        do_type = self.do_types.get(type_id, {})
+        paths = set()
+        for name, sdo_type in do_type.get("sdos", {}).items():
+            paths.add(name)
+            paths.update(f"{name}.{sub}" for sub in self.do_type_paths(sdo_type, _expanding | {type_id}))
+        for name, da in do_type.get("das", {}).items():
+            paths.add(name)
+            if da["bType"] == "Struct":
+                paths.update(f"{name}.{sub}" for sub in self.da_type_paths(da["type"]))
+        self._do_paths[type_id] = frozenset(paths)
+        return self._do_paths[type_id]
+
+    def resolve(self, signal: str) -> dict:
+        """
+        Resolves one signal path.
+
+        Returns:
+            dict: 'signal', 'ln_type', 'do', 'cdc', 'checked' (False when the SCD has no LN instance
+            or type to check against) and 'error' (None if the path exists).
+        """
+        ln_address, _, path = signal.strip().partition(".")
+        do_name, _, rest = path.partition(".")
+        result = {"signal": signal, "ln_type": self.ln_types.get(ln_address), "do": do_name, "cdc": None,
+                  "checked": False, "error": None}
+        lnode_type = self.lnode_types.get(result["ln_type"])
+        if lnode_type is None:
+            return result
+        result["checked"] = True
+        if not do_name:
+            result["error"] = "no data object after the LN"
+        elif do_name not in lnode_type["dos"]:
+            result["error"] = (f"LNodeType {result['ln_type']} has no DO '{do_name}' "
+                               f"(has: {', '.join(sorted(lnode_type['dos']))})")
+        else:
+            do_type = lnode_type["dos"][do_name]
+            result["cdc"] = self.do_types.get(do_type, {}).get("cdc")
+            if rest and rest not in self.do_type_paths(do_type):
+                result["error"] = f"DOType {do_type} ({result['cdc']}) has no '{rest}'"
+        return result
+
+    def validate(self, signals) -> list:
+        """Resolves every signal path of the signal list, see resolve()."""
+        return [self.resolve(signal) for signal in signals]
+
+
+def print_resolved(results: list):
+    """
+    Logs the table of resolved signal paths at DEBUG, the count at INFO and every error at ERROR, so
+    quiet runs never format the one row per signal.
+    """
+    errors = [result for result in results if result["error"]]
+    unchecked = sum(not result["checked"] for result in results)
+    logger.info("%d signal paths resolved, %d not checked, %d errors", len(results), unchecked, len(errors))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%-45s %-25s %-6s Result", "Signal", "LNodeType", "CDC")
+        for result in results:
+            status = result["error"] or ("ok" if result["checked"] else "not checked: LN instance not in the SCD")
+            logger.debug("%-45s %-25s %-6s %s", result["signal"], result["ln_type"], result["cdc"], status)
+    for result in errors:
+        logger.error("%s: %s", result["signal"], result["error"])
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from generator_log import logger
+
+GROUP_TYPES = ("CONTROL", "ASSESS", "COMMAND")
+
+
+class SignalList:
+    """
+    The signal list of a test in columns: one array per field with one entry per signal, built in one
+    vectorized pass over columns B (address) and C (group type) of the 'Signal Addresses' sheet.
+
+    An address 'AA1D1Q01Q1QB1/CILO1.EnaCls' is split into ld_name ('AA1D1Q01Q1QB1', the IED name and
+    LD instance, written without separator), ln ('CILO1') and data ('EnaCls', the DO/DA path).
+    ln_address is the part checked against the LNodes of the SCD ('AA1D1Q01Q1QB1/CILO1'). The IED and
+    LD instance are split off by assign_ieds() once the IED names of the SCD are known.
+    """
+
+    def __init__(self, addresses, groups, rows=None):
+        self.address = np.asarray(addresses, dtype=object)
+        self.group = np.asarray(groups, dtype=object)
+        self.row = np.arange(len(self.address)) if rows is None else np.asarray(rows)
+
+        address = pd.Series(self.address, dtype=object)
+        ln_address = address.str.partition(".")
+        ld_name = ln_address[0].str.partition("/")
+        self.ln_address = ln_address[0].to_numpy(dtype=object)
+        self.data = ln_address[2].to_numpy(dtype=object)
+        self.ld_name = ld_name[0].to_numpy(dtype=object)
+        self.ln = ld_name[2].to_numpy(dtype=object)
+        self.ied = np.full(len(self.address), None, dtype=object)
+        self.ld = np.full(len(self.address), None, dtype=object)
+
+        self.by_group = {group: np.flatnonzero(self.group == group) for group in pd.unique(self.group)}
+        self.by_ied = {}
+
+        # The DUT: first ASSESS signal with an LN, as determine_DUT did
+        assess = np.flatnonzero((self.group == "ASSESS") & (ld_name[1] == "/").to_numpy())
+        if len(assess):
+            self.dut, self.dut_address, self.dut_row = (
+                self.ld_name[assess[0]], self.address[assess[0]], self.row[assess[0]])
+        else:
+            self.dut, self.dut_address, self.dut_row = "No DUT found in signal addresses.", "", None
+
+    @classmethod
+    def from_sheet(cls, signal_addresses: pd.DataFrame) -> "SignalList":
+        """
+        Reads a DataFrame in the 'Signal Addresses' sheet layout (pd.read_excel(..., header=None)):
+        the header row is skipped, as are rows without an address in column B.
+        """
+        def column(index):
+            if signal_addresses.shape[1] <= index:
+                return pd.Series("", index=signal_addresses.index, dtype=object)
+            return signal_addresses[index].fillna("").astype(str).str.strip().astype(object)
+
+        addresses, groups = column(1).iloc[1:], column(2).iloc[1:]
+        has_address = (addresses != "").to_numpy()
+        return cls(addresses[has_address].to_numpy(), groups[has_address].to_numpy(),
+                   signal_addresses.index[1:][has_address])
+
+    def __len__(self) -> int:
+        return len(self.address)
+
+    def addresses(self, group: str = None) -> list:
+        """Addresses in sheet order, of one group type or of all signals."""
+        if group is None:
+            return self.address.tolist()
+        return self.address[self.by_group.get(group, np.array([], dtype=int))].tolist()
+
+    def group_types(self) -> dict:
+        """{'CONTROL': [...], 'ASSESS': [...], 'COMMAND': [...]} with the addresses in sheet order."""
+        return {group: self.addresses(group) for group in GROUP_TYPES}
+
+    def sorted_addresses(self, dut: str = None, adjacent: str = None) -> list:
+        """
+        All addresses with those of the DUT last and the (first) address containing `adjacent`, by default
+        the DUT's ASSESS address, second to last, like sort_signal_adresses did.
+        """
+        dut = self.dut if dut is None else dut
+        adjacent = self.dut_address if adjacent is None else adjacent
+        address = pd.Series(self.address, dtype=object)
+        of_dut = address.str.contains(dut, regex=False).to_numpy(dtype=bool)
+        order = np.concatenate([np.flatnonzero(~of_dut), np.flatnonzero(of_dut)])
+        matches = np.flatnonzero(address.iloc[order].str.contains(adjacent, regex=False).to_numpy(dtype=bool))
+        if not len(matches):
+            raise ValueError(f"No '{adjacent}' found in signal addresses.")
+        order = order.tolist()
+        order.insert(-1, order.pop(matches[0]))
+        return self.address[order].tolist()
+
+    def assign_ieds(self, address_index) -> dict:
+        """
+        Splits ld_name into IED and LD instance by the longest IED name of the SCD (an AddressIndex) and
+        fills by_ied. Every distinct ld_name is looked up once.
+
+        Returns:
+            dict: by_ied, the signal positions of each IED.
+        """
+        names = pd.unique(self.ld_name)
+        ieds = {name: address_index.longest_ied_prefix(name) for name in names}
+        self.ied = np.array([ieds[name] for name in self.ld_name], dtype=object)
+        self.ld = np.array([name[len(ied):] if ied else None for name, ied in zip(self.ld_name, self.ied)],
+                           dtype=object)
+        self.by_ied = {ied: np.flatnonzero(self.ied == ied) for ied in pd.unique(self.ied) if ied}
+        return self.by_ied
+
+    def print_summary(self):
+        """Logs the signal count and DUT at INFO, the addresses of every group and IED at DEBUG."""
+        logger.info("Signal list: %d signals, DUT %s (%s)", len(self), self.dut, self.dut_address)
+        for group in GROUP_TYPES:
+            logger.debug("%s: %s", group, self.addresses(group))
+        for ied, positions in self.by_ied.items():
+            logger.debug("IED %s: %d signals", ied, len(positions))
@@ -0,0 +1,60 @@
+import time
+import tracemalloc
+
+_start = time.perf_counter()
+_last = _start
+_stages = []
+_peaks = []
+_traced = 0  # Traced memory at the start of the stage
+
+
+def reset():
+    """Starts a new run: clears the recorded stages and restarts the clock."""
+    global _start, _last, _traced
+    _start = _last = time.perf_counter()
+    _stages.clear()
+    _peaks.clear()
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+        _traced = tracemalloc.get_traced_memory()[0]
+
+
+def lap(name: str) -> float:
+    """
+    Records the wall-clock time since the previous lap (or reset) as stage `name` and returns it.
+    While tracemalloc is tracing, the peak of the memory the stage allocated on top of what was traced
+    at its start is recorded as well.
+    """
+    global _last, _traced
+    now = time.perf_counter()
+    elapsed = now - _last
+    _stages.append((name, elapsed))
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        _peaks.append((name, peak - _traced))
+        tracemalloc.reset_peak()
+        _traced = current
+    _last = time.perf_counter()
+    return elapsed
+
+
+def stages() -> list:
+    """Returns the recorded (stage, seconds) pairs in run order."""
+    return list(_stages)
+
+
+def peaks() -> list:
+    """Returns the recorded (stage, peak bytes allocated) pairs, empty unless tracemalloc was tracing."""
+    return list(_peaks)
+
+
+def total() -> float:
+    """Seconds since the last reset."""
+    return time.perf_counter() - _start
+
+
+def print_stages(title: str = "Stage timings"):
+    print(f"{title}:")
+    for name, elapsed in _stages:
+        print(f"  {name:<20} {elapsed * 1000:10.1f} ms")
+    print(f"  {'total':<20} {total() * 1000:10.1f} ms")
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+# Every value of a test step is held as an int8 code into STATE_VALUES and only decoded when the
+# JSON is written. SPC switch positions are the strings 'true'/'false', assessments are booleans.
+STATE_VALUES = ("false", "true", "POS_OFF", "POS_ON", False, True,
+                "CAR_NO_OPERATION", "CAR_POSITION_CHANGED", "CAR_BLOCKED_BY_INTERLOCKING")
+(SPC_FALSE, SPC_TRUE, POS_OFF, POS_ON, ASSESS_FALSE, ASSESS_TRUE,
+ CAR_NO_OPERATION, CAR_POSITION_CHANGED, CAR_BLOCKED_BY_INTERLOCKING) = range(len(STATE_VALUES))
+
+# Code of every value accepted in the Test Steps sheet or truth table, by test type (1 SPC, 2 DPC)
+CONTROL_CODES = {
+    1: {"false": SPC_FALSE, "true": SPC_TRUE, "FALSE": SPC_FALSE, "TRUE": SPC_TRUE,
+        False: SPC_FALSE, True: SPC_TRUE},
+    2: {"CLOSED": POS_ON, "closed": POS_ON, "OPEN": POS_OFF, "open": POS_OFF,
+        "POS_ON": POS_ON, "POS_OFF": POS_OFF},
+}
+ASSESS_CODES = {False: ASSESS_FALSE, True: ASSESS_TRUE}
+# Initial step of every test type: switch position and assessment
+INITIAL_CODES = {1: (SPC_FALSE, ASSESS_FALSE), 2: (POS_OFF, ASSESS_TRUE)}
+
+
+def encode_states(values, codes: dict, what: str) -> np.ndarray:
+    """
+    Maps an array of sheet or truth table values to int8 state codes in one categorical pass.
+
+    Parameters:
+        values: Array-like of values, any shape.
+        codes (dict): Accepted values and their codes, e.g. CONTROL_CODES[test_type].
+        what (str): Name of the values for the error message.
+
+    Returns:
+        np.ndarray: int8 codes in the shape of values.
+
+    Raises:
+        ValueError: If a value has no code.
+    """
+    values = np.asarray(values, dtype=object)
+    positions = pd.Categorical(values.ravel(), categories=pd.Index(list(codes), dtype=object)).codes
+    if (positions < 0).any():
+        unknown = sorted({repr(value) for value in values.ravel()[positions < 0]})
+        raise ValueError(f"Unknown {what} values {', '.join(unknown)}, expected one of "
+                         f"{', '.join(repr(value) for value in codes)}.")
+    return np.asarray(list(codes.values()), dtype=np.int8)[positions].reshape(values.shape)
+
+
+def decode_states(codes: np.ndarray) -> np.ndarray:
+    """The values of an array of state codes, as an object array."""
+    return np.asarray(STATE_VALUES, dtype=object)[codes]
@@ -0,0 +1,233 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from generator_log import logger
+from state_codes import POS_OFF, POS_ON
+
+# Above this many steps the 2-opt pass after nearest-neighbour ordering is skipped (it is O(steps^2) per pass).
+TWO_OPT_MAX_STEPS = 300
+
+
+CIRCUIT_BREAKER_PATTERN = r"QA\d|XCBR"
+# Breaker transitions between two steps in the matrix of breaker_transitions
+CLOSING, OPENING = 1, 2
+
+
+def is_circuit_breaker(signal: str) -> bool:
+    """Circuit breakers are named QA<n> or are XCBR logical nodes."""
+    return re.search(CIRCUIT_BREAKER_PATTERN, str(signal)) is not None
+
+
+def breaker_label(signal: str) -> str:
+    """Short name of a breaker for step descriptions: 'AA1D1Q01Q1QA1/CSWI1.Pos' -> 'QA1', else its LN ('XCBR1')."""
+    match = re.search(r"QA\d+", signal)
+    return match.group(0) if match else signal.partition("/")[2].partition(".")[0] or signal
+
+
+def breaker_transitions(switch_positions: pd.DataFrame) -> tuple:
+    """
+    Finds the circuit breakers among the CONTROL signals (index) and their transitions between consecutive
+    steps (columns of DPC state codes), as one diff over the breaker-by-step state matrix.
+
+    Returns:
+        tuple: The breaker signals and an int8 matrix (breakers x steps) that is CLOSING where the breaker
+        goes from POS_OFF to POS_ON into that step, OPENING for the reverse and 0 otherwise (always 0 in
+        the first step).
+    """
+    signals = pd.Series(switch_positions.index, dtype=object).astype(str)
+    is_breaker = signals.str.contains(CIRCUIT_BREAKER_PATTERN, regex=True).to_numpy(dtype=bool)
+    states = switch_positions.to_numpy()[is_breaker]
+    transitions = np.zeros(states.shape, dtype=np.int8)
+    before, after = states[:, :-1], states[:, 1:]
+    transitions[:, 1:][(before == POS_OFF) & (after == POS_ON)] = CLOSING
+    transitions[:, 1:][(before == POS_ON) & (after == POS_OFF)] = OPENING
+    return signals[is_breaker].tolist(), transitions
+
+
+def transition_descriptions(breakers: list, transitions: np.ndarray) -> np.ndarray:
+    """
+    Step descriptions from breaker_transitions, e.g. 'QA1 closing, XCBR1 opening', or '' for a step that
+    moves no breaker. The text is built once per distinct transition pattern, not per step.
+    """
+    num_steps = transitions.shape[1]
+    if not breakers:
+        return np.full(num_steps, "", dtype=object)
+    labels = [breaker_label(breaker) for breaker in breakers]
+    patterns, inverse = np.unique(transitions, axis=1, return_inverse=True)
+    texts = np.array([", ".join(f"{label} {'closing' if transition == CLOSING else 'opening'}"
+                                for label, transition in zip(labels, pattern) if transition)
+                      for pattern in patterns.T], dtype=object)
+    return texts[inverse.reshape(-1)]
+
+
+def is_disconnector(signal: str) -> bool:
+    """Disconnectors/earthing switches are XSWI logical nodes."""
+    return "XSWI" in str(signal)
+
+
+def switch_entry_orders(switch_positions: pd.DataFrame) -> dict:
+    """
+    The order of the CONTROL entries of every step that moves a circuit breaker and a disconnector
+    (XSWI) together, the rest keep sheet order: when a breaker opens, the disconnectors come last (the
+    breaker opens before them); when the breakers close, the disconnectors come first. Within both
+    parts the signals keep their sheet order.
+
+    Parameters:
+        switch_positions (pd.DataFrame): DPC state codes of the CONTROL signals (index) by steps (columns).
+
+    Returns:
+        dict: {step: positions of the CONTROL signals in entry order} of the mixed steps.
+    """
+    disconnectors = np.array([is_disconnector(signal) for signal in switch_positions.index], dtype=bool)
+    if not disconnectors.any():
+        return {}
+    values = switch_positions.to_numpy()
+    _, transitions = breaker_transitions(switch_positions)
+    moves_disconnector = np.zeros(values.shape[1], dtype=bool)
+    moves_disconnector[1:] = (values[disconnectors, 1:] != values[disconnectors, :-1]).any(axis=0)
+    mixed = np.flatnonzero(moves_disconnector & (transitions != 0).any(axis=0))
+    positions = np.arange(len(disconnectors))
+    opening_order = tuple(np.concatenate([positions[~disconnectors], positions[disconnectors]]).tolist())
+    closing_order = tuple(np.concatenate([positions[disconnectors], positions[~disconnectors]]).tolist())
+    opening = (transitions[:, mixed] == OPENING).any(axis=0)
+    return {int(step): opening_order if is_opening else closing_order for step, is_opening in zip(mixed, opening)}
+
+
+def gray_code_order(codes: np.ndarray, num_signals: int):
+    """
+    Returns the positions of `codes` in reflected Gray code order if they are exactly all
+    2^num_signals input combinations, otherwise None. Consecutive Gray codes differ in one bit.
+    """
+    if len(codes) != 1 << num_signals:
+        return None
+    positions = np.full(len(codes), -1, dtype=np.int64)
+    positions[codes] = np.arange(len(codes))
+    if (positions < 0).any():
+        return None
+    sequence = np.arange(len(codes), dtype=np.int64)
+    return positions[sequence ^ (sequence >> 1)]
+
+
+def _transition_costs(bits: np.ndarray, current: np.ndarray, candidates, breakers: np.ndarray,
+                      disconnectors: np.ndarray) -> np.ndarray:
+    """
+    Cost of moving from `current` to each candidate step: twice the number of flipped signals, plus one
+    if the step operates a circuit breaker and a disconnector together. Those mixed steps rely on the
+    XSWI/CB entry order of switch_entry_orders, so they lose ties against equally short alternatives.
+    """
+    flips = bits[:, candidates] != current[:, None]
+    mixed = flips[breakers].any(axis=0) & flips[disconnectors].any(axis=0)
+    return 2 * flips.sum(axis=0) + mixed
+
+
+def nearest_neighbour_order(bits: np.ndarray, start: np.ndarray, breakers: np.ndarray,
+                            disconnectors: np.ndarray) -> list:
+    """Greedy tour over the step columns of `bits`, always taking the cheapest next step from `start`."""
+    remaining = list(range(bits.shape[1]))
+    order = []
+    current = start
+    while remaining:
+        costs = _transition_costs(bits, current, remaining, breakers, disconnectors)
+        chosen = remaining.pop(int(np.argmin(costs)))
+        order.append(chosen)
+        current = bits[:, chosen]
+    return order
+
+
+def two_opt(order: list, bits: np.ndarray, start: np.ndarray, breakers: np.ndarray,
+            disconnectors: np.ndarray, max_passes: int = 5) -> list:
+    """Improves an open tour that starts at `start` by reversing segments while that lowers the total cost."""
+    columns = np.column_stack([start, bits[:, order]])
+    size = columns.shape[1]
+    cost = np.stack([_transition_costs(columns, columns[:, i], range(size), breakers, disconnectors)
+                     for i in range(size)])
+    tour = list(range(size))
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, size - 1):
+            for j in range(i + 1, size):
+                before = cost[tour[i - 1], tour[i]] + (cost[tour[j], tour[j + 1]] if j + 1 < size else 0)
+                after = cost[tour[i - 1], tour[j]] + (cost[tour[i], tour[j + 1]] if j + 1 < size else 0)
+                if after < before:
+                    tour[i:j + 1] = reversed(tour[i:j + 1])
+                    improved = True
+        if not improved:
+            break
+    return [order[position - 1] for position in tour[1:]]
+
+
+def count_switch_operations(bits: np.ndarray) -> int:
+    """Total number of signal changes between consecutive step columns."""
+    return int((bits[:, 1:] != bits[:, :-1]).sum())
+
+
+def count_mixed_steps(bits: np.ndarray, breakers: np.ndarray, disconnectors: np.ndarray) -> int:
+    """Number of steps that operate a circuit breaker and a disconnector at the same time."""
+    flips = bits[:, 1:] != bits[:, :-1]
+    return int((flips[breakers].any(axis=0) & flips[disconnectors].any(axis=0)).sum())
+
+
+def order_test_steps(switch_positions: pd.DataFrame, assessment_row: np.ndarray, method: str = "auto") -> tuple:
+    """
+    Reorders the test steps so each step changes as few CONTROL signals as possible.
+
+    The first column is the initial step and stays first. A full enumeration of all input combinations
+    is put in Gray code order (one signal change per step). Any other set of steps, e.g. MC/DC or BDD
+    selections, is ordered nearest-neighbour first and then improved with 2-opt when it is small.
+
+    Parameters:
+        switch_positions (pd.DataFrame): CONTROL signals (index) by test steps (columns), initial step first.
+        assessment_row (np.ndarray): Expected ASSESS value per step, initial step first.
+        method (str): 'auto', 'gray', 'nearest' or 'none'.
+
+    Returns:
+        tuple: Reordered switch_positions, reordered assessment_row and a report dict with the number
+        of switch operations before and after ordering.
+    """
+    values = switch_positions.to_numpy()
+    bits = values != values[:, [0]]  # Signal differs from its initial position
+    breakers = np.array([is_circuit_breaker(signal) for signal in switch_positions.index], dtype=bool)
+    disconnectors = np.array([is_disconnector(signal) for signal in switch_positions.index], dtype=bool)
+    steps = bits[:, 1:]
+
+    order = None
+    used_method = "none"
+    if method in ("auto", "gray") and steps.shape[0] <= 62:
+        weights = np.left_shift(1, np.arange(steps.shape[0] - 1, -1, -1, dtype=np.int64))
+        codes = weights @ steps.astype(np.int64)
+        order = gray_code_order(codes, steps.shape[0])
+        if order is not None:
+            used_method = "gray"
+    if order is None and method in ("auto", "nearest"):
+        start = bits[:, 0]
+        order = nearest_neighbour_order(steps, start, breakers, disconnectors)
+        used_method = "nearest"
+        if len(order) <= TWO_OPT_MAX_STEPS:
+            order = two_opt(order, steps, start, breakers, disconnectors)
+            used_method = "nearest+2opt"
+    if order is None:
+        order = list(range(steps.shape[1]))
+
+    columns = np.concatenate([[0], np.asarray(order, dtype=np.int64) + 1])
+    ordered_bits = bits[:, columns]
+    before = count_switch_operations(bits)
+    after = count_switch_operations(ordered_bits)
+    report = {
+        "method": used_method,
+        "switch_operations_before": before,
+        "switch_operations_after": after,
+        "switch_operations_saved": before - after,
+        "mixed_cb_xswi_steps_before": count_mixed_steps(bits, breakers, disconnectors),
+        "mixed_cb_xswi_steps_after": count_mixed_steps(ordered_bits, breakers, disconnectors),
+    }
+    return switch_positions.iloc[:, columns], np.asarray(assessment_row)[columns], report
+
+
+def print_ordering_report(report: dict):
+    logger.info("Test step ordering (%s): %d switch operations instead of %d (%d saved), "
+                "steps moving a CB and an XSWI together: %d (was %d)",
+                report['method'], report['switch_operations_after'], report['switch_operations_before'],
+                report['switch_operations_saved'], report['mixed_cb_xswi_steps_after'],
+                report['mixed_cb_xswi_steps_before'])
@@ -0,0 +1,160 @@
+import functools
+import importlib.util
+import posixpath
+import zipfile
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from generator_log import logger
+from signal_list import SignalList
+
+SIGNAL_ADDRESSES_SHEET = "Signal Addresses"
+TEST_STEPS_SHEET = "Test Steps"
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_INLINE_TEXT = f"{_MAIN_NS}is/{_MAIN_NS}t"
+
+
+def excel_engine() -> str:
+    """
+    Fastest available engine: python-calamine if installed, else the lxml streaming reader of this
+    module (lxml is in requirements.txt), else openpyxl.
+    """
+    if importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    if importlib.util.find_spec("lxml") is not None:
+        return "lxml"
+    return "openpyxl"
+
+
+def _column_index(cell_ref: str) -> int:
+    """'C3' -> 2."""
+    return _letters_index(cell_ref.rstrip("0123456789"))
+
+
+@functools.lru_cache(maxsize=None)
+def _letters_index(letters: str) -> int:
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char.upper()) - 64
+    return index - 1
+
+
+def _cell_value(cell, shared_strings: list):
+    """Cell value converted like pandas' openpyxl reader: empty -> "", whole floats -> int, errors -> NaN."""
+    cell_type = cell.get("t")
+    if cell_type == "inlineStr":
+        text = cell.findtext(_INLINE_TEXT)  # Plain text; rich text runs are joined below
+        return text if text is not None else "".join(cell.find(f"{_MAIN_NS}is").itertext())
+    value = cell.find(f"{_MAIN_NS}v")
+    if value is None or value.text is None:
+        return ""
+    if cell_type == "s":
+        return shared_strings[int(value.text)]
+    if cell_type == "b":
+        return value.text == "1"
+    if cell_type == "e":
+        return np.nan
+    if cell_type == "str":
+        return value.text
+    number = float(value.text)
+    return int(number) if number.is_integer() else number
+
+
+def sheet_paths(archive: zipfile.ZipFile) -> dict:
+    """Part name of every sheet of an open xlsx archive, e.g. {'Test Steps': 'xl/worksheets/sheet1.xml'}."""
+    from lxml import etree
+
+    workbook = etree.fromstring(archive.read("xl/workbook.xml"))
+    relations = etree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {relation.get("Id"): relation.get("Target") for relation in relations}
+    paths = {}
+    for sheet in workbook.iter(f"{_MAIN_NS}sheet"):
+        target = targets[sheet.get(_REL_ID)]
+        paths[sheet.get("name")] = target.lstrip("/") if target.startswith("/") \
+            else posixpath.normpath(posixpath.join("xl", target))
+    return paths
+
+
+def _read_sheets_lxml(excel_file: str, sheets: tuple) -> dict:
+    """
+    Streams the sheet XML of the workbook with lxml and builds each DataFrame exactly as pd.read_excel
+    (header=None) does from openpyxl rows. Cells formatted as dates keep their serial number, which is
+    fine for the Signal Addresses and Test Steps sheets (text, booleans and step numbers only).
+    """
+    from lxml import etree
+
+    frames = {}
+    with zipfile.ZipFile(excel_file) as archive:
+        paths = sheet_paths(archive)
+
+        shared_strings = []
+        if "xl/sharedStrings.xml" in archive.namelist():
+            with archive.open("xl/sharedStrings.xml") as f:
+                for _, item in etree.iterparse(f, tag=f"{_MAIN_NS}si"):
+                    # Plain or rich text runs; phonetic runs (rPh) are not part of the value
+                    shared_strings.append("".join(item.xpath("./m:t/text() | ./m:r/m:t/text()",
+                                                             namespaces={"m": _MAIN_NS[1:-1]})))
+                    item.clear()
+
+        for name in sheets:
+            if name not in paths:
+                continue
+            data = []
+            last_row_with_data = -1
+            with archive.open(paths[name]) as f:
+                for _, row in etree.iterparse(f, tag=f"{_MAIN_NS}row"):
+                    row_number = int(row.get("r", len(data) + 1)) - 1
+                    data.extend([] for _ in range(row_number - len(data)))
+                    values = []
+                    for cell in row.iterchildren(f"{_MAIN_NS}c"):
+                        cell_ref = cell.get("r")
+                        if cell_ref:
+                            column = _column_index(cell_ref)
+                            if column > len(values):
+                                values.extend([""] * (column - len(values)))
+                        values.append(_cell_value(cell, shared_strings))
+                    while values and values[-1] == "":
+                        values.pop()
+                    if values:
+                        last_row_with_data = row_number
+                    data.append(values)
+                    row.clear()
+            data = data[:last_row_with_data + 1]
+            if data:
+                width = max(len(values) for values in data)
+                data = [values + [""] * (width - len(values)) for values in data]
+            frames[name] = TextParser(data, header=None).read() if data else pd.DataFrame()
+    return frames
+
+
+def read_workbook(excel_file: str, sheets: tuple = (SIGNAL_ADDRESSES_SHEET, TEST_STEPS_SHEET),
+                  engine: str = None) -> dict:
+    """
+    Opens the workbook once (read-only, values only) and reads all requested sheets from that one load,
+    instead of one pd.read_excel call, and so one unzip and parse of the workbook, per sheet.
+    Sheets are streamed row by row, so wide Test Steps sheets are never held as cell objects.
+
+    Parameters:
+        excel_file (str): Path to the Excel file.
+        sheets (tuple): Sheet names to read. Missing sheets are left out of the result.
+        engine (str): 'lxml' or a pandas Excel engine ('openpyxl', 'calamine'). Defaults to excel_engine().
+
+    Returns:
+        dict: 'sheets' ({name: DataFrame as pd.read_excel(..., header=None)}) and 'signal_list'
+        (the SignalList of the Signal Addresses sheet, None if it was not read).
+    """
+    engine = engine or excel_engine()
+    logger.info("Reading workbook %s (%s)", excel_file, engine)
+    if engine == "lxml":
+        frames = _read_sheets_lxml(excel_file, sheets)
+    else:
+        with pd.ExcelFile(excel_file, engine=engine) as workbook:
+            frames = {name: workbook.parse(name, header=None) for name in sheets if name in workbook.sheet_names}
+    for name, frame in frames.items():
+        logger.info("Sheet '%s': %d rows x %d columns", name, frame.shape[0], frame.shape[1])
+    signal_list = SignalList.from_sheet(frames[SIGNAL_ADDRESSES_SHEET]) if SIGNAL_ADDRESSES_SHEET in frames else None
+    return {"sheets": frames, "signal_list": signal_list}